@@ -2,9 +2,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.api.dependencies.user_manager import UserManager, get_user_manager
+from app.core.config import get_settings
 from app.db.models.user import User
 from app.utils import exceptions
 from app.utils.common import ErrorCode
+from app.utils.revocation import revocation_list
 from app.utils.token import TokenManager
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
@@ -40,12 +42,13 @@ async def get_current_user(
 
     # Check if the token is valid
     try:
-        payload = token_manager.decode_token(
-            token, token_manager.JWT_SECRET_KEY, [token_manager.JWT_AUDIENCE]
-        )
+        payload = token_manager.decode_access_token(token)
     except exceptions.InvalidVerifyTokenError as e:
         raise credentials_exception from e
 
+    if revocation_list.is_revoked(payload):
+        raise credentials_exception
+
     # Check if the user_id is valid
     user_id = payload.get("sub", None)
     if user_id is None:
@@ -84,3 +87,16 @@ async def get_current_verified_user(user: User = Depends(get_current_active_user
             },
         )
     return user
+
+
+async def get_current_admin_user(user: User = Depends(get_current_active_user)):
+    admin_username = get_settings().ADMIN_USERNAME
+    if not admin_username or user.username != admin_username:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error_code": ErrorCode.USER_NOT_HAVE_PERMISSION,
+                "messages": ["User not have permission"],
+            },
+        )
+    return user
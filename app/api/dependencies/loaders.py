@@ -0,0 +1,14 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.sessions import get_async_read_session
+from app.utils.loader import RequestLoaders
+
+
+async def get_loaders(
+    session: AsyncSession = Depends(get_async_read_session),
+) -> RequestLoaders:
+    """
+    Dependency to get the id loaders of the current request.
+    """
+    return RequestLoaders(session)
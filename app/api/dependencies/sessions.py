@@ -1,8 +1,10 @@
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import async_session_maker
+from app.db.base import async_session_maker, read_your_writes, replica_router
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -11,3 +13,27 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session_maker() as session:
         yield session
+
+
+@asynccontextmanager
+async def read_session(request: Request | None = None) -> AsyncGenerator[AsyncSession, None]:
+    """Open a session for read only work.
+
+    The session is bound to a healthy replica, unless the client making
+    ``request`` wrote recently, in which case it stays on the primary so it
+    can read its own writes.
+    """
+    if read_your_writes.is_sticky(request):
+        session_maker = async_session_maker
+    else:
+        session_maker = await replica_router.get_session_maker()
+    async with session_maker() as session:
+        yield session
+
+
+async def get_async_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get an async session for read only handlers.
+    Reads are routed to the replicas, see `read_session`.
+    """
+    async with read_session(request) as session:
+        yield session
@@ -3,15 +3,19 @@ from typing import Any
 
 from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.sessions import get_async_session
 from app.db.models.user import User
+from app.db.upsert import insert_for
 from app.schemas.user import UserCreate, UserUpdate
 from app.utils import exceptions
 from app.utils.common import ErrorCode
+from app.utils.revocation import revocation_list
 from app.utils.security import PasswordHelper
+from app.utils.token import TokenManager
 from app.utils.validator import validate_email, validate_password, validate_username
 
 
@@ -117,30 +121,10 @@ class UserManager:
         Returns:
             User: created user object
         """
-        validate_email(user_create.email, user_create)
+        await validate_email(user_create.email, user_create)
         validate_username(user_create.username, user_create)
         validate_password(user_create.password, user_create)
 
-        try:
-            existing_user = await self.get_by_email(user_create.email)
-            if existing_user is not None:
-                raise exceptions.UserAlreadyExistsError(
-                    "user email already used",
-                    error_code=ErrorCode.USER_EMAIL_ALREADY_USED,
-                )
-        except exceptions.UserNotExistsError:
-            pass
-
-        try:
-            existing_user = await self.get_by_username(user_create.username)
-            if existing_user is not None:
-                raise exceptions.UserAlreadyExistsError(
-                    "username already used",
-                    error_code=ErrorCode.USERNAME_ALREADY_USED,
-                )
-        except exceptions.UserNotExistsError:
-            pass
-
         # dump the user_create model to a dict
         if safe:
             user_dict = user_create.create_safe_dump_model()
@@ -151,11 +135,17 @@ class UserManager:
         password = user_dict.pop("password")
         user_dict["hashed_password"] = self.password_helper.hash(password)
 
-        # create the user
-        create_user = User(**user_dict)
-        self.session.add(create_user)
+        # create the user, the unique constraints detect an existing email or username
+        statement = (
+            insert_for(self.session, User)
+            .values(**user_dict)
+            .on_conflict_do_nothing()
+            .returning(User)
+        )
+        create_user = (await self.session.execute(statement)).scalar_one_or_none()
+        if create_user is None:
+            raise await self._already_exists_error(user_dict["email"], user_dict["username"])
         await self.session.commit()
-        await self.session.refresh(create_user)
 
         return create_user
 
@@ -178,32 +168,52 @@ class UserManager:
         await self.session.delete(user)
         await self.session.commit()
 
+    async def _already_exists_error(
+        self, email: str | None, username: str | None, exclude: User | None = None
+    ) -> exceptions.UserAlreadyExistsError | None:
+        """Find which of the email and username is already used, in a single query."""
+        conditions = []
+        if email is not None:
+            conditions.append(User.email == email)
+        if username is not None:
+            conditions.append(User.username == username)
+        if not conditions:
+            return None
+
+        statement = select(User.email, User.username).where(or_(*conditions))
+        if exclude is not None:
+            statement = statement.where(User.id != exclude.id)
+        existing = (await self.session.execute(statement)).all()
+
+        if email is not None and any(row.email == email for row in existing):
+            return exceptions.UserAlreadyExistsError(
+                "User email already exists",
+                error_code=ErrorCode.USER_EMAIL_ALREADY_USED,
+            )
+        if username is not None and any(row.username == username for row in existing):
+            return exceptions.UserAlreadyExistsError(
+                "Username already exists",
+                error_code=ErrorCode.USERNAME_ALREADY_USED,
+            )
+        if exclude is None:
+            # the conflicting user was deleted in the meantime
+            return exceptions.UserAlreadyExistsError(
+                "User already exists", error_code=ErrorCode.USER_ALREADY_EXISTS
+            )
+        return None
+
     async def _validate_update(
         self, user: User, update_dict: dict[str, Any]
     ) -> dict[str, Any]:
         validated_update_dict = {}
         for field, value in update_dict.items():
             if field == "email" and value != user.email:
-                validate_email(value, user)
-                try:
-                    await self.get_by_email(user_email=value)
-                    raise exceptions.UserAlreadyExistsError(
-                        "User email already exists",
-                        error_code=ErrorCode.USER_EMAIL_ALREADY_USED,
-                    )
-                except exceptions.UserNotExistsError:
-                    validated_update_dict["email"] = value
-                    validated_update_dict["is_verified"] = False
+                await validate_email(value, user)
+                validated_update_dict["email"] = value
+                validated_update_dict["is_verified"] = False
             elif field == "username" and value != user.username:
                 validate_username(value, user)
-                try:
-                    await self.get_by_username(value)
-                    raise exceptions.UserAlreadyExistsError(
-                        "Username already exists",
-                        error_code=ErrorCode.USERNAME_ALREADY_USED,
-                    )
-                except exceptions.UserNotExistsError:
-                    validated_update_dict["username"] = value
+                validated_update_dict["username"] = value
             elif field == "password" and value is not None:
                 validate_password(value, user)
                 validated_update_dict["hashed_password"] = self.password_helper.hash(
@@ -211,6 +221,14 @@ class UserManager:
                 )
             else:
                 validated_update_dict[field] = value
+
+        error = await self._already_exists_error(
+            validated_update_dict.get("email"),
+            validated_update_dict.get("username"),
+            exclude=user,
+        )
+        if error is not None:
+            raise error
         return validated_update_dict
 
     async def _update_user(self, user: User, update_dict: dict[str, Any]) -> User:
@@ -218,8 +236,17 @@ class UserManager:
             setattr(user, key, value)
 
         self.session.add(user)
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            # a concurrent request took the email or username after the check
+            await self.session.rollback()
+            raise exceptions.UserAlreadyExistsError(
+                "User already exists", error_code=ErrorCode.USER_ALREADY_EXISTS
+            ) from e
         await self.session.refresh(user)
+        if update_dict.get("is_active") is False:
+            await revocation_list.revoke_user(user.id, TokenManager.REFRESH_LIFETIME_SECONDS)
         return user
 
     async def authenticate(self, credentials: OAuth2PasswordRequestForm):
@@ -1,14 +1,25 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.core.config import settings
+from app.utils.rate_limit import WRITE_METHODS, RateLimiter, account_name
 
-from . import auth, category, docs, news, reset, user
+from . import auth, category, docs, feed, health, news, reset, user, verification
 
 auth.router.include_router(reset.router)
+auth.router.include_router(verification.router)
+
+# login, register and the email sending endpoints, limited per ip and per account
+auth_rate_limits = [
+    Depends(RateLimiter(settings.RATE_LIMIT_AUTH)),
+    Depends(RateLimiter(settings.RATE_LIMIT_AUTH_ACCOUNT, key=account_name, name="account")),
+]
+write_rate_limits = [Depends(RateLimiter(settings.RATE_LIMIT_WRITE, methods=WRITE_METHODS))]
 
 router = APIRouter(prefix=f"/api/{settings.API_V1_STR}")
 router.include_router(docs.router)
-router.include_router(auth.router)
-router.include_router(user.router)
+router.include_router(health.router)
+router.include_router(auth.router, dependencies=auth_rate_limits)
+router.include_router(user.router, dependencies=write_rate_limits)
 router.include_router(category.router)
 router.include_router(news.router)
+router.include_router(feed.router)
@@ -3,10 +3,14 @@ from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_utils.cbv import cbv
 
+from app.api.dependencies.authentication import oauth2_scheme
 from app.api.dependencies.user_manager import UserManager, get_user_manager
+from app.db.models.user import User
+from app.schemas.token import LogoutRequest, RefreshTokenRequest
 from app.schemas.user import UserCreate, UserRead
 from app.utils import exceptions
 from app.utils.common import ErrorCode
+from app.utils.revocation import revocation_list
 from app.utils.token import TokenManager
 
 r = router = APIRouter(prefix="/auth", tags=["auth"])
@@ -32,8 +36,68 @@ class Authentication:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        return self._token_response(user)
+
+    @r.post("/refresh", status_code=status.HTTP_200_OK)
+    async def refresh(self, data: RefreshTokenRequest):
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "error_code": ErrorCode.INVALID_TOKEN_CREDENTIALS,
+                "messages": ["Invalid or expired refresh token"],
+            },
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            payload = await self.token_manager.consume_refresh_token(data.refresh_token)
+            user = await self.user_manager.get_by_id(
+                self.user_manager.parse_id(payload["sub"])
+            )
+        except (KeyError, exceptions.InvalidVerifyTokenError, exceptions.InvalidIDError) as e:
+            raise credentials_exception from e
+
+        if user is None or not user.is_active:
+            raise credentials_exception
+
+        # rotation, the refresh token used here is not accepted anymore
+        return self._token_response(user)
+
+    @r.post("/logout", status_code=status.HTTP_202_ACCEPTED)
+    async def logout(
+        self,
+        data: LogoutRequest | None = None,
+        token: str | None = Depends(oauth2_scheme),
+    ):
+        try:
+            payload = self.token_manager.decode_access_token(token or "")
+        except exceptions.InvalidVerifyTokenError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "error_code": ErrorCode.INVALID_TOKEN_CREDENTIALS,
+                    "messages": ["Could not validate credentials"],
+                },
+                headers={"WWW-Authenticate": "Bearer"},
+            ) from e
+
+        if "jti" in payload:
+            await revocation_list.revoke(payload["jti"], payload["exp"])
+
+        if data is not None and data.refresh_token:
+            try:
+                refresh_payload = self.token_manager.decode_token(
+                    data.refresh_token,
+                    self.token_manager.REFRESH_SECRET_KEY,
+                    [self.token_manager.REFRESH_AUDIENCE],
+                )
+            except exceptions.InvalidVerifyTokenError:
+                return
+            if "jti" in refresh_payload and refresh_payload.get("sub") == payload.get("sub"):
+                await revocation_list.revoke(refresh_payload["jti"], refresh_payload["exp"])
+
+    def _token_response(self, user: User) -> JSONResponse:
         access_token = self.token_manager.create_access_token(user)
-        refresh_token = self.token_manager.create_refresh_token(access_token)
+        refresh_token = self.token_manager.create_refresh_token(user)
 
         return JSONResponse(
             {
@@ -3,11 +3,13 @@ from typing import Any
 from fastapi import APIRouter, Depends, status
 from fastapi_utils.cbv import cbv
 from fastcrud import FastCRUD
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.sessions import get_async_read_session
 from app.db.models.category import Category
-from app.schemas.category import CategoryRead
+from app.db.models.news_counter import NewsCounter
+from app.schemas.category import CategoryCountRead, CategoryRead
 from app.schemas.pagination import SimplePaginationSchema
 
 category_crud: FastCRUD[
@@ -24,7 +26,7 @@ r = router = APIRouter(tags=["category"])
 
 @cbv(router)
 class _Category:
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_async_read_session)
 
     @r.get(
         "/category",
@@ -35,3 +37,27 @@ class _Category:
         self,
     ):  # -> GetMultiResponseModel[Any] | GetMultiResponseDict:
         return await category_crud.get_multi(self.db, schema_to_select=CategoryRead)
+
+    @r.get(
+        "/category/counts",
+        status_code=status.HTTP_200_OK,
+        response_model=SimplePaginationSchema[CategoryCountRead],
+    )
+    async def get_all_categories_with_count(self):
+        query = (
+            select(
+                Category.id,
+                Category.name,
+                func.coalesce(NewsCounter.count, 0).label("news_count"),
+            )
+            .outerjoin(
+                NewsCounter,
+                and_(
+                    NewsCounter.scope == NewsCounter.CATEGORY,
+                    NewsCounter.ref_id == Category.id,
+                ),
+            )
+            .order_by(Category.name)
+        )
+        data = (await self.db.execute(query)).mappings().all()
+        return {"total_count": len(data), "data": data}
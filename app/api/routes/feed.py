@@ -0,0 +1,65 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi_utils.cbv import cbv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.sessions import get_async_read_session
+from app.utils import exceptions
+from app.utils.feed import Feed, FeedFormat, feed_cache
+
+r = router = APIRouter(tags=["feed"])
+
+
+def is_not_modified(request: Request, feed: Feed) -> bool:
+    """Check the conditional headers of the request against a feed."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+        return "*" in etags or feed.etag in etags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return feed.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+@cbv(r)
+class _Feed:
+    db: AsyncSession = Depends(get_async_read_session)
+
+    async def _feed_response(
+        self, request: Request, feed_format: FeedFormat, category_id: UUID | None
+    ) -> Response:
+        try:
+            feed = await feed_cache.get(self.db, feed_format, category_id)
+        except exceptions.CategoryNotFoundError as e:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, e.dump()) from e
+
+        headers = {
+            "ETag": feed.etag,
+            "Last-Modified": format_datetime(feed.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={int(feed_cache.ttl)}",
+        }
+        if is_not_modified(request, feed):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(feed.body, media_type=feed_format.media_type, headers=headers)
+
+    @r.get("/feed/{feed_format}", status_code=status.HTTP_200_OK, response_class=Response)
+    async def get_feed(self, request: Request, feed_format: FeedFormat):
+        return await self._feed_response(request, feed_format, None)
+
+    @r.get(
+        "/feed/category/{category_id}/{feed_format}",
+        status_code=status.HTTP_200_OK,
+        response_class=Response,
+    )
+    async def get_category_feed(
+        self, request: Request, category_id: UUID, feed_format: FeedFormat
+    ):
+        return await self._feed_response(request, feed_format, category_id)
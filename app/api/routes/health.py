@@ -0,0 +1,46 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.config import settings
+from app.utils.metrics import metrics
+from app.utils.warmup import warmup
+from app.utils.watchdog import db_connections, loop_watchdog
+
+r = router = APIRouter(tags=["health"])
+
+
+@r.get("/health")
+async def health():
+    """Liveness of the worker answering the request."""
+    return {"status": "ok"}
+
+
+@r.get("/ready")
+async def ready():
+    """Readiness of the worker.
+
+    503 with ``starting`` until its startup warm-up is done, and with
+    ``degraded`` while its event loop lags or it holds too many database
+    connections.
+    """
+    checks = {
+        "loop_lag_seconds": round(loop_watchdog.lag, 4),
+        "db_connections": db_connections.in_use,
+    }
+    body = {"status": "ready", "checks": checks, "warmup": warmup.report()}
+    if not warmup.ready:
+        body["status"] = "starting"
+    elif (
+        loop_watchdog.lag > settings.READY_MAX_LOOP_LAG_SECONDS
+        or db_connections.in_use > settings.READY_MAX_DB_CONNECTIONS
+    ):
+        body["status"] = "degraded"
+    if body["status"] == "ready":
+        return body
+    return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@r.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Metrics of the worker answering the request, in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
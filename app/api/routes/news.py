@@ -1,25 +1,69 @@
+import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from fastapi_utils.cbv import cbv
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.api.dependencies.sessions import get_async_session
+from app.api.dependencies.authentication import get_current_admin_user
+from app.api.dependencies.loaders import get_loaders
+from app.api.dependencies.sessions import get_async_read_session, read_session
+from app.core.config import get_settings
+from app.db.base import read_your_writes
 from app.db.models.news import News
-from app.schemas.news import NewsPublicRead
+from app.db.models.news_related import NewsRelated
+from app.db.models.user import User
+from app.db.partitions import months_ago
+from app.schemas.news import NewsBatchRead, NewsCountRead, NewsPublicRead, NewsSuggestRead
 from app.schemas.pagination import PaginationSchema
 from app.utils import exceptions
 from app.utils.common import ErrorCode
+from app.utils.export import ExportFormat, news_export_query, stream_news_export
+from app.utils.loader import RequestLoaders
+from app.utils.news_cache import load_news_detail, news_cache
+from app.utils.news_counter import NewsCounterService
 from app.utils.pagination import paginate
+from app.utils.pubsub import news_hub, stream_events
+from app.utils.suggest import suggest_index
+from app.utils.views import view_tracker
 
 r = router = APIRouter(tags=["news"])
 
 
+def filter_news(
+    query: Select,
+    author: str | None = None,
+    category: UUID | None = None,
+    search: str | None = None,
+    since: datetime.datetime | None = None,
+    until: datetime.datetime | None = None,
+) -> Select:
+    """Apply the public news filters to a query selecting from ``News``."""
+    if since:
+        query = query.where(News.published_at >= since)
+
+    if until:
+        query = query.where(News.published_at < until)
+
+    if search:
+        query = query.where(News.title.ilike(f"%{search}%"))
+
+    if category:
+        query = query.where(News.category_id == category)
+
+    if author:
+        query = query.where(News.user.has(username=author.lower()))
+
+    return query
+
+
 @cbv(r)
 class _News:
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_async_read_session)
 
     @r.get(
         "/news",
@@ -34,41 +78,225 @@ class _News:
         category: UUID | None = None,
         search: str | None = None,
         latest: bool = True,
+        since: datetime.datetime | None = Query(
+            default=None, description="Only news published at or after this time"
+        ),
+        until: datetime.datetime | None = Query(
+            default=None, description="Only news published before this time"
+        ),
     ):
         query = (
             select(News)
             .options(selectinload(News.category), selectinload(News.user))
             .order_by(News.published_at.desc() if latest else News.published_at.asc())
         )
+        query = filter_news(
+            query, author=author, category=category, search=search, since=since, until=until
+        )
+
+        count = window = None
+        if not ((author and category) or search or since or until):
+            count = await NewsCounterService(self.db).total(author=author, category=category)
+        if latest and not since:
+            # the latest news are in the partitions of the last months
+            recent = months_ago(get_settings().NEWS_RECENT_WINDOW_MONTHS)
+            window = News.published_at >= datetime.datetime.combine(recent, datetime.time())
+        return await paginate(self.db, query, page, per_page, count=count, window=window)
+
+    @r.get(
+        "/news/count",
+        status_code=status.HTTP_200_OK,
+        response_model=NewsCountRead,
+    )
+    async def get_news_count(
+        self,
+        author: str | None = None,
+        category: UUID | None = None,
+    ):
+        if author and category:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                exceptions.ValidationError(
+                    "Filter by either author or category",
+                    error_code=ErrorCode.INVALID_NEWS_FILTER,
+                ).dump(),
+            )
+
+        counter = NewsCounterService(self.db)
+        return {"count": await counter.total(author=author, category=category)}
+
+    async def _get_ranked_news(self, ids: list[UUID]) -> list[News]:
+        if not ids:
+            return []
+        query = (
+            select(News)
+            .options(selectinload(News.category), selectinload(News.user))
+            .where(News.id.in_(ids))
+        )
+        news = {item.id: item for item in (await self.db.scalars(query))}
+        return [news[news_id] for news_id in ids if news_id in news]
+
+    @r.get(
+        "/news/batch",
+        status_code=status.HTTP_200_OK,
+        response_model=NewsBatchRead,
+    )
+    async def get_news_batch(
+        self,
+        ids: list[str] = Query(description="News ids, repeated or comma separated"),
+        loaders: RequestLoaders = Depends(get_loaders),
+    ):
+        requested = list(
+            dict.fromkeys(
+                value.strip() for param in ids for value in param.split(",") if value.strip()
+            )
+        )
+        if len(requested) > get_settings().NEWS_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                exceptions.ValidationError(
+                    f"At most {get_settings().NEWS_BATCH_MAX_ITEMS} ids per request",
+                    error_code=ErrorCode.TOO_MANY_NEWS_IDS,
+                ).dump(),
+            )
+
+        news_ids: dict[str, UUID] = {}
+        for value in requested:
+            try:
+                news_ids[value] = UUID(value)
+            except ValueError:
+                continue
 
-        if search:
-            query = query.where(News.title.ilike(f"%{search}%"))
+        news_list = await loaders.news.load_many(dict.fromkeys(news_ids.values()))
+        found = [news for news in news_list if news is not None]
+        # the loaders share the session of the request, one query at a time
+        users = await loaders.users.load_many(news.user_id for news in found)
+        categories = await loaders.categories.load_many(news.category_id for news in found)
+        for news, user, category in zip(found, users, categories, strict=True):
+            set_committed_value(news, "user", user)
+            set_committed_value(news, "category", category)
 
-        if category:
-            query = query.where(News.category_id == category)
+        loaded = {news.id for news in found}
+        return {
+            "items": found,
+            "missing": [value for value in requested if news_ids.get(value) not in loaded],
+        }
 
-        if author:
-            query = query.join(News.user).where(News.user.has(username=author.lower()))
+    @r.get(
+        "/news/trending",
+        status_code=status.HTTP_200_OK,
+        response_model=list[NewsPublicRead],
+    )
+    async def get_trending_news(self, limit: int = Query(default=20, ge=1, le=100)):
+        return await self._get_ranked_news(view_tracker.ranking.trending[:limit])
 
-        return await paginate(self.db, query, page, per_page)
+    @r.get(
+        "/news/most-read",
+        status_code=status.HTTP_200_OK,
+        response_model=list[NewsPublicRead],
+    )
+    async def get_most_read_news(self, limit: int = Query(default=20, ge=1, le=100)):
+        return await self._get_ranked_news(view_tracker.ranking.most_read[:limit])
 
     @r.get(
         "/news{news_id}",
         status_code=status.HTTP_200_OK,
         response_model=NewsPublicRead,
     )
-    async def get_news_by_id(self, news_id: UUID):
-        query = (
-            select(News)
-            .options(selectinload(News.category), selectinload(News.user))
-            .where(News.id == news_id)
-        )
-        news = (await self.db.execute(query)).scalar_one_or_none()
-        if not news:
+    async def get_news_by_id(self, news_id: UUID, request: Request):
+        if read_your_writes.is_sticky(request):
+            # the client wrote recently, read its own writes from the primary
+            body = await load_news_detail(self.db, news_id)
+        else:
+            body = await news_cache.get(news_id)
+        if body is None:
             raise HTTPException(
                 status.HTTP_404_NOT_FOUND,
                 exceptions.NewsNotFoundError(
                     "News not found", error_code=ErrorCode.NEWS_NOT_FOUND
                 ).dump(),
             )
-        return news
+        view_tracker.hit(news_id)
+        return Response(body, media_type="application/json")
+
+    @r.get(
+        "/news{news_id}/related",
+        status_code=status.HTTP_200_OK,
+        response_model=list[NewsPublicRead],
+    )
+    async def get_related_news(
+        self, news_id: UUID, limit: int = Query(default=5, ge=1, le=20)
+    ):
+        query = (
+            select(News)
+            .join(NewsRelated, NewsRelated.related_id == News.id)
+            .options(selectinload(News.category), selectinload(News.user))
+            .where(NewsRelated.news_id == news_id)
+            .order_by(NewsRelated.rank)
+            .limit(limit)
+        )
+        return (await self.db.scalars(query)).all()
+
+
+@cbv(r)
+class _NewsExport:
+    current_user: User = Depends(get_current_admin_user)
+    request: Request
+
+    @r.get("/news/export", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+    async def export_news(
+        self,
+        export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+        author: str | None = None,
+        category: UUID | None = None,
+        search: str | None = None,
+        since: datetime.datetime | None = Query(
+            default=None, description="Only export news updated at or after this time"
+        ),
+    ):
+        query = filter_news(
+            news_export_query(), author=author, category=category, search=search
+        )
+        if since:
+            query = query.where(News.update_at >= since).order_by(
+                News.update_at.asc(), News.id.asc()
+            )
+        else:
+            query = query.order_by(News.published_at.asc(), News.id.asc())
+
+        return StreamingResponse(
+            stream_news_export(query, export_format, read_session(self.request)),
+            media_type=export_format.media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="news.{export_format}"',
+            },
+        )
+
+
+@r.get("/news/stream", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def stream_news(request: Request, category: UUID | None = None):
+    """Server-Sent Events stream of newly published news."""
+    subscription = news_hub.subscribe(
+        str(category) if category else None, event_types={"created"}
+    )
+    return StreamingResponse(
+        stream_events(
+            subscription,
+            request.is_disconnected,
+            get_settings().NEWS_STREAM_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@r.get("/news/suggest", status_code=status.HTTP_200_OK, response_model=NewsSuggestRead)
+async def suggest_news(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=20),
+):
+    """Autocomplete of the search box, answered from memory without a database query."""
+    return {
+        "news": suggest_index.suggest(q, limit),
+        "authors": suggest_index.suggest_authors(q, limit),
+    }
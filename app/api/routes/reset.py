@@ -7,10 +7,11 @@ from fastapi_utils.cbv import cbv
 from app.api.dependencies.user_manager import UserManager, get_user_manager
 from app.schemas.reset_password import ResetPasswordRequest
 from app.schemas.user import UserPasswordUpdate, UserResetPasswordUpdate, UserUpdate
-from app.templates import templates
+from app.tasks import send_user_email
 from app.utils import exceptions
 from app.utils.common import ErrorCode
-from app.utils.mail import EmailService
+from app.utils.jobs import job_queue
+from app.utils.revocation import revocation_list
 from app.utils.security import PasswordHelper
 from app.utils.token import TokenManager
 
@@ -27,7 +28,7 @@ class ResetPassword:
 
     @r.post("/request-password-change", status_code=status.HTTP_202_ACCEPTED)
     async def request_password_change(
-        self, request: Request, background_tasks: BackgroundTasks, data: ResetPasswordRequest
+        self, request: Request, data: ResetPasswordRequest, background_tasks: BackgroundTasks
     ):
         try:
             user = await self.user_manager.get_by_email(data.email)
@@ -55,21 +56,12 @@ class ResetPassword:
             user=user,
         )
 
-        email_service = EmailService()
-        reset_password_url = (
-            f"{request.base_url}api/v1/auth/confirm-password-change?token={token}"
-        )
-        email_body = templates.TemplateResponse(
-            name="email/reset_password.html",
-            context={
-                "request": request,
-                "user": user,
-                "reset_password_url": reset_password_url,
-            },
-        ).body.decode("utf-8")  # type: ignore
-
-        background_tasks.add_task(
-            email_service.send_email, "Email Reset Password", user.email, email_body
+        await job_queue.enqueue(
+            send_user_email,
+            background=background_tasks,
+            kind="reset_password",
+            user_id=str(user.id),
+            base_url=str(request.base_url),
         )
 
     @r.get("/confirm-password-change", status_code=status.HTTP_202_ACCEPTED)
@@ -119,3 +111,5 @@ class ResetPassword:
             password_change_token_expires_at=None,
         )
         await self.user_manager.update(user_update, user)
+        # sign out every session opened with the old password
+        await revocation_list.revoke_user(user.id, self.token_manager.REFRESH_LIFETIME_SECONDS)
@@ -1,19 +1,37 @@
 import datetime
+import uuid
+from typing import Iterable, Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
 from fastapi_utils.cbv import cbv
 from fastcrud import FastCRUD
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.dependencies.authentication import get_current_active_user
 from app.api.dependencies.sessions import get_async_session
 from app.api.dependencies.user_manager import UserManager, get_user_manager
+from app.core.config import get_settings
+from app.db.base import read_your_writes
+from app.db.models.category import Category
 from app.db.models.news import News
 from app.db.models.user import User
 from app.schemas.news import (
+    UserNewsBatchCreate,
+    UserNewsBatchResult,
+    UserNewsBatchUpdate,
+    UserNewsBatchUpdateItem,
     UserNewsCreate,
     UserNewsRead,
     UserNewsRequestCreate,
@@ -21,10 +39,16 @@ from app.schemas.news import (
 )
 from app.schemas.pagination import PaginationSchema
 from app.schemas.user import UserRead, UserUpdate
+from app.tasks import update_related_news
 from app.utils import exceptions
 from app.utils.cloudinary import upload_image_to_cloudinary
 from app.utils.common import ErrorCode
+from app.utils.dedupe import Check, LshIndex, duplicate_detector
+from app.utils.jobs import job_queue
+from app.utils.news_cache import news_cache
+from app.utils.news_counter import NewsCounterService
 from app.utils.pagination import paginate
+from app.utils.pubsub import NewsEvent, news_hub
 from app.utils.validator import validate_file_image
 
 r = router = APIRouter(tags=["user"])
@@ -35,6 +59,7 @@ news_crud = FastCRUD(News)
 @cbv(r)
 class _User:
     user_manager: UserManager = Depends(get_user_manager)
+    db: AsyncSession = Depends(get_async_session)
     current_user: User = Depends(get_current_active_user)
 
     @r.get("/me", status_code=status.HTTP_200_OK, response_model=UserRead)
@@ -43,19 +68,27 @@ class _User:
 
     @r.put("/me", status_code=status.HTTP_200_OK, response_model=UserRead)
     async def update(self, user_update: UserUpdate):
+        author = (self.current_user.username, self.current_user.name)
         try:
-            return await self.user_manager.update(user_update, self.current_user, safe=True)
+            user = await self.user_manager.update(user_update, self.current_user, safe=True)
         except exceptions.UserAlreadyExistsError as e:
             raise HTTPException(status.HTTP_406_NOT_ACCEPTABLE, detail=e.dump()) from e
         except exceptions.ValidationError as e:
             raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.dump()) from e
 
+        if (user.username, user.name) != author:
+            # the cached news embed the author
+            news_ids = await self.db.scalars(select(News.id).where(News.user_id == user.id))
+            await news_cache.invalidate(*news_ids)
+        return user
+
 
 @cbv(r)
 class _MeNews:
     user_manager: UserManager = Depends(get_user_manager)
     db: AsyncSession = Depends(get_async_session)
     current_user: User = Depends(get_current_active_user)
+    response: Response
 
     @r.get(
         "/me/news",
@@ -85,21 +118,302 @@ class _MeNews:
 
         return await paginate(self.db, query, page, per_page)
 
+    async def _publish_created(self, news: News | dict) -> None:
+        data = UserNewsRead.model_validate(news).model_dump(mode="json")
+        await news_hub.publish(NewsEvent.created(data, self.current_user.username))
+
+    async def _publish_changed(
+        self,
+        event_type: str,
+        news_id: UUID,
+        category_id: UUID,
+        previous_category_id: UUID | None = None,
+        title: str | None = None,
+    ) -> None:
+        data = {"id": str(news_id), "category_id": str(category_id)}
+        if title is not None:
+            data["title"] = title
+        if previous_category_id is not None and previous_category_id != category_id:
+            data["previous_category_id"] = str(previous_category_id)
+        # the other workers drop their cached copy on the event
+        await news_cache.invalidate(news_id)
+        await news_hub.publish(NewsEvent(event_type, str(news_id), str(category_id), data))
+
+    async def _publish_updated(
+        self, news_list: Sequence[News], previous_categories: dict[UUID, UUID]
+    ) -> None:
+        for news in news_list:
+            await self._publish_changed(
+                "updated",
+                news.id,
+                news.category_id,
+                previous_categories.get(news.id),
+                title=news.title,
+            )
+
+    async def _queue_related(self, news_ids: Iterable[UUID]) -> None:
+        news_ids = [str(news_id) for news_id in news_ids]
+        if news_ids:
+            await job_queue.enqueue(update_related_news, news_ids=news_ids)
+
+    async def _check_duplicate(
+        self, content: str, exclude: UUID | None = None
+    ) -> Check | None:
+        if get_settings().NEWS_DEDUPE_MODE == "off":
+            return None
+        return await duplicate_detector.check(self.db, content, exclude)
+
+    async def _duplicate_batch(self) -> LshIndex | None:
+        """Sync the duplicate index once for a batch, None when the check is off."""
+        if get_settings().NEWS_DEDUPE_MODE == "off":
+            return None
+        await duplicate_detector.sync(self.db)
+        return duplicate_detector.batch()
+
+    @staticmethod
+    def _match_edit(
+        content: str | None, batch: LshIndex | None, news_id: UUID
+    ) -> Check | None:
+        """Check the new content of a batch item, None when unchanged or the check is off."""
+        if content is None or batch is None:
+            return None
+        return duplicate_detector.match(content, batch, exclude=news_id)
+
+    @staticmethod
+    def _duplicate_error(check: Check | None) -> exceptions.DuplicateNewsError | None:
+        """The error to reject a near-duplicate with, None when it is accepted or flagged."""
+        if check is None or check.duplicate_of is None:
+            return None
+        if get_settings().NEWS_DEDUPE_MODE != "reject":
+            return None
+        return exceptions.DuplicateNewsError(
+            f"News is a near-duplicate of {check.duplicate_of}",
+            error_code=ErrorCode.DUPLICATE_NEWS,
+        )
+
     @r.post("/me/news", status_code=status.HTTP_200_OK, response_model=UserNewsRead)
     async def create_news(self, data: UserNewsRequestCreate):
+        check = await self._check_duplicate(data.content)
+        if error := self._duplicate_error(check):
+            raise HTTPException(status.HTTP_409_CONFLICT, error.dump())
+
         news = UserNewsCreate(
             user_id=self.current_user.id,
             published_at=datetime.datetime.now(datetime.timezone.utc),
             **data.model_dump(),
         )
 
-        news = await news_crud.create(self.db, news)
+        news = await news_crud.create(self.db, news, commit=False)
+        if check is not None:
+            # assigns the id of the news
+            await self.db.flush()
+            duplicate_detector.record(self.db, news.id, check)
+        await NewsCounterService(self.db).created(news.category_id, news.user_id).flush()
+        await self.db.commit()
+        read_your_writes.mark(self.response)
+        if check is not None:
+            duplicate_detector.add(news.id, check)
 
-        return (
+        news = (
             await self.db.execute(
                 select(News).where(News.id == news.id).options(selectinload(News.category))
             )
         ).scalar_one()
+        await self._publish_created(news)
+        await self._queue_related([news.id])
+        return news
+
+    async def _get_categories(self, category_ids: set[UUID]) -> dict[UUID, Category]:
+        if not category_ids:
+            return {}
+        result = await self.db.scalars(select(Category).where(Category.id.in_(category_ids)))
+        return {category.id: category for category in result}
+
+    @staticmethod
+    def _batch_result(results: list[dict]) -> dict:
+        failed = sum(1 for result in results if result["status"] == "failed")
+        return {"succeeded": len(results) - failed, "failed": failed, "items": results}
+
+    @staticmethod
+    def _batch_error(index: int, error: exceptions.AppException) -> dict:
+        return {"index": index, "status": "failed", "error": error.dump()}
+
+    @r.post(
+        "/me/news:batch", status_code=status.HTTP_200_OK, response_model=UserNewsBatchResult
+    )
+    async def create_news_batch(self, data: UserNewsBatchCreate):
+        categories = await self._get_categories({item.category_id for item in data.items})
+        published_at = datetime.datetime.now(datetime.timezone.utc)
+        batch = await self._duplicate_batch()
+
+        results: list[dict] = [{} for _ in data.items]
+        rows, indexes, checks = [], [], {}
+        for index, item in enumerate(data.items):
+            if item.category_id not in categories:
+                results[index] = self._batch_error(
+                    index,
+                    exceptions.CategoryNotFoundError(
+                        "Category not found", error_code=ErrorCode.CATEGORY_NOT_FOUND
+                    ),
+                )
+                continue
+            check = (
+                duplicate_detector.match(item.content, batch) if batch is not None else None
+            )
+            if error := self._duplicate_error(check):
+                results[index] = self._batch_error(index, error)
+                continue
+            news = UserNewsCreate(
+                user_id=self.current_user.id, published_at=published_at, **item.model_dump()
+            )
+            # the id is known before the insert, so the next items are checked against it
+            rows.append({"id": uuid.uuid4(), **news.model_dump()})
+            indexes.append(index)
+            if check is not None:
+                duplicate_detector.record(self.db, rows[-1]["id"], check)
+                batch.add(rows[-1]["id"], check.signature)
+                checks[rows[-1]["id"]] = check
+
+        if rows:
+            # single multi-row INSERT ... RETURNING, rows come back in input order
+            created = await self.db.execute(
+                insert(News).returning(
+                    News.id,
+                    News.title,
+                    News.content,
+                    News.image_url,
+                    News.category_id,
+                    News.published_at,
+                    sort_by_parameter_order=True,
+                ),
+                rows,
+            )
+            counter = NewsCounterService(self.db)
+            for index, news in zip(indexes, created.mappings(), strict=True):
+                counter.created(news["category_id"], self.current_user.id)
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "news": {**news, "category": categories[news["category_id"]]},
+                }
+            await counter.flush()
+            await self.db.commit()
+            read_your_writes.mark(self.response)
+            for news_id, check in checks.items():
+                duplicate_detector.add(news_id, check)
+            created_ids = []
+            for result in results:
+                if result["status"] == "created":
+                    await self._publish_created(result["news"])
+                    created_ids.append(result["news"]["id"])
+            await self._queue_related(created_ids)
+
+        return self._batch_result(results)
+
+    @staticmethod
+    def _batch_update_error(
+        item: UserNewsBatchUpdateItem,
+        values: dict,
+        owned: dict[UUID, UUID],
+        categories: dict[UUID, Category],
+        updated: dict[UUID, int],
+    ) -> exceptions.AppException | None:
+        """The error to fail an item of a batch update with, None when it can be applied."""
+        if item.id in updated:
+            return exceptions.DuplicateBatchItemError(
+                "News already updated in this batch",
+                error_code=ErrorCode.DUPLICATE_BATCH_ITEM,
+            )
+        if item.id not in owned:
+            return exceptions.NewsNotFoundError(
+                "News not found", error_code=ErrorCode.NEWS_NOT_FOUND
+            )
+        if "category_id" in values and values["category_id"] not in categories:
+            return exceptions.CategoryNotFoundError(
+                "Category not found", error_code=ErrorCode.CATEGORY_NOT_FOUND
+            )
+        return None
+
+    @r.patch(
+        "/me/news:batch",
+        status_code=status.HTTP_202_ACCEPTED,
+        response_model=UserNewsBatchResult,
+    )
+    async def update_news_batch(self, data: UserNewsBatchUpdate):
+        owned = dict(
+            (
+                await self.db.execute(
+                    select(News.id, News.category_id).where(
+                        News.id.in_({item.id for item in data.items}),
+                        News.user_id == self.current_user.id,
+                    )
+                )
+            )
+            .tuples()
+            .all()
+        )
+        categories = await self._get_categories(
+            {item.category_id for item in data.items if item.category_id}
+        )
+
+        batch = (
+            await self._duplicate_batch() if any(item.content for item in data.items) else None
+        )
+
+        results: list[dict] = [{} for _ in data.items]
+        updated: dict[UUID, int] = {}
+        # executemany needs the same columns for every row, so group by columns
+        params_by_columns: dict[tuple[str, ...], list[dict]] = {}
+        checks: dict[UUID, Check] = {}
+        counter = NewsCounterService(self.db)
+        for index, item in enumerate(data.items):
+            values = item.model_dump(exclude={"id"}, exclude_unset=True, exclude_none=True)
+            error = self._batch_update_error(item, values, owned, categories, updated)
+            check = None if error else self._match_edit(values.get("content"), batch, item.id)
+            error = error or self._duplicate_error(check)
+            if error is not None:
+                results[index] = self._batch_error(index, error)
+                continue
+
+            updated[item.id] = index
+            if check is not None:
+                batch.add(item.id, check.signature)
+                checks[item.id] = check
+            if values:
+                params_by_columns.setdefault(tuple(sorted(values)), []).append(
+                    {"_id": item.id, **values}
+                )
+            if "category_id" in values:
+                counter.moved(owned[item.id], values["category_id"])
+
+        if updated:
+            table = News.__table__
+            for params in params_by_columns.values():
+                await self.db.execute(
+                    update(table).where(table.c.id == bindparam("_id")), params
+                )
+            await counter.flush()
+            await duplicate_detector.replace(self.db, checks)
+            news_list = await self.db.scalars(
+                select(News).where(News.id.in_(updated)).options(selectinload(News.category))
+            )
+            news_list = news_list.all()
+            for news in news_list:
+                index = updated[news.id]
+                results[index] = {"index": index, "status": "updated", "news": news}
+            await self.db.commit()
+            read_your_writes.mark(self.response)
+            for news_id, check in checks.items():
+                duplicate_detector.add(news_id, check)
+            await self._publish_updated(news_list, owned)
+            await self._queue_related(
+                params["_id"]
+                for columns, rows in params_by_columns.items()
+                if {"title", "content"} & set(columns)
+                for params in rows
+            )
+
+        return self._batch_result(results)
 
     @r.patch(
         "/me/news/{news_id}", status_code=status.HTTP_202_ACCEPTED, response_model=UserNewsRead
@@ -127,16 +441,41 @@ class _MeNews:
                 ).dump(),
             )
 
-        await news_crud.update(
-            self.db,
-            data.model_dump(exclude_unset=True, exclude_none=True),
-            id=news_id,
-        )
-        return (
+        news_category_id = news["category_id"]
+        update_data = data.model_dump(exclude_unset=True, exclude_none=True)
+        check = None
+        if "content" in update_data:
+            check = await self._check_duplicate(update_data["content"], news_id)
+            if error := self._duplicate_error(check):
+                raise HTTPException(status.HTTP_409_CONFLICT, error.dump())
+        await news_crud.update(self.db, update_data, id=news_id, commit=False)
+        if check is not None:
+            await duplicate_detector.replace(self.db, {news_id: check})
+        if "category_id" in update_data:
+            await (
+                NewsCounterService(self.db)
+                .moved(news_category_id, update_data["category_id"])
+                .flush()
+            )
+        await self.db.commit()
+        read_your_writes.mark(self.response)
+        if check is not None:
+            duplicate_detector.add(news_id, check)
+        news = (
             await self.db.execute(
                 select(News).where(News.id == news_id).options(selectinload(News.category))
             )
         ).scalar_one()
+        await self._publish_changed(
+            "updated",
+            news.id,
+            news.category_id,
+            previous_category_id=news_category_id,
+            title=news.title,
+        )
+        if {"title", "content"} & update_data.keys():
+            await self._queue_related([news.id])
+        return news
 
     @r.delete("/me/news/{news_id}", status_code=status.HTTP_202_ACCEPTED)
     async def delete_news(self, news_id: UUID):
@@ -155,7 +494,12 @@ class _MeNews:
             )
 
         await self.db.delete(news)
+        await duplicate_detector.forget(self.db, news_id)
+        await NewsCounterService(self.db).deleted(news.category_id, news.user_id).flush()
         await self.db.commit()
+        read_your_writes.mark(self.response)
+        await self._publish_changed("deleted", news_id, news.category_id)
+        await self._queue_related([news_id])
 
     @r.post("/me/news/{news_id}/upload-image", status_code=status.HTTP_202_ACCEPTED)
     async def upload_image(self, news_id: UUID, file: UploadFile = File(...)):
@@ -185,6 +529,8 @@ class _MeNews:
                 {"image_url": result["secure_url"]},
                 id=news_id,
             )
+            read_your_writes.mark(self.response)
+            await self._publish_changed("updated", news_id, news["category_id"])
         except Exception as e:
             return HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e.args))
         finally:
@@ -3,11 +3,10 @@ from fastapi.responses import RedirectResponse
 from fastapi_utils.cbv import cbv
 
 from app.api.dependencies.user_manager import UserManager, get_user_manager
-from app.core.config import get_settings
 from app.schemas.user import VerifyUserUpdate
-from app.templates import templates
+from app.tasks import send_user_email
 from app.utils import exceptions
-from app.utils.mail import EmailService
+from app.utils.jobs import job_queue
 from app.utils.token import TokenManager
 
 r = router = APIRouter(tags=["verification"])
@@ -23,43 +22,25 @@ class Verification:
     @r.post("/request-token", status_code=status.HTTP_202_ACCEPTED)
     async def request_verify(
         self,
-        background_tasks: BackgroundTasks,
         request: Request,
+        background_tasks: BackgroundTasks,
         email: str = Body(..., embed=True),
     ):
         try:
             user = await self.user_manager.get_by_email(email)
-            token = self.token_manager.create_verification_token(user)
-        except (
-            exceptions.UserNotExistsError,
-            exceptions.UserAlreadyVerifiedError,
-            exceptions.UserInactiveError,
-        ):
+        except exceptions.UserNotExistsError:
             # avoid error
             return
+        if user.is_verified or not user.is_active:
+            return
 
-        # ON REQUEST VERIFY TOKEN
-        # for debug only
-        print(
-            f"Verification requested for user {user.id}. ",
-            f"Verification token: {token}",
-        )
-        email_service = EmailService()
-        verification_url = (
-            f"{request.base_url}api/{get_settings().API_V1_STR}/auth/verify?token={token}"
-        )
-        email_body = templates.TemplateResponse(
-            name="email/verification_email.html",
-            context={
-                "request": request,
-                "user": user,
-                "verification_url": verification_url,
-            },
-        ).body.decode("utf-8")
-
-        # TODO: Save token di DB
-        background_tasks.add_task(
-            email_service.send_email, "Email Verification", user.email, email_body
+        # the token is created by the job, when the email is sent
+        await job_queue.enqueue(
+            send_user_email,
+            background=background_tasks,
+            kind="verification",
+            user_id=str(user.id),
+            base_url=str(request.base_url),
         )
 
     @r.get("/verify")
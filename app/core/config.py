@@ -1,8 +1,12 @@
-from fastapi_mail import ConnectionConfig
+from typing import TYPE_CHECKING, Literal
+
 from pydantic import EmailStr, PostgresDsn, computed_field
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from fastapi_mail import ConnectionConfig
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -10,6 +14,18 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     DEBUG_MODE: bool = False
     API_V1_STR: str = "v1"
+    # False = tanpa warm-up, template email dicompile saat pertama dipakai (serverless)
+    STARTUP_PRELOAD: bool = True
+    # lewat dari ini worker mulai melayani, warm-up lanjut di background (/ready = 503)
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 10
+
+    # Watchdog event loop, stack dicatat jika loop terblokir lebih dari BLOCK_SECONDS
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.1
+    LOOP_WATCHDOG_BLOCK_SECONDS: float = 0.25
+    # /ready = degraded (503) jika lag loop atau koneksi database melewati batas ini
+    READY_MAX_LOOP_LAG_SECONDS: float = 0.5
+    READY_MAX_DB_CONNECTIONS: int = 40
 
     DB_DRIVER: str | None = None
     DB_SERVER: str | None = None
@@ -17,6 +33,16 @@ class Settings(BaseSettings):
     DB_DATABASE: str | None = None
     DB_USERNAME: str | None = None
     DB_PASSWORD: str | None = None
+    # create_all saat startup, None = hanya saat DEBUG_MODE (production pakai alembic)
+    DB_CREATE_TABLES: bool | None = None
+
+    # Read replica (Opsional), list DSN dalam format JSON
+    # DB_READ_YOUR_WRITES_SECONDS = lama client dibaca dari primary setelah menulis,
+    # dicatat di cookie last_write / header X-Last-Write
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_SECONDS: int = 30
+    DB_REPLICA_HEALTH_CHECK_TIMEOUT: float = 2.0
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
 
     # admin acount (Opsional)
     ADMIN_USERNAME: str | None = ""
@@ -27,6 +53,14 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_LIFETIME_SECONDS: int = 604800  # 7 days
     JWT_AUDIENCE: str = "users:auth"
+    ACCESS_TOKEN_CACHE_SIZE: int = 10_000
+    ACCESS_TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Token revocation list
+    REVOCATION_REFRESH_SECONDS: float = 5
+    REVOCATION_RELOAD_SECONDS: int = 3600
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
 
     RESET_PASSWORD_SECRET_KEY: str
     RESET_PASSWORD_LIFETIME_SECONDS: int = 3600  # 1 hours
@@ -41,10 +75,115 @@ class Settings(BaseSettings):
     MAIL_PASSWORD: str | None = None
     MAIL_SSL_TLS: bool = True
 
+    # Email validation, False = cek syntax saja tanpa DNS
+    EMAIL_CHECK_DELIVERABILITY: bool = True
+    EMAIL_DNS_TIMEOUT: float = 2.0
+    EMAIL_DOMAIN_CACHE_SIZE: int = 10_000
+    EMAIL_DOMAIN_CACHE_TTL_SECONDS: int = 86400
+    EMAIL_DOMAIN_NEGATIVE_CACHE_TTL_SECONDS: int = 600
+
+    # Batch news write
+    NEWS_BATCH_MAX_ITEMS: int = 100
+
+    # Deteksi berita duplikat (MinHash/LSH), "off", "flag" (ditandai) atau "reject" (ditolak)
+    NEWS_DEDUPE_MODE: Literal["off", "flag", "reject"] = "flag"
+    NEWS_DEDUPE_THRESHOLD: float = 0.8
+    NEWS_DEDUPE_NUM_PERM: int = 128
+    NEWS_DEDUPE_BANDS: int = 16
+    NEWS_DEDUPE_WINDOW_DAYS: int = 30
+
+    # News event stream (SSE), broker "memory" atau "postgres" (LISTEN/NOTIFY)
+    NEWS_BROKER: Literal["memory", "postgres"] = "memory"
+    NEWS_STREAM_HEARTBEAT_SECONDS: float = 15
+    NEWS_STREAM_QUEUE_SIZE: int = 100
+    NEWS_STREAM_MAX_DROPPED: int = 100
+
+    # View counter & trending news
+    VIEW_FLUSH_INTERVAL_SECONDS: int = 10
+    TRENDING_REFRESH_SECONDS: int = 60
+    TRENDING_WINDOW_HOURS: int = 48
+    TRENDING_HALF_LIFE_HOURS: float = 6
+    TRENDING_SIZE: int = 100
+
+    # Rate limit, format "<jumlah>/<second|minute|hour|day>"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "database"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_AUTH: str = "20/minute"
+    RATE_LIMIT_AUTH_ACCOUNT: str = "5/minute"
+    RATE_LIMIT_WRITE: str = "60/minute"
+
+    # Server production (python -m app.server), SERVER_WORKERS 0 = jumlah CPU
+    HOST: str = "127.0.0.1"
+    PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: int | None = None
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = True
+
+    # Job queue, JOB_RUNNER: "inline" = dijalankan di proses web setelah response, sekali
+    # (tanpa retry, cocok untuk Vercel), "app" = worker antrian di web app,
+    # "worker" = tabel jobs dibaca oleh proses terpisah (python -m app.worker)
+    JOB_RUNNER: Literal["inline", "app", "worker"] = "inline"
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10
+    JOB_RETRY_MAX_SECONDS: float = 3600
+    JOB_TIMEOUT_SECONDS: float = 120
+    JOB_LOCK_TIMEOUT_SECONDS: float = 600
+
+    # Scheduler tugas periodik, lock file di SCHEDULER_LOCK_DIR jika database bukan postgres
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_JITTER: float = 0.1
+    SCHEDULER_LOCK_DIR: str | None = None
+    CLEANUP_INTERVAL_SECONDS: int = 3600
+
+    # Related news (TF-IDF), dihitung oleh worker job
+    RELATED_NEWS_SIZE: int = 10
+    RELATED_NEWS_MAX_TERMS: int = 64
+    RELATED_NEWS_MAX_DF: float = 0.5
+    RELATED_NEWS_RELOAD_SECONDS: int = 86400
+
+    # Autocomplete judul dan penulis, index di memori tiap worker
+    # SUGGEST_MAX_SCAN = jumlah key maksimal yang diurutkan per query, di atasnya
+    # query dibaca dari bucket yang sudah urut terbaru
+    SUGGEST_MAX_NEWS: int = 50_000
+    SUGGEST_MAX_SCAN: int = 500
+    SUGGEST_RELOAD_SECONDS: int = 600
+
+    # Partisi bulanan tabel news (postgres), RETENTION_MONTHS 0 = simpan selamanya
+    NEWS_PARTITION_PREMAKE_MONTHS: int = 3
+    NEWS_PARTITION_RETENTION_MONTHS: int = 0
+    NEWS_PARTITION_CHECK_SECONDS: int = 86400
+    # daftar berita terbaru dibaca dari partisi bulan ini dan bulan lalu dulu
+    NEWS_RECENT_WINDOW_MONTHS: int = 1
+
+    # Cache detail berita, L1 di memori tiap worker, L2 "none" atau "database" (dibagi)
+    # TTL_SECONDS 0 = nonaktif, entry basi masih dilayani STALE_SECONDS sambil diperbarui
+    NEWS_CACHE_BACKEND: Literal["none", "database"] = "none"
+    NEWS_CACHE_SIZE: int = 10_000
+    NEWS_CACHE_TTL_SECONDS: float = 30
+    NEWS_CACHE_STALE_SECONDS: float = 300
+
+    # RSS/Atom feed, link memakai FEED_BASE_URL (url publik API), bukan header Host
+    FEED_BASE_URL: str = "http://localhost:8000/"
+    FEED_SIZE: int = 50
+    FEED_CACHE_TTL_SECONDS: int = 60
+
     CLOUDINARY_CLOUD_NAME: str | None = None
     CLOUDINARY_API_KEY: str | None = None
     CLOUDINARY_API_SECRET: str | None = None
 
+    @property
+    def create_tables(self) -> bool:
+        if self.DB_CREATE_TABLES is None:
+            return self.DEBUG_MODE
+        return self.DB_CREATE_TABLES
+
     @computed_field
     @property
     def db_url(self) -> PostgresDsn:
@@ -57,9 +196,11 @@ class Settings(BaseSettings):
             path=self.DB_DATABASE,
         )  # type: ignore
 
-    @computed_field
     @property
-    def mail_config(self) -> ConnectionConfig:
+    def mail_config(self) -> "ConnectionConfig":
+        # fastapi_mail is slow to import, load it only when an email is sent
+        from fastapi_mail import ConnectionConfig
+
         return ConnectionConfig(
             MAIL_USERNAME=self.MAIL_USERNAME,
             MAIL_PASSWORD=self.MAIL_PASSWORD,
@@ -4,10 +4,21 @@ from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.db.meta import meta
+from app.db.replica import ReadYourWrites, ReplicaRouter
 
 engine = create_async_engine(str(settings.db_url), future=True, poolclass=NullPool)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+replica_router = ReplicaRouter(
+    async_session_maker,
+    [
+        create_async_engine(url, future=True, poolclass=NullPool)
+        for url in settings.DB_REPLICA_URLS
+    ],
+    health_check_timeout=settings.DB_REPLICA_HEALTH_CHECK_TIMEOUT,
+)
+read_your_writes = ReadYourWrites(settings.DB_READ_YOUR_WRITES_SECONDS)
+
 
 class Base(DeclarativeBase):
     """Base for all models."""
@@ -0,0 +1,39 @@
+"""create news counters table
+
+Revision ID: a3c5e1f0b7d2
+Revises: 5d79f86ba86c
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import fastapi_utils.guid_type
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e1f0b7d2'
+down_revision: Union[str, None] = '5d79f86ba86c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_counters',
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('ref_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'ref_id', name=op.f('pk_news_counters'))
+    )
+    op.execute(
+        "INSERT INTO news_counters (scope, ref_id, count) "
+        "SELECT 'category', category_id, count(*) FROM news GROUP BY category_id"
+    )
+    op.execute(
+        "INSERT INTO news_counters (scope, ref_id, count) "
+        "SELECT 'author', user_id, count(*) FROM news GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('news_counters')
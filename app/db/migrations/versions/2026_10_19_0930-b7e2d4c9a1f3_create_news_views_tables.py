@@ -0,0 +1,41 @@
+"""create news views tables
+
+Revision ID: b7e2d4c9a1f3
+Revises: a3c5e1f0b7d2
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import fastapi_utils.guid_type
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4c9a1f3'
+down_revision: Union[str, None] = 'a3c5e1f0b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_views',
+    sa.Column('news_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('view_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('news_id', name=op.f('pk_news_views'))
+    )
+    op.create_index(op.f('ix_news_views_view_count'), 'news_views', ['view_count'], unique=False)
+    op.create_table('news_view_buckets',
+    sa.Column('news_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('news_id', 'bucket', name=op.f('pk_news_view_buckets'))
+    )
+    op.create_index(op.f('ix_news_view_buckets_bucket'), 'news_view_buckets', ['bucket'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_news_view_buckets_bucket'), table_name='news_view_buckets')
+    op.drop_table('news_view_buckets')
+    op.drop_index(op.f('ix_news_views_view_count'), table_name='news_views')
+    op.drop_table('news_views')
@@ -0,0 +1,34 @@
+"""create news related table
+
+Revision ID: f7c3d9a2b6e4
+Revises: e5b8c2f7a3d1
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import fastapi_utils.guid_type
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3d9a2b6e4'
+down_revision: Union[str, None] = 'e5b8c2f7a3d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_related',
+    sa.Column('news_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('rank', sa.SmallInteger(), nullable=False),
+    sa.Column('related_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('news_id', 'rank', name=op.f('pk_news_related'))
+    )
+    op.create_index(op.f('ix_news_related_related_id'), 'news_related', ['related_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_news_related_related_id'), table_name='news_related')
+    op.drop_table('news_related')
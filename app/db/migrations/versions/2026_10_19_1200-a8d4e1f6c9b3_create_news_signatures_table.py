@@ -0,0 +1,37 @@
+"""create news signatures table
+
+Revision ID: a8d4e1f6c9b3
+Revises: f7c3d9a2b6e4
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import fastapi_utils.guid_type
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e1f6c9b3'
+down_revision: Union[str, None] = 'f7c3d9a2b6e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_signatures',
+    sa.Column('news_id', fastapi_utils.guid_type.GUID(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('duplicate_of', fastapi_utils.guid_type.GUID(), nullable=True),
+    sa.Column('similarity', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('news_id', name=op.f('pk_news_signatures'))
+    )
+    op.create_index(op.f('ix_news_signatures_created_at'), 'news_signatures', ['created_at'], unique=False)
+    op.create_index(op.f('ix_news_signatures_duplicate_of'), 'news_signatures', ['duplicate_of'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_news_signatures_duplicate_of'), table_name='news_signatures')
+    op.drop_index(op.f('ix_news_signatures_created_at'), table_name='news_signatures')
+    op.drop_table('news_signatures')
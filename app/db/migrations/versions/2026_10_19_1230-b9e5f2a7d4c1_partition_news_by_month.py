@@ -0,0 +1,86 @@
+"""partition news by month
+
+Revision ID: b9e5f2a7d4c1
+Revises: a8d4e1f6c9b3
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+import datetime
+from typing import Sequence, Union
+
+import fastapi_utils.guid_type
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e5f2a7d4c1'
+down_revision: Union[str, None] = 'a8d4e1f6c9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = 'id, user_id, title, content, published_at, image_url, category_id, create_at, update_at'
+# partitions created ahead of the current month, later ones by the scheduler
+PREMAKE_MONTHS = 3
+
+
+def _add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _news_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', fastapi_utils.guid_type.GUID(), nullable=False),
+        sa.Column('user_id', fastapi_utils.guid_type.GUID(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('category_id', fastapi_utils.guid_type.GUID(), nullable=False),
+        sa.Column('create_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('update_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name=op.f('fk_news_category_id_categories')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_news_user_id_users')),
+    ]
+
+
+def upgrade() -> None:
+    op.execute('UPDATE news SET published_at = create_at WHERE published_at IS NULL')
+    op.rename_table('news', 'news_unpartitioned')
+    op.execute('ALTER TABLE news_unpartitioned RENAME CONSTRAINT pk_news TO pk_news_unpartitioned')
+
+    op.create_table('news',
+    *_news_columns(),
+    sa.PrimaryKeyConstraint('id', 'published_at', name=op.f('pk_news')),
+    postgresql_partition_by='RANGE (published_at)'
+    )
+    op.create_index(op.f('ix_news_published_at'), 'news', ['published_at'], unique=False)
+    op.execute('CREATE TABLE news_default PARTITION OF news DEFAULT')
+
+    first = op.get_bind().scalar(sa.text('SELECT min(published_at) FROM news_unpartitioned'))
+    today = datetime.date.today()
+    month = datetime.date((first or today).year, (first or today).month, 1)
+    last = _add_months(datetime.date(today.year, today.month, 1), PREMAKE_MONTHS)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE news_{month:%Y_%m} PARTITION OF news "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute(f'INSERT INTO news ({COLUMNS}) SELECT {COLUMNS} FROM news_unpartitioned')
+    op.drop_table('news_unpartitioned')
+
+
+def downgrade() -> None:
+    op.create_table('news_unpartitioned',
+    *_news_columns(),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_news_unpartitioned'))
+    )
+    op.execute(f'INSERT INTO news_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM news')
+    # the partitions are dropped with their parent, the archived ones are kept
+    op.drop_table('news')
+    op.rename_table('news_unpartitioned', 'news')
+    op.execute('ALTER TABLE news RENAME CONSTRAINT pk_news_unpartitioned TO pk_news')
+    op.alter_column('news', 'published_at', existing_type=sa.DateTime(), nullable=True)
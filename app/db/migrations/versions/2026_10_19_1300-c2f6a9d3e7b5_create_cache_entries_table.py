@@ -0,0 +1,33 @@
+"""create cache entries table
+
+Revision ID: c2f6a9d3e7b5
+Revises: b9e5f2a7d4c1
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f6a9d3e7b5'
+down_revision: Union[str, None] = 'b9e5f2a7d4c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cache_entries',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.LargeBinary(), nullable=False),
+    sa.Column('fresh_until', sa.Float(), nullable=False),
+    sa.Column('expires_at', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('key', name=op.f('pk_cache_entries'))
+    )
+    op.create_index(op.f('ix_cache_entries_expires_at'), 'cache_entries', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cache_entries_expires_at'), table_name='cache_entries')
+    op.drop_table('cache_entries')
@@ -0,0 +1,24 @@
+"""add news update_at index
+
+Revision ID: d3a7b1e8f6c2
+Revises: c2f6a9d3e7b5
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7b1e8f6c2'
+down_revision: Union[str, None] = 'c2f6a9d3e7b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_news_update_at'), 'news', ['update_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_news_update_at'), table_name='news')
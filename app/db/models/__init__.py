@@ -1,15 +1,24 @@
 """backend models."""
 
-import pkgutil
-from pathlib import Path
+import importlib
+
+# every module defining a table, keep it in sync when adding a model
+MODEL_MODULES = (
+    "cache_entry",
+    "category",
+    "job",
+    "news",
+    "news_counter",
+    "news_related",
+    "news_signature",
+    "news_view",
+    "rate_limit",
+    "revoked_token",
+    "user",
+)
 
 
 def load_all_models() -> None:
-    """Load all models from this folder."""
-    package_dir = Path(__file__).resolve().parent
-    modules = pkgutil.walk_packages(
-        path=[str(package_dir)],
-        prefix="app.db.models.",
-    )
-    for module in modules:
-        __import__(module.name)
+    """Register all models on the metadata."""
+    for name in MODEL_MODULES:
+        importlib.import_module(f"{__name__}.{name}")
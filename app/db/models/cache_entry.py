@@ -0,0 +1,16 @@
+from sqlalchemy import Float, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CacheEntry(Base):
+    """Entry of the cache shared by the workers, see ``DatabaseCacheBackend``."""
+
+    __tablename__ = "cache_entries"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # unix times, the entry is refreshed after fresh_until and dropped after expires_at
+    fresh_until: Mapped[float] = mapped_column(Float, nullable=False)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
@@ -16,7 +16,7 @@ class TimeStampMixin:
             return mapped_column(
                 DateTime(True),
                 nullable=False,
-                default=datetime.datetime.now(datetime.UTC),
+                default=lambda: datetime.datetime.now(datetime.UTC),
                 server_default=func.now(),
             )
 
@@ -25,6 +25,6 @@ class TimeStampMixin:
             return mapped_column(
                 DateTime(True),
                 nullable=False,
-                default=datetime.datetime.now(datetime.UTC),
+                default=lambda: datetime.datetime.now(datetime.UTC),
                 onupdate=func.now(),
             )
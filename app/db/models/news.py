@@ -1,8 +1,9 @@
 import datetime
+from typing import ClassVar
 from uuid import UUID, uuid4
 
 from fastapi_utils.guid_type import GUID
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,13 +11,33 @@ from app.db.models.mixin import TimeStampMixin
 
 
 class News(TimeStampMixin, Base):
+    """A news, stored in monthly partitions of ``published_at`` on postgres.
+
+    The partition key has to be part of the primary key of the table, the
+    ORM still identifies a news by its ``id`` alone. A lookup by ``id`` alone,
+    like ``GET /news{news_id}``, cannot be pruned and probes the primary key
+    index of every partition. The partitions are managed by
+    ``app.db.partitions``.
+    """
+
     __tablename__ = "news"
+    __table_args__ = (
+        # export ``since`` and the sync of the related news read the changed news
+        Index(None, "update_at"),
+        {"postgresql_partition_by": "RANGE (published_at)"},
+    )
 
-    id: Mapped[UUID] = mapped_column(GUID, primary_key=True, default=uuid4)
+    # matches the rows of a multi-row INSERT ... RETURNING to their parameters,
+    # published_at may come back from the driver with another timezone
+    id: Mapped[UUID] = mapped_column(
+        GUID, primary_key=True, default=uuid4, insert_sentinel=True
+    )
     user_id: Mapped[UUID] = mapped_column(GUID, ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str] = mapped_column(String, nullable=False)
-    published_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=True)
+    published_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, primary_key=True, index=True
+    )
     image_url: Mapped[str] = mapped_column(String, nullable=True)
     category_id: Mapped[UUID] = mapped_column(
         GUID, ForeignKey("categories.id"), nullable=False
@@ -24,3 +45,15 @@ class News(TimeStampMixin, Base):
 
     category = relationship("Category", back_populates="news")
     user = relationship("User", back_populates="news")
+
+    __mapper_args__: ClassVar[dict] = {"primary_key": [id]}
+
+
+# rows outside of every monthly partition land here instead of failing
+event.listen(
+    News.__table__,
+    "after_create",
+    DDL("CREATE TABLE news_default PARTITION OF news DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
@@ -0,0 +1,20 @@
+from uuid import UUID
+
+from fastapi_utils.guid_type import GUID
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NewsCounter(Base):
+    """Number of news per category or per author, kept in sync on every news write."""
+
+    __tablename__ = "news_counters"
+
+    CATEGORY = "category"
+    AUTHOR = "author"
+
+    scope: Mapped[str] = mapped_column(String(20), primary_key=True)
+    ref_id: Mapped[UUID] = mapped_column(GUID, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
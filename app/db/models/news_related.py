@@ -0,0 +1,18 @@
+from uuid import UUID
+
+from fastapi_utils.guid_type import GUID
+from sqlalchemy import Float, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NewsRelated(Base):
+    """The ``rank``-th most similar news of a news, precomputed from TF-IDF vectors."""
+
+    __tablename__ = "news_related"
+
+    news_id: Mapped[UUID] = mapped_column(GUID, primary_key=True)
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    related_id: Mapped[UUID] = mapped_column(GUID, nullable=False, index=True)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,26 @@
+import datetime
+from uuid import UUID
+
+from fastapi_utils.guid_type import GUID
+from sqlalchemy import DateTime, Float, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NewsSignature(Base):
+    """MinHash signature of the content of a news, used to find near-duplicates.
+
+    ``duplicate_of`` is the most similar earlier news, with their estimated
+    similarity, when the news was flagged as a near-duplicate.
+    """
+
+    __tablename__ = "news_signatures"
+
+    news_id: Mapped[UUID] = mapped_column(GUID, primary_key=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    duplicate_of: Mapped[UUID] = mapped_column(GUID, nullable=True, index=True)
+    similarity: Mapped[float] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(True), nullable=False, index=True
+    )
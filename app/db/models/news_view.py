@@ -0,0 +1,27 @@
+import datetime
+from uuid import UUID
+
+from fastapi_utils.guid_type import GUID
+from sqlalchemy import BigInteger, DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class NewsView(Base):
+    """Total number of views of a news."""
+
+    __tablename__ = "news_views"
+
+    news_id: Mapped[UUID] = mapped_column(GUID, primary_key=True)
+    view_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, index=True)
+
+
+class NewsViewBucket(Base):
+    """Number of views of a news per hour, used to compute the trending ranking."""
+
+    __tablename__ = "news_view_buckets"
+
+    news_id: Mapped[UUID] = mapped_column(GUID, primary_key=True)
+    bucket: Mapped[datetime.datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,16 @@
+from sqlalchemy import Boolean, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by the workers, see ``DatabaseRateLimitBackend``."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    # unix time of the last update, plain seconds keep the refill arithmetic portable
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
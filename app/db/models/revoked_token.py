@@ -0,0 +1,24 @@
+import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RevokedToken(Base):
+    """A revoked token.
+
+    ``jti`` is the id of a single token, or ``user:<id>`` to revoke every
+    token issued to the user before ``revoked_at``.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(True), nullable=False, index=True
+    )
+    revoked_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(True), nullable=False, index=True
+    )
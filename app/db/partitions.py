@@ -0,0 +1,146 @@
+import datetime
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+PARENT = "news"
+DEFAULT_PARTITION = "news_default"
+ARCHIVE_PREFIX = "archive_"
+
+BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def months_ago(months: int, today: datetime.date | None = None) -> datetime.date:
+    """First day of the month ``months`` months before the current one."""
+    today = today or datetime.datetime.now(datetime.UTC).date()
+    return add_months(month_start(today), -months)
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime.date | None
+    end: datetime.date | None
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+
+async def list_partitions(connection: AsyncConnection) -> list[Partition]:
+    """The partitions attached to ``news``, the monthly ones ordered by month."""
+    rows = await connection.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    )
+    partitions = []
+    for name, bound in rows.tuples():
+        match = BOUND_RE.search(bound)
+        if match is None:
+            partitions.append(Partition(name, None, None))
+            continue
+        start, end = (datetime.date.fromisoformat(value[:10]) for value in match.groups())
+        partitions.append(Partition(name, start, end))
+    return sorted(partitions, key=lambda partition: partition.start or datetime.date.min)
+
+
+async def create_partition(connection: AsyncConnection, month: datetime.date) -> str:
+    """Create the partition of a month.
+
+    Rows of the month already in the default partition are moved to the new
+    one: the default partition is detached, the rows are copied through the
+    parent, and it is attached again, all in the transaction of the caller.
+    """
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    bounds = {"start": datetime.datetime(start.year, start.month, 1)}
+    bounds["end"] = datetime.datetime(end.year, end.month, 1)
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    in_range = "published_at >= :start AND published_at < :end"
+
+    has_default = any(p.is_default for p in await list_partitions(connection))
+    stray = has_default and await connection.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+    )
+    if not stray:
+        await connection.execute(create)
+        return name
+
+    detach = f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}"
+    await connection.execute(text(detach))
+    await connection.execute(create)
+    copy = f"INSERT INTO {PARENT} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"
+    await connection.execute(text(copy), bounds)
+    await connection.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+    await connection.execute(
+        text(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+    return name
+
+
+async def ensure_partitions(
+    connection: AsyncConnection, months_ahead: int, today: datetime.date | None = None
+) -> list[str]:
+    """Create the partitions of the current month and the ``months_ahead`` next ones.
+
+    Returns:
+        list[str]: names of the partitions created
+    """
+    existing = {p.start for p in await list_partitions(connection) if not p.is_default}
+    current = month_start(today or datetime.datetime.now(datetime.UTC).date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            created.append(await create_partition(connection, month))
+    return created
+
+
+async def archive_partitions(
+    connection: AsyncConnection, before: datetime.date, drop: bool = False
+) -> list[str]:
+    """Detach the monthly partitions ending on or before ``before``.
+
+    A detached partition is kept as a plain ``archive_news_YYYY_MM`` table,
+    out of every query on ``news``, to be dumped and dropped later. With
+    ``drop`` it is dropped right away.
+
+    Returns:
+        list[str]: names of the partitions detached
+    """
+    archived = []
+    for partition in await list_partitions(connection):
+        if partition.is_default or partition.end > before:
+            continue
+        name = partition.name
+        await connection.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            await connection.execute(text(f"DROP TABLE {name}"))
+        else:
+            await connection.execute(
+                text(f"ALTER TABLE {name} RENAME TO {ARCHIVE_PREFIX}{name}")
+            )
+        archived.append(name)
+    return archived
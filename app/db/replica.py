@@ -0,0 +1,119 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from itertools import count
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+@dataclass
+class ReplicaNode:
+    """A single read replica and its last known health state."""
+
+    engine: AsyncEngine
+    session_maker: async_sessionmaker[AsyncSession]
+    healthy: bool = True
+    checked_at: float = field(default=0.0)
+
+
+class ReplicaRouter:
+    """Round-robin router over read replicas with fallback to the primary.
+
+    The replicas are health checked with ``SELECT 1`` by ``check_all``, run
+    at startup and then periodically by the scheduler, never on the request
+    path. Unhealthy replicas are skipped until the next check succeeds, and
+    when no replica is usable the primary is used.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[AsyncEngine] | None = None,
+        health_check_timeout: float = 2.0,
+    ):
+        self.primary = primary
+        self.nodes = [
+            ReplicaNode(engine, async_sessionmaker(engine, expire_on_commit=False))
+            for engine in replicas or []
+        ]
+        self.health_check_timeout = health_check_timeout
+        self._counter = count()
+
+    async def _check(self, node: ReplicaNode) -> bool:
+        try:
+            async with asyncio.timeout(self.health_check_timeout):
+                async with node.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception:
+            node.healthy = False
+        else:
+            node.healthy = True
+        node.checked_at = time.monotonic()
+        return node.healthy
+
+    async def get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """Get the session maker of the next healthy replica.
+
+        Returns:
+            async_sessionmaker[AsyncSession]: replica session maker, or the
+                primary one when no replica is available
+        """
+        total = len(self.nodes)
+        for _ in range(total):
+            node = self.nodes[next(self._counter) % total]
+            if node.healthy:
+                return node.session_maker
+        return self.primary
+
+    async def check_all(self) -> int:
+        """Health check every replica now, returns the number of healthy ones."""
+        results = await asyncio.gather(*(self._check(node) for node in self.nodes))
+        return sum(results)
+
+    async def dispose(self) -> None:
+        for node in self.nodes:
+            await node.engine.dispose()
+
+
+class ReadYourWrites:
+    """Keep the reads of a client on the primary for a while after its writes.
+
+    The time of the last write travels with the client: it is set in a cookie
+    and in the ``X-Last-Write`` header of the write response, and read back
+    from either, so the reads see it on any worker of any process.
+    """
+
+    cookie = "last_write"
+    header = "X-Last-Write"
+
+    def __init__(self, window_seconds: float = 5):
+        self.window_seconds = window_seconds
+
+    def mark(self, response: Response) -> None:
+        """Pin the client to the primary for the next ``window_seconds``."""
+        if self.window_seconds <= 0:
+            return
+        value = f"{time.time():.3f}"
+        response.headers[self.header] = value
+        response.set_cookie(
+            self.cookie,
+            value,
+            max_age=math.ceil(self.window_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+
+    def is_sticky(self, request: Request | None) -> bool:
+        if request is None or self.window_seconds <= 0:
+            return False
+        value = request.headers.get(self.header) or request.cookies.get(self.cookie)
+        try:
+            written_at = float(value)
+        except (TypeError, ValueError):
+            return False
+        # a write stamped in the future comes from a clock ahead of ours
+        return abs(time.time() - written_at) < self.window_seconds
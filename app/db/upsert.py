@@ -0,0 +1,20 @@
+from typing import Any
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_for(session: AsyncSession, table: Table | Any):
+    """Get a dialect specific ``INSERT`` supporting ``ON CONFLICT`` for the session bind.
+
+    Args:
+        session (AsyncSession): session the statement will be executed with
+        table (Table | Any): table or mapped class to insert into
+
+    Returns:
+        Insert: postgresql or sqlite insert construct
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
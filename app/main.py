@@ -5,21 +5,64 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from app import (
+    tasks,  # noqa: F401, register the jobs and periodic tasks
+    warmup_steps,  # noqa: F401, register the warm-up steps
+)
 from app.api.routes import api
 from app.core.config import settings
 from app.db import create_db_and_tables
+from app.db.base import replica_router
 from app.db.models import load_all_models
 from app.middleware import middleware
 from app.utils import error_handler
 from app.utils.exceptions import AppException
+from app.utils.jobs import Worker, job_queue
+from app.utils.pubsub import news_hub
+from app.utils.revocation import revocation_list
+from app.utils.scheduler import scheduler
+from app.utils.suggest import suggest_index
+from app.utils.views import view_tracker
+from app.utils.warmup import warmup
+from app.utils.watchdog import loop_watchdog
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
-    await create_db_and_tables()
     load_all_models()
+    if settings.create_tables:
+        await create_db_and_tables()
+    await news_hub.start()
+    await revocation_list.start()
+    await suggest_index.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    worker = None
+    if settings.JOB_RUNNER == "app":
+        worker = Worker(
+            job_queue, settings.JOB_WORKER_CONCURRENCY, settings.JOB_POLL_INTERVAL_SECONDS
+        )
+        worker.start()
+    elif settings.JOB_RUNNER == "inline":
+        await job_queue.warn_pending()
+    if settings.STARTUP_PRELOAD:
+        await warmup.start(app, settings.STARTUP_WARMUP_TIMEOUT_SECONDS)
+    else:
+        warmup.skip()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
     yield
+    await loop_watchdog.stop()
+    await warmup.stop()
+    if worker is not None:
+        await worker.shutdown()
+    await job_queue.drain()
+    await scheduler.stop()
+    await news_hub.stop()
+    # keep the views counted since the last flush
+    await view_tracker.flush()
+    await replica_router.dispose()
 
 
 def get_app() -> FastAPI:
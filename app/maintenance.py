@@ -0,0 +1,99 @@
+# HOW TO RUN, IN ROOT FOLDER RUN TERMINAL
+# python3 -m app.maintenance <command>
+# or
+# py -m app.maintenance <command>
+#
+# example:
+# python3 -m app.maintenance rebuild_counters
+
+from rich.console import Console
+
+from app.core.config import settings
+from app.db import partitions
+from app.db.base import async_session_maker, engine
+from app.db.models import load_all_models
+from app.utils.dedupe import duplicate_detector
+from app.utils.jobs import job_queue
+from app.utils.news_counter import NewsCounterService
+from app.utils.related import related_news
+from app.utils.revocation import revocation_list
+
+console = Console()
+
+
+async def rebuild_counters():
+    """Recompute the per-category and per-author news counters."""
+    load_all_models()
+    console.print("[blue]Rebuilding news counters...[/]")
+    async with async_session_maker() as session, session.begin():
+        await NewsCounterService(session).rebuild()
+    console.print("[green]News counters rebuilt.[/]")
+
+
+async def rebuild_related_news():
+    """Recompute the related news of every news."""
+    load_all_models()
+    console.print("[blue]Rebuilding related news...[/]")
+    count = await related_news.rebuild()
+    console.print(f"[green]Related news of {count} news rebuilt.[/]")
+
+
+async def backfill_news_signatures(batch_size: int = 500):
+    """Sign the news submitted before the duplicate detection, flagging the duplicates."""
+    load_all_models()
+    console.print("[blue]Signing news...[/]")
+    signed, duplicates = await duplicate_detector.backfill(batch_size)
+    console.print(f"[green]{signed} news signed, {duplicates} near-duplicates flagged.[/]")
+
+
+async def create_news_partitions(months: int = settings.NEWS_PARTITION_PREMAKE_MONTHS):
+    """Create the news partitions of the current month and the ``months`` next ones."""
+    async with engine.begin() as connection:
+        created = await partitions.ensure_partitions(connection, months)
+    console.print(f"[green]{len(created)} news partitions created: {', '.join(created)}[/]")
+
+
+async def archive_news_partitions(older_than_months: int, drop: bool = False):
+    """Detach the news partitions older than ``older_than_months`` months.
+
+    The partitions are kept as ``archive_news_YYYY_MM`` tables, or dropped with
+    ``--drop``, and the news counters are rebuilt without their news.
+    """
+    load_all_models()
+    before = partitions.months_ago(older_than_months)
+    async with engine.begin() as connection:
+        archived = await partitions.archive_partitions(connection, before, drop=drop)
+    if archived:
+        async with async_session_maker() as session, session.begin():
+            await NewsCounterService(session).rebuild()
+    console.print(f"[green]{len(archived)} news partitions archived: {', '.join(archived)}[/]")
+
+
+async def prune_revoked_tokens():
+    """Delete the revoked tokens that already expired."""
+    load_all_models()
+    await revocation_list.prune()
+    console.print("[green]Expired revoked tokens deleted.[/]")
+
+
+async def requeue_dead_jobs(name: str | None = None):
+    """Queue the dead jobs again, optionally only the jobs named ``name``."""
+    load_all_models()
+    count = await job_queue.requeue_dead(name)
+    console.print(f"[green]{count} dead jobs queued again.[/]")
+
+
+if __name__ == "__main__":
+    import fire
+
+    fire.Fire(
+        {
+            "rebuild_counters": rebuild_counters,
+            "rebuild_related_news": rebuild_related_news,
+            "backfill_news_signatures": backfill_news_signatures,
+            "create_news_partitions": create_news_partitions,
+            "archive_news_partitions": archive_news_partitions,
+            "prune_revoked_tokens": prune_revoked_tokens,
+            "requeue_dead_jobs": requeue_dead_jobs,
+        }
+    )
@@ -14,3 +14,7 @@ class CategoryCreate(BaseSchema):
 
 class CategoryUpdate(BaseSchema):
     name: str | None = None
+
+
+class CategoryCountRead(CategoryRead):
+    news_count: int
@@ -1,8 +1,10 @@
 import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import Field
 
+from app.core.config import get_settings
 from app.schemas.base import BaseSchema
 from app.schemas.category import CategoryRead
 from app.schemas.mixin import TimeStampMixinSchema
@@ -32,6 +34,40 @@ class UserNewsUpdate(BaseSchema):
     image_url: str | None = None
 
 
+class UserNewsBatchUpdateItem(UserNewsUpdate):
+    id: UUID
+
+
+class UserNewsBatchCreate(BaseSchema):
+    items: list[UserNewsRequestCreate] = Field(
+        min_length=1, max_length=get_settings().NEWS_BATCH_MAX_ITEMS
+    )
+
+
+class UserNewsBatchUpdate(BaseSchema):
+    items: list[UserNewsBatchUpdateItem] = Field(
+        min_length=1, max_length=get_settings().NEWS_BATCH_MAX_ITEMS
+    )
+
+
+class BatchItemError(BaseSchema):
+    error_code: str
+    messages: list[str]
+
+
+class UserNewsBatchItemResult(BaseSchema):
+    index: int
+    status: Literal["created", "updated", "failed"]
+    news: UserNewsRead | None = None
+    error: BatchItemError | None = None
+
+
+class UserNewsBatchResult(BaseSchema):
+    succeeded: int
+    failed: int
+    items: list[UserNewsBatchItemResult]
+
+
 class UserNewsCreate(BaseSchema):
     title: str
     content: str
@@ -49,3 +85,24 @@ class NewsPublicRead(TimeStampMixinSchema, BaseSchema):
     published_at: datetime.datetime
     category: CategoryRead
     user: UserPublicRead
+
+
+class NewsSuggestionRead(BaseSchema):
+    id: UUID
+    title: str
+    author: str
+    published_at: datetime.datetime
+
+
+class NewsSuggestRead(BaseSchema):
+    news: list[NewsSuggestionRead]
+    authors: list[str]
+
+
+class NewsCountRead(BaseSchema):
+    count: int
+
+
+class NewsBatchRead(BaseSchema):
+    items: list[NewsPublicRead]
+    missing: list[str]
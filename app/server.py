@@ -0,0 +1,170 @@
+"""Production server: uvicorn workers pre-forked on a shared socket.
+
+Run with ``python -m app.server``. The master process binds the socket,
+imports and warms up the application once, then forks ``SERVER_WORKERS``
+workers which all accept on the inherited socket and share the warmed up
+memory copy-on-write. Workers that die are restarted. On SIGTERM or SIGINT
+the master asks every worker to stop accepting and drain its open requests,
+and kills the ones still running after ``SERVER_GRACEFUL_TIMEOUT_SECONDS``.
+"""
+
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# a worker dying sooner than this after its start is restarted with a delay
+RESTART_DELAY_SECONDS = 1
+
+
+def fastest(module: str, default: str) -> str:
+    """Use the faster C implementation of the loop or parser when it is installed."""
+    return module if importlib.util.find_spec(module) is not None else default
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def get_config(**kwargs) -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        loop=fastest("uvloop", default="asyncio"),
+        http=fastest("httptools", default="h11"),
+        lifespan="on",
+        backlog=settings.SERVER_BACKLOG,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        access_log=settings.SERVER_ACCESS_LOG,
+        **kwargs,
+    )
+
+
+def warmup(config: uvicorn.Config) -> None:
+    """Import and prepare the application before forking the workers."""
+    config.load()
+
+    from app.db.models import load_all_models
+    from app.templates.renderer import email_renderer
+
+    load_all_models()
+    email_renderer.load()
+
+
+class Supervisor:
+    """Fork the workers and keep them running until asked to stop."""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.sockets: list[socket.socket] = []
+        self.pids: dict[int, float] = {}
+        self.should_exit = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.pids[pid] = time.monotonic()
+
+    def _run_worker(self) -> None:
+        # a Ctrl+C on the terminal reaches the master only, which drains the workers
+        os.setpgid(0, 0)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+        code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=self.sockets)
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def handle_exit(self, sig: int, frame) -> None:
+        self.should_exit = True
+
+    def reap(self) -> None:
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.pids.clear()
+                return
+            if pid == 0:
+                return
+            started_at = self.pids.pop(pid, None)
+            if started_at is None or self.should_exit:
+                continue
+            logger.warning("Worker %s exited with status %s, restarting", pid, status)
+            if time.monotonic() - started_at < RESTART_DELAY_SECONDS:
+                time.sleep(RESTART_DELAY_SECONDS)
+            self.spawn()
+
+    def stop(self) -> None:
+        for pid in self.pids:
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 0) + 5
+        while self.pids and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.pids:
+            logger.warning("Worker %s did not drain in time, killing it", pid)
+            os.kill(pid, signal.SIGKILL)
+        for pid in list(self.pids):
+            os.waitpid(pid, 0)
+        self.pids.clear()
+
+    def run(self) -> None:
+        self.sockets = [self.config.bind_socket()]
+        warmup(self.config)
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+
+        logger.info(
+            "Starting %s workers (loop=%s, http=%s)",
+            self.workers,
+            self.config.loop,
+            self.config.http,
+        )
+        for _ in range(self.workers):
+            self.spawn()
+        while not self.should_exit:
+            self.reap()
+            time.sleep(0.2)
+
+        logger.info("Shutting down, draining %s workers", len(self.pids))
+        self.stop()
+        for sock in self.sockets:
+            sock.close()
+
+
+def run() -> None:
+    if settings.DEBUG_MODE:
+        uvicorn.run("app.main:app", host=settings.HOST, port=settings.PORT, reload=True)
+        return
+
+    workers = worker_count()
+    config = get_config()
+    if workers > 1 and settings.RATE_LIMIT_BACKEND == "memory":
+        logger.warning("RATE_LIMIT_BACKEND=memory counts the requests per worker")
+    if workers == 1 or not hasattr(os, "fork"):
+        warmup(config)
+        uvicorn.Server(config).run()
+        return
+    Supervisor(config, workers).run()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,169 @@
+"""Background work.
+
+Jobs are queued with ``job_queue.enqueue`` and run as set by ``JOB_RUNNER``: in
+the web process after the response, by a worker of the web application, or by
+``python -m app.worker``.
+Periodic tasks run from the lifespan of the web application, the ones with
+``leader=True`` on a single worker of the cluster.
+"""
+
+import datetime
+from uuid import UUID
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db.base import async_session_maker, engine, replica_router
+from app.db.models.user import User
+from app.db.partitions import archive_partitions, ensure_partitions, months_ago
+from app.templates.renderer import email_renderer
+from app.utils.jobs import job_queue
+from app.utils.mail import EmailService
+from app.utils.news_cache import DatabaseCacheBackend, news_cache
+from app.utils.news_counter import NewsCounterService
+from app.utils.rate_limit import DatabaseRateLimitBackend, rate_limit_backend
+from app.utils.related import related_news
+from app.utils.revocation import revocation_list
+from app.utils.scheduler import scheduler
+from app.utils.suggest import suggest_index
+from app.utils.token import TokenManager
+from app.utils.views import view_tracker
+
+# a bucket unused for a day is full again for any limit up to "n/day"
+RATE_LIMIT_BUCKET_RETENTION_SECONDS = 86400
+
+
+@job_queue.task()
+async def send_email(subject: str, email_to: str, body: str):
+    await EmailService().send_email(subject, email_to, body)
+
+
+@job_queue.task()
+async def send_user_email(kind: str, user_id: str, base_url: str):
+    """Render and send an account email.
+
+    The job only holds the id of the user: the token is created, or read from
+    the user, when the email is sent, so it is never stored in ``jobs``.
+    """
+    async with async_session_maker() as session:
+        user = await session.get(User, UUID(user_id))
+    if user is None:
+        return
+
+    if kind == "verification":
+        if user.is_verified or not user.is_active:
+            return
+        token = TokenManager().create_verification_token(user)
+        # for debug only
+        print(f"Verification requested for user {user.id}. ", f"Verification token: {token}")
+        verification_url = f"{base_url}api/{settings.API_V1_STR}/auth/verify?token={token}"
+        subject = "Email Verification"
+        body = email_renderer.render(
+            "email/verification_email.html", user=user, verification_url=verification_url
+        )
+    elif kind == "reset_password":
+        expires_at = user.password_change_token_expires_at
+        if user.password_change_token is None or expires_at is None:
+            return
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+        if expires_at <= datetime.datetime.now(datetime.timezone.utc):
+            return
+        reset_password_url = (
+            f"{base_url}api/{settings.API_V1_STR}/auth/confirm-password-change"
+            f"?token={user.password_change_token}"
+        )
+        subject = "Email Reset Password"
+        body = email_renderer.render(
+            "email/reset_password.html", user=user, reset_password_url=reset_password_url
+        )
+    else:
+        raise ValueError(f"unknown email {kind}")
+
+    await EmailService().send_email(subject, user.email, body)
+
+
+@job_queue.task()
+async def update_related_news(news_ids: list[str]):
+    await related_news.update(UUID(news_id) for news_id in news_ids)
+
+
+@scheduler.periodic(settings.VIEW_FLUSH_INTERVAL_SECONDS, leader=False)
+async def flush_views():
+    await view_tracker.flush()
+
+
+@scheduler.periodic(settings.TRENDING_REFRESH_SECONDS, leader=False)
+async def refresh_trending():
+    await view_tracker.refresh()
+
+
+@scheduler.periodic(settings.REVOCATION_REFRESH_SECONDS, leader=False)
+async def refresh_revocation_list():
+    await revocation_list.refresh()
+
+
+@scheduler.periodic(settings.SUGGEST_RELOAD_SECONDS, leader=False)
+async def reload_suggest_index():
+    await suggest_index.reload()
+
+
+@scheduler.periodic(settings.DB_REPLICA_HEALTH_CHECK_SECONDS, leader=False)
+async def check_replicas():
+    await replica_router.check_all()
+
+
+@scheduler.periodic(settings.TRENDING_REFRESH_SECONDS)
+async def prune_view_buckets():
+    await view_tracker.prune()
+
+
+@scheduler.periodic(settings.NEWS_PARTITION_CHECK_SECONDS)
+async def maintain_news_partitions():
+    """Create the partitions of the coming months and detach the expired ones."""
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as connection:
+        await ensure_partitions(connection, settings.NEWS_PARTITION_PREMAKE_MONTHS)
+        if not settings.NEWS_PARTITION_RETENTION_MONTHS:
+            return
+        before = months_ago(settings.NEWS_PARTITION_RETENTION_MONTHS)
+        archived = await archive_partitions(connection, before)
+    if archived:
+        async with async_session_maker() as session, session.begin():
+            await NewsCounterService(session).rebuild()
+
+
+@scheduler.periodic(settings.CLEANUP_INTERVAL_SECONDS)
+async def prune_revoked_tokens():
+    await revocation_list.prune()
+
+
+@scheduler.periodic(settings.CLEANUP_INTERVAL_SECONDS)
+async def prune_rate_limit_buckets():
+    if isinstance(rate_limit_backend, DatabaseRateLimitBackend):
+        await rate_limit_backend.prune(RATE_LIMIT_BUCKET_RETENTION_SECONDS)
+
+
+@scheduler.periodic(settings.CLEANUP_INTERVAL_SECONDS)
+async def prune_cache_entries():
+    if isinstance(news_cache.backend, DatabaseCacheBackend):
+        await news_cache.backend.prune()
+
+
+@scheduler.periodic(settings.CLEANUP_INTERVAL_SECONDS)
+async def cleanup_password_changes():
+    """Forget the pending password changes whose token expired."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with async_session_maker() as session:
+        await session.execute(
+            update(User)
+            .where(User.password_change_token_expires_at < now)
+            .values(
+                pending_password_hash=None,
+                password_change_token=None,
+                password_change_token_expires_at=None,
+                update_at=User.update_at,
+            )
+        )
+        await session.commit()
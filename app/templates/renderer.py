@@ -0,0 +1,64 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup
+
+TEMPLATE_DIR = Path(__file__).parent
+
+
+class EmailRenderer:
+    """Render the email templates straight to strings.
+
+    The templates are compiled once by ``load``, at startup, and kept for the
+    life of the process (``auto_reload`` is off, so no file is stat'ed per
+    render). Static fragments shared by every email, such as the stylesheet,
+    are read once and injected as globals instead of being rendered again.
+    """
+
+    def __init__(self, directory: Path = TEMPLATE_DIR, prefix: str = "email/"):
+        self.prefix = prefix
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(),
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.templates: dict[str, Template] = {}
+
+    def load(self) -> None:
+        """Compile every email template and read the static fragments."""
+        loader = self.environment.loader
+        styles, _, _ = loader.get_source(self.environment, f"{self.prefix}_styles.css")
+        self.environment.globals["styles"] = Markup(styles)
+        for name in self.environment.list_templates(extensions=["html"]):
+            if name.startswith(self.prefix):
+                self.templates[name] = self.environment.get_template(name)
+
+    def get_template(self, name: str) -> Template:
+        template = self.templates.get(name)
+        if template is None:
+            if "styles" not in self.environment.globals:
+                self.load()
+            template = self.templates[name] = self.environment.get_template(name)
+        return template
+
+    def render(self, name: str, **context: Any) -> str:
+        """Render an email template.
+
+        Args:
+            name (str): path of the template, e.g. ``email/reset_password.html``
+            **context: variables of the template
+
+        Returns:
+            str: the rendered email
+        """
+        return self.get_template(name).render(**context)
+
+    async def render_async(self, name: str, **context: Any) -> str:
+        """Render an email template in a worker thread."""
+        return await asyncio.to_thread(self.render, name, **context)
+
+
+email_renderer = EmailRenderer()
@@ -1,19 +1,25 @@
 # libs/cloudinary.py
+from functools import cache
 from uuid import UUID
 
-import cloudinary
-import cloudinary.uploader
-
 from app.core.config import get_settings
 
-cloudinary.config(
-    cloud_name=get_settings().CLOUDINARY_CLOUD_NAME,
-    api_key=get_settings().CLOUDINARY_API_KEY,
-    api_secret=get_settings().CLOUDINARY_API_SECRET,
-)
+
+@cache
+def _uploader():
+    # imported and configured on first upload, cloudinary is slow to import
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=get_settings().CLOUDINARY_CLOUD_NAME,
+        api_key=get_settings().CLOUDINARY_API_KEY,
+        api_secret=get_settings().CLOUDINARY_API_SECRET,
+    )
+    return cloudinary.uploader
 
 
 async def upload_image_to_cloudinary(file, news_id: UUID):
-    return cloudinary.uploader.upload(
+    return _uploader().upload(
         file, folder="oranews", public_id=str(news_id), overwrite=True, resource_type="image"
     )
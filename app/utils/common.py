@@ -29,6 +29,12 @@ class ErrorCode(StrEnum):
     USER_NOT_HAVE_PERMISSION = auto()
 
     NOT_AUTHENTICATED = auto()
+    RATE_LIMIT_EXCEEDED = auto()
 
     NEWS_NOT_FOUND = auto()
+    INVALID_NEWS_FILTER = auto()
+    TOO_MANY_NEWS_IDS = auto()
+    CATEGORY_NOT_FOUND = auto()
+    DUPLICATE_BATCH_ITEM = auto()
+    DUPLICATE_NEWS = auto()
     FORMAT_IMAGE_NOT_ALLOWED = auto()
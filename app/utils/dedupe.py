@@ -0,0 +1,330 @@
+import bisect
+import datetime
+import re
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.news import News
+from app.db.models.news_signature import NewsSignature
+from app.utils.pubsub import NewsEvent, news_hub
+
+# words per shingle, wire copies differ by a few words here and there
+SHINGLE_SIZE = 3
+# second crc32 of a shingle, for 64-bit shingle hashes
+CRC_SEED = 0x9E3779B9
+VALUE_BITS = 24
+EMPTY = (1 << 32) - 1
+# rows signed slightly out of order are read again on the next sync
+SYNC_OVERLAP_SECONDS = 5
+# the signatures older than the window are dropped from memory once a day
+RELOAD_SECONDS = 86400
+
+WORD_RE = re.compile(r"\w+")
+
+
+def _hash(shingle: str) -> int:
+    data = shingle.encode()
+    return zlib.crc32(data) << 32 | zlib.crc32(data, CRC_SEED)
+
+
+def shingles(text: str) -> set[int]:
+    """64-bit hashes of every run of ``SHINGLE_SIZE`` consecutive words of the text."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {_hash(" ".join(words))}
+    return {
+        _hash(" ".join(words[i : i + SHINGLE_SIZE]))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+class MinHasher:
+    """MinHash signatures of ``num_perm`` values, with one permutation hashing.
+
+    Instead of ``num_perm`` hash functions, each shingle hash is computed once
+    and sent to one of ``num_perm`` bins, a bin keeps its smallest value. An
+    empty bin borrows the value of the next non-empty one, shifted by their
+    distance, so two texts share a value only if they share the bin content.
+    The share of equal values between two signatures estimates the Jaccard
+    similarity of the shingle sets of the texts, signing is a single pass
+    over the shingles. Signatures are packed as little-endian uint32,
+    ``4 * num_perm`` bytes.
+    """
+
+    def __init__(self, num_perm: int):
+        if num_perm > 1 << (32 - VALUE_BITS):
+            raise ValueError(f"at most {1 << (32 - VALUE_BITS)} values per signature")
+        self.num_perm = num_perm
+        self.format = struct.Struct(f"<{num_perm}I")
+
+    def signature(self, text: str) -> bytes:
+        size = self.num_perm
+        bins = [EMPTY] * size
+        mask = (1 << VALUE_BITS) - 1
+        for shingle in shingles(text):
+            index = shingle % size
+            bins[index] = min(bins[index], (shingle // size) & mask)
+
+        filled = [index for index in range(size) if bins[index] != EMPTY]
+        if filled and len(filled) < size:
+            signature = bins[:]
+            for index in range(size):
+                if bins[index] == EMPTY:
+                    position = bisect.bisect_left(filled, index) % len(filled)
+                    distance = (filled[position] - index) % size
+                    signature[index] = bins[filled[position]] | distance << VALUE_BITS
+            bins = signature
+        return self.format.pack(*bins)
+
+    def similarity(self, first: bytes, second: bytes) -> float:
+        equal = sum(
+            x == y
+            for x, y in zip(self.format.unpack(first), self.format.unpack(second), strict=True)
+        )
+        return equal / self.num_perm
+
+
+class LshIndex:
+    """Locality sensitive hashing of the signatures, banded.
+
+    A signature is cut in ``bands`` bands, two news sharing any band are
+    candidates, and only the candidates are compared. News with a Jaccard
+    similarity ``s`` become candidates with a probability of
+    ``1 - (1 - s ** rows) ** bands``, ``rows`` being the values per band.
+    """
+
+    def __init__(self, hasher: MinHasher, bands: int):
+        if hasher.num_perm % bands:
+            raise ValueError("the number of permutations must be a multiple of the bands")
+        self.hasher = hasher
+        self.bands = bands
+        self.band_size = 4 * hasher.num_perm // bands
+        self.signatures: dict[UUID, bytes] = {}
+        self.buckets: list[dict[bytes, list[UUID]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _bands(self, signature: bytes):
+        for band in range(self.bands):
+            yield band, signature[band * self.band_size : (band + 1) * self.band_size]
+
+    def add(self, news_id: UUID, signature: bytes) -> None:
+        self.remove(news_id)
+        self.signatures[news_id] = signature
+        for band, key in self._bands(signature):
+            self.buckets[band].setdefault(key, []).append(news_id)
+
+    def remove(self, news_id: UUID) -> None:
+        signature = self.signatures.pop(news_id, None)
+        if signature is None:
+            return
+        for band, key in self._bands(signature):
+            bucket = self.buckets[band][key]
+            bucket.remove(news_id)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def query(
+        self, signature: bytes, threshold: float, exclude: UUID | None = None
+    ) -> tuple[UUID, float] | None:
+        """The most similar indexed news, if its similarity reaches ``threshold``.
+
+        ``exclude`` is never returned, an edited news is not its own duplicate.
+        """
+        candidates = set()
+        for band, key in self._bands(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+        candidates.discard(exclude)
+        best = None
+        for news_id in candidates:
+            similarity = self.hasher.similarity(signature, self.signatures[news_id])
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (news_id, similarity)
+        return best
+
+
+@dataclass
+class Check:
+    """Result of the duplicate check of a submitted content."""
+
+    signature: bytes
+    duplicate_of: UUID | None = None
+    similarity: float | None = None
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class DuplicateDetector:
+    """Find the submitted news whose content is a near-duplicate of a recent news.
+
+    The signatures are stored in ``news_signatures`` and every worker keeps
+    the ones of the last ``window_days`` in an LSH index. Before a check the
+    index reads the rows signed since its last sync, so the news submitted or
+    edited through the other workers are seen too, and a deleted news leaves
+    the index with its news event.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        index: LshIndex,
+        threshold: float,
+        window_days: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.index = index
+        self.threshold = threshold
+        self.window_days = window_days
+        self.clock = clock
+        self.synced_at: datetime.datetime | None = None
+        self.reloaded_at = 0.0
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Read the signatures added since the last sync, or all recent ones when due."""
+        now = self.clock()
+        full = self.synced_at is None or now - self.reloaded_at >= RELOAD_SECONDS
+        since = _now() - datetime.timedelta(days=self.window_days)
+        if not full:
+            since = max(
+                since, self.synced_at - datetime.timedelta(seconds=SYNC_OVERLAP_SECONDS)
+            )
+        synced_at = _now()
+        rows = await session.execute(
+            select(NewsSignature.news_id, NewsSignature.signature).where(
+                NewsSignature.created_at >= since
+            )
+        )
+        if full:
+            self.index = LshIndex(self.index.hasher, self.index.bands)
+            self.reloaded_at = now
+        for news_id, signature in rows.tuples():
+            # an edited news is signed again
+            if self.index.signatures.get(news_id) != signature:
+                self.index.add(news_id, signature)
+        self.synced_at = synced_at
+
+    async def check(
+        self, session: AsyncSession, content: str, exclude: UUID | None = None
+    ) -> Check:
+        """Sign a content and look for the most similar recent news, but ``exclude``."""
+        await self.sync(session)
+        return self.match(content, exclude=exclude)
+
+    def batch(self) -> LshIndex:
+        """An empty index for the news accepted so far in a batch."""
+        return LshIndex(self.index.hasher, self.index.bands)
+
+    def match(
+        self, content: str, batch: LshIndex | None = None, exclude: UUID | None = None
+    ) -> Check:
+        """Sign a content and look for the most similar news, without syncing.
+
+        Used for the items of a batch after a single ``sync``, ``batch`` holds
+        the items accepted before, not committed yet.
+        """
+        signature = self.index.hasher.signature(content)
+        matches = [self.index.query(signature, self.threshold, exclude)]
+        if batch is not None:
+            matches.append(batch.query(signature, self.threshold, exclude))
+        matches = [match for match in matches if match is not None]
+        if not matches:
+            return Check(signature)
+        return Check(signature, *max(matches, key=lambda match: match[1]))
+
+    def record(self, session: AsyncSession, news_id: UUID, check: Check) -> None:
+        """Store the signature of a created news with its transaction.
+
+        The signature is indexed with ``add`` once the transaction is
+        committed, a rolled back news must not be reported as the original
+        of the next ones.
+        """
+        session.add(
+            NewsSignature(
+                news_id=news_id,
+                signature=check.signature,
+                duplicate_of=check.duplicate_of,
+                similarity=check.similarity,
+                created_at=_now(),
+            )
+        )
+
+    async def replace(self, session: AsyncSession, checks: dict[UUID, Check]) -> None:
+        """Store the signatures of edited news in place of their old ones.
+
+        Like ``record``, the new signatures are indexed with ``add`` once the
+        transaction is committed.
+        """
+        if not checks:
+            return
+        await session.execute(delete(NewsSignature).where(NewsSignature.news_id.in_(checks)))
+        for news_id, check in checks.items():
+            self.record(session, news_id, check)
+
+    def add(self, news_id: UUID, check: Check) -> None:
+        """Index the signature of a committed news."""
+        self.index.add(news_id, check.signature)
+
+    async def forget(self, session: AsyncSession, news_id: UUID) -> None:
+        await session.execute(delete(NewsSignature).where(NewsSignature.news_id == news_id))
+        self.index.remove(news_id)
+
+    def on_event(self, event: NewsEvent) -> None:
+        if event.type == "deleted":
+            self.index.remove(UUID(event.news_id))
+
+    async def backfill(self, batch_size: int = 500) -> tuple[int, int]:
+        """Sign the news without a signature, oldest first.
+
+        Returns:
+            tuple[int, int]: the number of news signed, and of near-duplicates found
+        """
+        signed = duplicates = 0
+        async with self.session_maker() as session:
+            await self.sync(session)
+            while True:
+                rows = (
+                    await session.execute(
+                        select(News.id, News.content)
+                        .outerjoin(NewsSignature, NewsSignature.news_id == News.id)
+                        .where(NewsSignature.news_id.is_(None))
+                        .order_by(News.create_at)
+                        .limit(batch_size)
+                    )
+                ).tuples()
+                rows = rows.all()
+                if not rows:
+                    break
+                batch = self.batch()
+                for news_id, content in rows:
+                    check = self.match(content, batch)
+                    if check.duplicate_of is not None:
+                        duplicates += 1
+                    self.record(session, news_id, check)
+                    batch.add(news_id, check.signature)
+                await session.commit()
+                for news_id, signature in batch.signatures.items():
+                    self.index.add(news_id, signature)
+                signed += len(rows)
+        return signed, duplicates
+
+
+duplicate_detector = DuplicateDetector(
+    async_session_maker,
+    index=LshIndex(MinHasher(settings.NEWS_DEDUPE_NUM_PERM), settings.NEWS_DEDUPE_BANDS),
+    threshold=settings.NEWS_DEDUPE_THRESHOLD,
+    window_days=settings.NEWS_DEDUPE_WINDOW_DAYS,
+)
+news_hub.add_listener(duplicate_detector.on_event)
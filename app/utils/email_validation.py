@@ -0,0 +1,148 @@
+import asyncio
+import ipaddress
+import logging
+import time
+from typing import Any
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from email_validator import EmailNotValidError
+from email_validator import validate_email as validate_email_syntax
+
+from app.core.config import settings
+from app.utils import exceptions
+from app.utils.cache import LRUCache
+from app.utils.common import ErrorCode
+
+logger = logging.getLogger(__name__)
+
+
+class EmailValidationService:
+    """Validate email addresses without blocking the event loop.
+
+    The syntax is checked inline. The deliverability of the domain (an MX
+    record, or an A/AAAA record as fallback) is resolved with an async
+    resolver, and the answer is cached per domain: ``positive_ttl`` seconds
+    when the domain accepts email, ``negative_ttl`` seconds when it does not.
+    Lookups failing on timeout or server errors accept the address and are
+    not cached, so a DNS outage does not block registration.
+    """
+
+    def __init__(
+        self,
+        check_deliverability: bool,
+        timeout: float,
+        positive_ttl: float,
+        negative_ttl: float,
+        cache_size: int,
+        test_environment: bool = False,
+        resolver: Any = None,
+    ):
+        self.check_deliverability = check_deliverability
+        self.timeout = timeout
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.test_environment = test_environment
+        self.cache: LRUCache[str, bool] = LRUCache(cache_size)
+        self._resolver = resolver
+        self._pending: dict[str, asyncio.Future[bool | None]] = {}
+
+    @property
+    def resolver(self):
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver()
+        return self._resolver
+
+    async def validate(self, email: str) -> str:
+        """Validate an email address.
+
+        Args:
+            email (str): email address
+
+        Raises:
+            exceptions.ValidationError: the address is malformed or its domain
+                does not accept email
+
+        Returns:
+            str: the email address
+        """
+        try:
+            result = validate_email_syntax(
+                email, check_deliverability=False, test_environment=self.test_environment
+            )
+        except EmailNotValidError as e:
+            raise exceptions.ValidationError(
+                "Invalid email address", error_code=ErrorCode.INVALID_EMAIL
+            ) from e
+
+        if (
+            self.check_deliverability
+            and not self.test_environment
+            and await self.is_deliverable(result.ascii_domain) is False
+        ):
+            raise exceptions.ValidationError(
+                "Email domain does not accept email", error_code=ErrorCode.INVALID_EMAIL
+            )
+        return email
+
+    async def is_deliverable(self, domain: str) -> bool | None:
+        """Check if a domain accepts email, None when it could not be resolved."""
+        domain = domain.lower()
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return cached
+
+        # concurrent validations of the same domain share one lookup
+        task = self._pending.get(domain)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(domain))
+            self._pending[domain] = task
+            task.add_done_callback(lambda _: self._pending.pop(domain, None))
+        return await asyncio.shield(task)
+
+    async def _lookup(self, domain: str) -> bool | None:
+        deliverable = await self._resolve(domain)
+        if deliverable is not None:
+            ttl = self.positive_ttl if deliverable else self.negative_ttl
+            self.cache.set(domain, deliverable, expires_at=time.time() + ttl)
+        return deliverable
+
+    async def _resolve(self, domain: str) -> bool | None:
+        try:
+            try:
+                answer = await self.resolver.resolve(domain, "MX", lifetime=self.timeout)
+                # RFC 7505, a null MX "." means the domain does not accept email
+                return any(str(record.exchange).rstrip(".") for record in answer)
+            except dns.resolver.NoAnswer:
+                pass
+            for rdtype in ("A", "AAAA"):
+                try:
+                    answer = await self.resolver.resolve(domain, rdtype, lifetime=self.timeout)
+                except dns.resolver.NoAnswer:
+                    continue
+                if any(_is_global(record.address) for record in answer):
+                    return True
+            return False
+        except dns.resolver.NXDOMAIN:
+            return False
+        except dns.exception.DNSException:
+            logger.warning("Could not resolve the mail domain %s", domain)
+            return None
+
+
+def _is_global(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address).is_global
+    except ValueError:
+        return False
+
+
+email_validation = EmailValidationService(
+    check_deliverability=settings.EMAIL_CHECK_DELIVERABILITY,
+    timeout=settings.EMAIL_DNS_TIMEOUT,
+    positive_ttl=settings.EMAIL_DOMAIN_CACHE_TTL_SECONDS,
+    negative_ttl=settings.EMAIL_DOMAIN_NEGATIVE_CACHE_TTL_SECONDS,
+    cache_size=settings.EMAIL_DOMAIN_CACHE_SIZE,
+    test_environment=settings.DEBUG_MODE,
+)
@@ -49,7 +49,19 @@ class ValidationError(AppException): ...
 class NewsNotFoundError(AppException): ...
 
 
+class CategoryNotFoundError(AppException): ...
+
+
+class DuplicateBatchItemError(AppException): ...
+
+
+class DuplicateNewsError(AppException): ...
+
+
 class UserNotHavePermission(AppException): ...
 
 
+class RateLimitExceededError(AppException): ...
+
+
 class FormatFileNotAllowedError(AppException): ...
@@ -0,0 +1,95 @@
+import csv
+import datetime
+import io
+import json
+from enum import StrEnum
+from typing import Any, AsyncContextManager, AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.user import User
+
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    News.id,
+    News.title,
+    News.content,
+    News.image_url,
+    News.published_at,
+    News.create_at,
+    News.update_at,
+    News.category_id,
+    Category.name.label("category"),
+    User.username.label("author"),
+)
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+def news_export_query() -> Select:
+    """Flat select of the exported news columns, joined with category and author."""
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(Category, Category.id == News.category_id)
+        .join(User, User.id == News.user_id)
+    )
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _render_ndjson(rows) -> str:
+    return "".join(
+        json.dumps({key: _serialize(value) for key, value in row.items()}) + "\n"
+        for row in rows
+    )
+
+
+def _render_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow([column.key for column in EXPORT_COLUMNS])
+    writer.writerows([[_serialize(value) for value in row.values()] for row in rows])
+    return buffer.getvalue()
+
+
+async def stream_news_export(
+    query: Select,
+    export_format: ExportFormat,
+    session_context: AsyncContextManager[AsyncSession],
+) -> AsyncIterator[str]:
+    """Stream the rows of ``query`` as NDJSON or CSV.
+
+    The rows are read with a server side cursor in chunks of
+    ``EXPORT_CHUNK_SIZE``, so memory usage does not grow with the export size.
+    The session is entered here because it must live as long as the response.
+    """
+    header = export_format is ExportFormat.CSV
+    async with session_context as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.mappings().partitions():
+            if export_format is ExportFormat.NDJSON:
+                yield _render_ndjson(rows)
+            else:
+                yield _render_csv(rows, header)
+                header = False
+        if header:
+            yield _render_csv([], header)
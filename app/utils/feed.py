@@ -0,0 +1,275 @@
+import asyncio
+import datetime
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import format_datetime
+from enum import StrEnum
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.user import User
+from app.templates import templates
+from app.utils import exceptions
+from app.utils.cache import LRUCache
+from app.utils.common import ErrorCode
+from app.utils.pubsub import NewsEvent, news_hub
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class FeedFormat(StrEnum):
+    RSS = "rss"
+    ATOM = "atom"
+
+    @property
+    def media_type(self) -> str:
+        return f"application/{self}+xml"
+
+    def format_date(self, value: datetime.datetime) -> str:
+        value = as_utc(value)
+        return (
+            format_datetime(value, usegmt=True)
+            if self is FeedFormat.RSS
+            else value.isoformat()
+        )
+
+
+def as_utc(value: datetime.datetime) -> datetime.datetime:
+    """Attach UTC to naive datetimes, the database stores them in UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+@dataclass
+class Feed:
+    """A rendered feed and the state it was rendered from."""
+
+    body: str
+    etag: str
+    last_modified: datetime.datetime
+    stamp: tuple[datetime.datetime, int]
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+FeedKey = tuple[FeedFormat, UUID | None]
+
+
+@dataclass
+class FeedSlot:
+    """The cached feed of a key, and the lock held while rendering it."""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    feed: Feed | None = None
+    stale: bool = False
+
+
+class FeedCache:
+    """Rendered RSS/Atom feeds, global and per category.
+
+    A cached feed is served without touching the database for ``ttl``
+    seconds. After that, a single ``max(update_at), count(*)`` query tells if
+    it is still current. Feeds of a category are marked stale as soon as a
+    news event for that category is received, and are rebuilt from the item
+    fragments of the news that did not change.
+
+    At most ``max_feeds`` feeds are kept, the least recently used ones are
+    dropped with their lock. The links point to ``base_url``, the public url
+    of the application, never to the Host header of a request.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        ttl: float,
+        base_url: str,
+        max_feeds: int = 1000,
+        max_items: int = 5000,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.base_url = base_url.rstrip("/") + "/"
+        self.max_items = max_items
+        self.feeds: LRUCache[FeedKey, FeedSlot] = LRUCache(max_feeds)
+        self._items: OrderedDict[tuple[FeedFormat, UUID], tuple[Any, str]] = OrderedDict()
+
+    def on_event(self, event: NewsEvent) -> None:
+        categories = {event.category_id, event.data.get("previous_category_id")}
+        for (_, category_id), slot in self.feeds.items():
+            if category_id is None or str(category_id) in categories:
+                slot.stale = True
+
+    def clear(self) -> None:
+        self.feeds.clear()
+        self._items.clear()
+
+    async def get(
+        self,
+        session: AsyncSession,
+        feed_format: FeedFormat,
+        category_id: UUID | None,
+    ) -> Feed:
+        """Get a feed from the cache, rendering it again when it is out of date.
+
+        Args:
+            session (AsyncSession): session used when the feed must be checked
+            feed_format (FeedFormat): rss or atom
+            category_id (UUID | None): category of the feed, None for all news
+
+        Raises:
+            exceptions.CategoryNotFoundError: the category does not exist
+
+        Returns:
+            Feed: the rendered feed
+        """
+        key = (feed_format, category_id)
+        slot = self.feeds.get(key)
+        if slot is None:
+            slot = FeedSlot()
+            self.feeds.set(key, slot)
+        if self._is_fresh(slot):
+            return slot.feed
+
+        async with slot.lock:
+            if self._is_fresh(slot):
+                return slot.feed
+
+            stale, slot.stale = slot.stale, False
+            try:
+                category = await self._get_category(session, category_id)
+            except exceptions.CategoryNotFoundError:
+                # unknown ids must not fill the cache
+                self.feeds.pop(key)
+                raise
+            stamp = await self._get_stamp(session, category_id)
+            feed = slot.feed
+            if feed is not None and not stale and feed.stamp == stamp:
+                feed.checked_at = time.monotonic()
+                return feed
+
+            slot.feed = await self._render(session, feed_format, category, stamp)
+            return slot.feed
+
+    def _is_fresh(self, slot: FeedSlot) -> bool:
+        return (
+            slot.feed is not None
+            and not slot.stale
+            and time.monotonic() - slot.feed.checked_at < self.ttl
+        )
+
+    async def _get_category(
+        self, session: AsyncSession, category_id: UUID | None
+    ) -> Category | None:
+        if category_id is None:
+            return None
+        category = await session.get(Category, category_id)
+        if category is None:
+            raise exceptions.CategoryNotFoundError(
+                "Category not found", error_code=ErrorCode.CATEGORY_NOT_FOUND
+            )
+        return category
+
+    async def _get_stamp(
+        self, session: AsyncSession, category_id: UUID | None
+    ) -> tuple[datetime.datetime, int]:
+        query = select(func.max(News.update_at), func.count(News.id))
+        if category_id is not None:
+            query = query.where(News.category_id == category_id)
+        last_update, count = (await session.execute(query)).one()
+        return (as_utc(last_update) if last_update else EPOCH), count
+
+    async def _render(
+        self,
+        session: AsyncSession,
+        feed_format: FeedFormat,
+        category: Category | None,
+        stamp: tuple[datetime.datetime, int],
+    ) -> Feed:
+        query = (
+            select(
+                News.id,
+                News.title,
+                News.content,
+                News.image_url,
+                News.published_at,
+                News.update_at,
+                Category.name.label("category"),
+                User.username.label("author"),
+            )
+            .join(Category, Category.id == News.category_id)
+            .join(User, User.id == News.user_id)
+            .where(News.published_at.is_not(None))
+            .order_by(News.published_at.desc())
+            .limit(self.size)
+        )
+        if category is not None:
+            query = query.where(News.category_id == category.id)
+        rows = (await session.execute(query)).mappings().all()
+
+        api_url = f"{self.base_url}api/{settings.API_V1_STR}"
+        news_url = f"{api_url}/news"
+        items = "\n".join(self._render_item(feed_format, row, news_url) for row in rows)
+
+        if category is None:
+            self_link = f"{api_url}/feed/{feed_format}"
+            title = settings.PROJECT_NAME
+            link = news_url
+        else:
+            self_link = f"{api_url}/feed/category/{category.id}/{feed_format}"
+            title = f"{settings.PROJECT_NAME} - {category.name}"
+            link = f"{news_url}?category={category.id}"
+
+        last_modified = stamp[0]
+        body = templates.get_template(f"feed/{feed_format}.xml").render(
+            title=title,
+            description=f"Latest news from {title}",
+            link=link,
+            self_link=self_link,
+            updated=feed_format.format_date(last_modified),
+            items=items,
+        )
+        etag = hashlib.sha256(body.encode()).hexdigest()[:32]
+        return Feed(body=body, etag=f'"{etag}"', last_modified=last_modified, stamp=stamp)
+
+    def _render_item(self, feed_format: FeedFormat, row, news_url: str) -> str:
+        # the author and category name are part of the fragment, so they are
+        # part of the version too
+        key = (feed_format, row["id"])
+        version = (row["update_at"], row["author"], row["category"])
+        cached = self._items.get(key)
+        if cached is not None and cached[0] == version:
+            self._items.move_to_end(key)
+            return cached[1]
+
+        fragment = templates.get_template(f"feed/{feed_format}_item.xml").render(
+            id=row["id"],
+            title=row["title"],
+            content=row["content"],
+            image_url=row["image_url"],
+            category=row["category"],
+            author=row["author"],
+            link=f"{news_url}{row['id']}",
+            published=feed_format.format_date(row["published_at"]),
+            updated=feed_format.format_date(row["update_at"]),
+        )
+        self._items[key] = (version, fragment)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return fragment
+
+
+feed_cache = FeedCache(
+    size=settings.FEED_SIZE,
+    ttl=settings.FEED_CACHE_TTL_SECONDS,
+    base_url=settings.FEED_BASE_URL,
+)
+news_hub.add_listener(feed_cache.on_event)
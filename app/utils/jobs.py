@@ -0,0 +1,336 @@
+import asyncio
+import contextlib
+import datetime
+import logging
+import os
+import random
+import signal
+import socket
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.background import BackgroundTasks
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+def _datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+class JobQueue:
+    """Durable job queue stored in the ``jobs`` table.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+    number of them can poll the table without handing the same job twice.
+    SQLite ignores the locking clause but serializes the writes, which is
+    enough for the tests. A failed job is retried with an exponential
+    backoff, and kept as ``dead`` after ``max_attempts`` for inspection. A
+    job held longer than ``lock_timeout`` seconds, by a worker that crashed,
+    is claimed again.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+        timeout: float,
+        lock_timeout: float,
+        inline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.inline = inline
+        self.clock = clock
+        self.handlers: dict[str, Handler] = {}
+        self._inline_tasks: set[asyncio.Task] = set()
+
+    @property
+    def worker_id(self) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def task(self, name: str | None = None):
+        """Register a coroutine function as a job handler, its kwargs are the payload."""
+
+        def decorator(func: Handler) -> Handler:
+            self.handlers[name or func.__name__] = func
+            return func
+
+        return decorator
+
+    def _name(self, handler: Handler | str) -> str:
+        name = handler if isinstance(handler, str) else handler.__name__
+        if name not in self.handlers:
+            raise LookupError(f"{name} is not a registered job")
+        return name
+
+    async def enqueue(
+        self,
+        handler: Handler | str,
+        *,
+        delay: float = 0,
+        session: AsyncSession | None = None,
+        background: BackgroundTasks | None = None,
+        **payload: Any,
+    ) -> None:
+        """Queue a job.
+
+        Args:
+            handler (Handler | str): registered handler, or its name
+            delay (float, optional): seconds to wait before running it. Defaults to 0.
+            session (AsyncSession | None, optional): add the job to this session,
+                to be committed with the rest of its transaction. Defaults to None,
+                the job is committed right away.
+            background (BackgroundTasks | None, optional): background tasks of the
+                request, an inline job runs with them so the response waits for it
+                where the process stops after the response. Defaults to None, the
+                inline job runs in an asyncio task.
+            **payload: arguments of the handler, must be JSON serializable
+        """
+        name = self._name(handler)
+        if self.inline:
+            if background is not None:
+                background.add_task(self.run_inline, name, payload, delay)
+            else:
+                task = asyncio.create_task(self.run_inline(name, payload, delay))
+                self._inline_tasks.add(task)
+                task.add_done_callback(self._inline_tasks.discard)
+            return
+
+        job = Job(
+            name=name,
+            payload=payload,
+            status=Job.QUEUED,
+            attempts=0,
+            max_attempts=self.max_attempts,
+            run_at=_datetime(self.clock() + delay),
+        )
+        if session is not None:
+            session.add(job)
+            return
+        async with self.session_maker() as own_session:
+            own_session.add(job)
+            await own_session.commit()
+
+    async def run_inline(self, name: str, payload: dict[str, Any], delay: float = 0) -> None:
+        """Run a job in this process, once, without storing it."""
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            await asyncio.wait_for(self.handlers[name](**payload), self.timeout)
+        except Exception:
+            logger.exception("Inline job %s failed", name)
+
+    async def drain(self) -> None:
+        """Wait for the inline jobs still running."""
+        if self._inline_tasks:
+            await asyncio.gather(*self._inline_tasks, return_exceptions=True)
+
+    async def pending(self) -> int:
+        """Number of queued jobs in the table."""
+        async with self.session_maker() as session:
+            return await session.scalar(
+                select(func.count()).select_from(Job).where(Job.status == Job.QUEUED)
+            )
+
+    async def warn_pending(self) -> None:
+        """Log the jobs left in the table, which no worker reads with inline jobs."""
+        try:
+            pending = await self.pending()
+        except Exception:
+            logger.exception("Failed to count the pending jobs")
+            return
+        if pending:
+            logger.warning(
+                "%s queued jobs will not run with JOB_RUNNER=inline, "
+                "set JOB_RUNNER=app or run python -m app.worker",
+                pending,
+            )
+
+    async def claim(self, limit: int) -> list[Job]:
+        """Lock up to ``limit`` due jobs for this worker."""
+        now = self.clock()
+        due = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(Job.status == Job.QUEUED, Job.run_at <= _datetime(now)),
+                    and_(
+                        Job.status == Job.RUNNING,
+                        Job.locked_at <= _datetime(now - self.lock_timeout),
+                    ),
+                )
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(
+                status=Job.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_at=_datetime(now),
+                locked_by=self.worker_id,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        async with self.session_maker() as session:
+            jobs = list((await session.scalars(statement)).all())
+            await session.commit()
+        return jobs
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt, doubled on each failure and jittered."""
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1)
+
+    def _owned(self, job: Job):
+        return and_(
+            Job.id == job.id, Job.locked_by == job.locked_by, Job.locked_at == job.locked_at
+        )
+
+    async def complete(self, job: Job) -> None:
+        async with self.session_maker() as session:
+            await session.execute(delete(Job).where(self._owned(job)))
+            await session.commit()
+
+    async def fail(self, job: Job, error: BaseException, retry: bool = True) -> None:
+        values: dict[str, Any] = {
+            "locked_at": None,
+            "locked_by": None,
+            "last_error": f"{type(error).__name__}: {error}"[:2000],
+        }
+        if retry and job.attempts < job.max_attempts:
+            values["status"] = Job.QUEUED
+            values["run_at"] = _datetime(self.clock() + self.backoff(job.attempts))
+        else:
+            values["status"] = Job.DEAD
+            logger.error(
+                "Job %s (%s) is dead after %s attempts", job.id, job.name, job.attempts
+            )
+        async with self.session_maker() as session:
+            await session.execute(update(Job).where(self._owned(job)).values(**values))
+            await session.commit()
+
+    async def run(self, job: Job) -> None:
+        """Run a claimed job, then delete it or schedule its retry."""
+        handler = self.handlers.get(job.name)
+        if handler is None:
+            await self.fail(
+                job, LookupError(f"{job.name} is not a registered job"), retry=False
+            )
+            return
+        try:
+            await asyncio.wait_for(handler(**job.payload), self.timeout)
+        except Exception as e:
+            logger.warning("Job %s (%s) failed: %r", job.id, job.name, e)
+            await self.fail(job, e)
+        else:
+            await self.complete(job)
+
+    async def requeue_dead(self, name: str | None = None) -> int:
+        """Queue the dead jobs again, with a fresh number of attempts."""
+        statement = update(Job).where(Job.status == Job.DEAD)
+        if name is not None:
+            statement = statement.where(Job.name == name)
+        async with self.session_maker() as session:
+            result = await session.execute(
+                statement.values(status=Job.QUEUED, attempts=0, run_at=_datetime(self.clock()))
+            )
+            await session.commit()
+        return result.rowcount
+
+
+class Worker:
+    """Poll the queue and run up to ``concurrency`` jobs at a time."""
+
+    def __init__(self, queue: JobQueue, concurrency: int, poll_interval: float):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.running: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def _wait(self) -> None:
+        # until the poll interval, a job finishes or the worker is stopped
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait(
+                {stopping, *self.running},
+                timeout=self.poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stopping.cancel()
+
+    async def run(self) -> None:
+        """Run jobs until ``stop``, then wait for the running ones to finish."""
+        while not self._stopping.is_set():
+            free = self.concurrency - len(self.running)
+            jobs: list[Job] = []
+            if free > 0:
+                try:
+                    jobs = await self.queue.claim(free)
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+            for job in jobs:
+                task = asyncio.create_task(self.queue.run(job))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+            if len(jobs) < free or free <= 0:
+                await self._wait()
+
+        if self.running:
+            logger.info("Waiting for %s running jobs", len(self.running))
+            await asyncio.gather(*self.running, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, self.stop)
+
+    def start(self) -> None:
+        """Run the worker in the background of the web application."""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self.stop()
+            await self._task
+            self._task = None
+
+
+job_queue = JobQueue(
+    async_session_maker,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base=settings.JOB_RETRY_BASE_SECONDS,
+    retry_max=settings.JOB_RETRY_MAX_SECONDS,
+    timeout=settings.JOB_TIMEOUT_SECONDS,
+    lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+    inline=settings.JOB_RUNNER == "inline",
+)
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.user import User
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesce lookups by key issued in the same event loop tick into one batch.
+
+    Every ``load`` call made before the loop gets a chance to run the scheduled
+    dispatch is resolved by a single call to ``batch_fn``. Results are cached
+    for the lifetime of the loader, so a loader should live for one request.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]]):
+        self.batch_fn = batch_fn
+        self._futures: dict[K, asyncio.Future] = {}
+        self._queue: list[K] = []
+        self._task: asyncio.Task | None = None
+
+    def load(self, key: K) -> "asyncio.Future[V | None]":
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        self._queue.append(key)
+        if len(self._queue) == 1:
+            loop.call_soon(self._schedule)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule(self) -> None:
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            values = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                self._futures.pop(key).set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+def _model_loader(session: AsyncSession, model: type[Any]) -> DataLoader:
+    async def batch_fn(ids: list) -> dict:
+        result = await session.scalars(select(model).where(model.id.in_(ids)))
+        return {obj.id: obj for obj in result}
+
+    return DataLoader(batch_fn)
+
+
+class RequestLoaders:
+    """Loaders by id for the models read by the API, bound to one request session."""
+
+    def __init__(self, session: AsyncSession):
+        self.news: DataLoader[Any, News] = _model_loader(session, News)
+        self.users: DataLoader[Any, User] = _model_loader(session, User)
+        self.categories: DataLoader[Any, Category] = _model_loader(session, Category)
@@ -1,14 +1,28 @@
-from fastapi_mail import FastMail, MessageSchema
+from functools import cache
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from fastapi_mail import FastMail
+
+
+@cache
+def get_mailer() -> "FastMail":
+    """Create the mailer on first use, fastapi_mail is slow to import."""
+    from fastapi_mail import FastMail
+
+    return FastMail(settings.mail_config)
+
 
 class EmailService:
-    def __init__(self):
-        self.conf = settings.mail_config
-        self.mailer = FastMail(self.conf)
+    @property
+    def mailer(self) -> "FastMail":
+        return get_mailer()
 
     async def send_email(self, subject: str, email_to: str, body: str):
+        from fastapi_mail import MessageSchema
+
         message = MessageSchema(
             subject=subject,
             recipients=[email_to],
@@ -0,0 +1,128 @@
+import bisect
+import threading
+from typing import Any, Sequence, TypeVar
+
+LabelKey = tuple[tuple[str, str], ...]
+M = TypeVar("M", bound="Metric")
+
+
+def _labels(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format(name: str, key: LabelKey, value: float) -> str:
+    if not key:
+        return f"{name} {value}"
+    labels = ",".join(
+        '{}="{}"'.format(label, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for label, value in key
+    )
+    return f"{name}{{{labels}}} {value}"
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, **labels: object) -> float | None:
+        return self.values.get(_labels(labels))
+
+    def samples(self) -> list[str]:
+        return [_format(self.name, key, value) for key, value in sorted(self.values.items())]
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self.values[_labels(labels)] = value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, value: float = 1, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets of upper bounds ``buckets``.
+
+    ``get`` returns the number of observations.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float]):
+        super().__init__(name, description)
+        self.buckets = sorted(buckets)
+        # observations per bucket, the last one counts the values above every bound
+        self.counts: dict[LabelKey, list[int]] = {}
+        self.sums: dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            counts = self.counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sums[key] = self.sums.get(key, 0) + value
+            self.values[key] = self.values.get(key, 0) + 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, counts in sorted(self.counts.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts, strict=True):
+                cumulative += count
+                bucket_key = (*key, ("le", str(bound)))
+                lines.append(_format(f"{self.name}_bucket", bucket_key, cumulative))
+            lines.append(_format(f"{self.name}_sum", key, self.sums[key]))
+            lines.append(_format(f"{self.name}_count", key, cumulative))
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metrics, exposed in the Prometheus text format by ``GET /metrics``.
+
+    The values are kept per worker process, a scrape is answered by whichever
+    worker accepts the connection.
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def _get(self, cls: type[M], name: str, description: str, **kwargs: Any) -> M:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, description, **kwargs)
+        if not isinstance(metric, cls):
+            raise TypeError(f"{name} is already registered as a {metric.type}")
+        return metric
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._get(Gauge, name, description)
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get(Counter, name, description)
+
+    def histogram(self, name: str, description: str, buckets: Sequence[float]) -> Histogram:
+        return self._get(Histogram, name, description, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Iterable, NamedTuple, Protocol
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.db.base import async_session_maker, replica_router
+from app.db.models.cache_entry import CacheEntry
+from app.db.models.news import News
+from app.db.upsert import insert_for
+from app.schemas.news import NewsPublicRead
+from app.utils.cache import LRUCache
+from app.utils.pubsub import NewsEvent, news_hub
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[AsyncSession, UUID], Awaitable[bytes | None]]
+
+
+class Entry(NamedTuple):
+    value: bytes
+    fresh_until: float
+    expires_at: float
+
+
+class CacheBackend(Protocol):
+    """Shared second level of the cache."""
+
+    async def get(self, key: str) -> Entry | None: ...
+
+    async def set(self, key: str, entry: Entry) -> None: ...
+
+    async def delete(self, keys: Iterable[str]) -> None: ...
+
+
+class DatabaseCacheBackend:
+    """Entries shared by every worker, in the ``cache_entries`` table."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.clock = clock
+
+    async def get(self, key: str) -> Entry | None:
+        async with self.session_maker() as session:
+            row = (
+                await session.execute(
+                    select(
+                        CacheEntry.value, CacheEntry.fresh_until, CacheEntry.expires_at
+                    ).where(CacheEntry.key == key, CacheEntry.expires_at > self.clock())
+                )
+            ).one_or_none()
+        return Entry(*row) if row is not None else None
+
+    async def set(self, key: str, entry: Entry) -> None:
+        async with self.session_maker() as session:
+            statement = insert_for(session, CacheEntry).values(key=key, **entry._asdict())
+            statement = statement.on_conflict_do_update(
+                index_elements=[CacheEntry.key], set_=entry._asdict()
+            )
+            await session.execute(statement)
+            await session.commit()
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        async with self.session_maker() as session:
+            await session.execute(delete(CacheEntry).where(CacheEntry.key.in_(list(keys))))
+            await session.commit()
+
+    async def prune(self) -> None:
+        """Delete the expired entries."""
+        async with self.session_maker() as session:
+            await session.execute(
+                delete(CacheEntry).where(CacheEntry.expires_at <= self.clock())
+            )
+            await session.commit()
+
+
+async def load_news_detail(session: AsyncSession, news_id: UUID) -> bytes | None:
+    """The ``NewsPublicRead`` json of a news, None if it does not exist.
+
+    The news is read by ``id`` alone, which probes every partition of ``news``.
+    """
+    news = (
+        await session.execute(
+            select(News)
+            .options(selectinload(News.category), selectinload(News.user))
+            .where(News.id == news_id)
+        )
+    ).scalar_one_or_none()
+    if news is None:
+        return None
+    return NewsPublicRead.model_validate(news).model_dump_json().encode()
+
+
+class NewsCache:
+    """Rendered news details, in a bounded LRU per worker and an optional shared backend.
+
+    An entry is served as is for ``ttl`` seconds. For ``stale_ttl`` seconds
+    more it is still served, while a single background task reads the news
+    again. Concurrent misses of a news wait for the same read, a news going
+    viral costs one query per worker and not one per request.
+
+    The writes of the current worker drop the entries with ``invalidate``,
+    here and in the shared backend. With ``NEWS_BROKER=postgres`` the other
+    workers drop their own copy on the news events of the hub. With the
+    memory broker the events stay in the worker, the other workers serve
+    their copy until it is no longer fresh: a change shows everywhere after
+    ``ttl`` seconds, and the first read after that may still get the old copy
+    while it is read again. Entries are read from the replicas, so they may
+    also lag the primary by the replica delay.
+
+    The json embeds the author and the category. A change of the profile of
+    an author drops the entries of its news with ``invalidate``, the same
+    ``ttl`` bound applies on the other workers. Categories cannot be renamed
+    through the api, a rename in the database shows after
+    ``ttl + stale_ttl`` seconds at most.
+    """
+
+    def __init__(
+        self,
+        get_session_maker: Callable[[], Awaitable[async_sessionmaker[AsyncSession]]],
+        backend: CacheBackend | None,
+        size: int,
+        ttl: float,
+        stale_ttl: float,
+        load: Loader = load_news_detail,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.get_session_maker = get_session_maker
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.load = load
+        self.clock = clock
+        self.entries: LRUCache[UUID, Entry] = LRUCache(size, clock)
+        self._flights: dict[UUID, asyncio.Task[bytes | None]] = {}
+
+    @staticmethod
+    def _key(news_id: UUID) -> str:
+        return f"news:{news_id}"
+
+    async def get(self, news_id: UUID) -> bytes | None:
+        """The json of a news, from the cache when possible. None if it does not exist."""
+        if not self.ttl:
+            async with (await self.get_session_maker())() as session:
+                return await self.load(session, news_id)
+
+        entry = self.entries.get(news_id)
+        if entry is None and self.backend is not None:
+            entry = await self.backend.get(self._key(news_id))
+            if entry is not None:
+                self.entries.set(news_id, entry, entry.expires_at)
+        if entry is None:
+            return await asyncio.shield(self._flight(news_id))
+        if entry.fresh_until <= self.clock():
+            self._flight(news_id)
+        return entry.value
+
+    def _flight(self, news_id: UUID) -> asyncio.Task[bytes | None]:
+        task = self._flights.get(news_id)
+        if task is None:
+            task = asyncio.create_task(self._fill(news_id))
+            task.add_done_callback(lambda done: self._landed(news_id, done))
+            self._flights[news_id] = task
+        return task
+
+    def _landed(self, news_id: UUID, task: asyncio.Task) -> None:
+        if self._flights.get(news_id) is task:
+            del self._flights[news_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to load news %s", news_id, exc_info=task.exception())
+
+    async def _fill(self, news_id: UUID) -> bytes | None:
+        async with (await self.get_session_maker())() as session:
+            value = await self.load(session, news_id)
+        # an invalidation during the read drops the flight, its result is not kept
+        if value is None or self._flights.get(news_id) is not asyncio.current_task():
+            return value
+
+        now = self.clock()
+        entry = Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self.entries.set(news_id, entry, entry.expires_at)
+        if self.backend is not None:
+            await self.backend.set(self._key(news_id), entry)
+        return value
+
+    def forget(self, news_id: UUID) -> None:
+        """Drop the entry of this worker."""
+        self.entries.pop(news_id)
+        self._flights.pop(news_id, None)
+
+    async def invalidate(self, *news_ids: UUID) -> None:
+        """Drop the entries of changed news, here and in the shared backend."""
+        for news_id in news_ids:
+            self.forget(news_id)
+        if self.backend is not None and news_ids:
+            await self.backend.delete(self._key(news_id) for news_id in news_ids)
+
+    def on_event(self, event: NewsEvent) -> None:
+        if event.type in ("updated", "deleted"):
+            self.forget(UUID(event.news_id))
+
+
+def _create_backend() -> CacheBackend | None:
+    if settings.NEWS_CACHE_BACKEND == "database":
+        return DatabaseCacheBackend(async_session_maker)
+    return None
+
+
+news_cache = NewsCache(
+    replica_router.get_session_maker,
+    backend=_create_backend(),
+    size=settings.NEWS_CACHE_SIZE,
+    ttl=settings.NEWS_CACHE_TTL_SECONDS,
+    stale_ttl=settings.NEWS_CACHE_STALE_SECONDS,
+)
+news_hub.add_listener(news_cache.on_event)
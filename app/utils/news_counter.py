@@ -0,0 +1,92 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.news import News
+from app.db.models.news_counter import NewsCounter
+from app.db.models.user import User
+from app.db.upsert import insert_for
+
+
+class NewsCounterService:
+    """Keep the ``news_counters`` summary table in sync with the ``news`` table.
+
+    Changes are written with the caller session and are not committed, so they
+    land in the same transaction as the news write itself.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.deltas: Counter[tuple[str, UUID]] = Counter()
+
+    def created(self, category_id: UUID, user_id: UUID) -> "NewsCounterService":
+        self.deltas[(NewsCounter.CATEGORY, category_id)] += 1
+        self.deltas[(NewsCounter.AUTHOR, user_id)] += 1
+        return self
+
+    def deleted(self, category_id: UUID, user_id: UUID) -> "NewsCounterService":
+        self.deltas[(NewsCounter.CATEGORY, category_id)] -= 1
+        self.deltas[(NewsCounter.AUTHOR, user_id)] -= 1
+        return self
+
+    def moved(self, old_category_id: UUID, new_category_id: UUID) -> "NewsCounterService":
+        if old_category_id != new_category_id:
+            self.deltas[(NewsCounter.CATEGORY, old_category_id)] -= 1
+            self.deltas[(NewsCounter.CATEGORY, new_category_id)] += 1
+        return self
+
+    async def flush(self) -> None:
+        """Apply the pending deltas with a single multi-row upsert."""
+        rows = [
+            {"scope": scope, "ref_id": ref_id, "count": delta}
+            for (scope, ref_id), delta in self.deltas.items()
+            if delta
+        ]
+        self.deltas.clear()
+        if not rows:
+            return
+
+        statement = insert_for(self.session, NewsCounter).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[NewsCounter.scope, NewsCounter.ref_id],
+            set_={"count": NewsCounter.count + statement.excluded.count},
+        )
+        await self.session.execute(statement)
+
+    async def rebuild(self) -> None:
+        """Recompute every counter from the ``news`` table."""
+        await self.session.execute(delete(NewsCounter))
+        for scope, column in (
+            (NewsCounter.CATEGORY, News.category_id),
+            (NewsCounter.AUTHOR, News.user_id),
+        ):
+            await self.session.execute(
+                NewsCounter.__table__.insert().from_select(
+                    ["scope", "ref_id", "count"],
+                    select(literal(scope), column, func.count()).group_by(column),
+                )
+            )
+
+    async def get(self, scope: str, ref_id: UUID) -> int:
+        count = await self.session.scalar(
+            select(NewsCounter.count).where(
+                NewsCounter.scope == scope, NewsCounter.ref_id == ref_id
+            )
+        )
+        return count or 0
+
+    async def total(self, author: str | None = None, category: UUID | None = None) -> int:
+        """Number of news of an author username, of a category, or of all news."""
+        if category:
+            return await self.get(NewsCounter.CATEGORY, category)
+
+        query = select(func.coalesce(func.sum(NewsCounter.count), 0))
+        if author:
+            query = query.join(User, User.id == NewsCounter.ref_id).where(
+                NewsCounter.scope == NewsCounter.AUTHOR, User.username == author.lower()
+            )
+        else:
+            query = query.where(NewsCounter.scope == NewsCounter.CATEGORY)
+        return await self.session.scalar(query)
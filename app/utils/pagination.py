@@ -1,16 +1,25 @@
-from sqlalchemy import Select, func, select
+from sqlalchemy import ColumnElement, Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.middleware.request import request_object
 
 
 class Paginator:
-    def __init__(self, session: AsyncSession, query: Select, page: int, per_page: int):
+    def __init__(
+        self,
+        session: AsyncSession,
+        query: Select,
+        page: int,
+        per_page: int,
+        count: int | None = None,
+        window: ColumnElement[bool] | None = None,
+    ):
         self.session = session
         self.query = query
+        self.count = count
+        self.window = window
         self.page = page
         self.per_page = per_page
-        self.limit = per_page * page
         self.offset = (page - 1) * per_page
         self.request = request_object.get()
         # computed later
@@ -33,32 +42,57 @@ class Paginator:
     async def get_response(self) -> dict:
         return {
             "count": await self._get_total_count(),
-            "items": list(
-                await self.session.scalars(
-                    self.query.limit(self.limit).offset(self.offset)
-                )
-            ),
+            "items": await self._get_items(),
             "curr_page": self.page,
             "total_page": self.number_of_pages,
             "next_page": self._get_next_page(),
             "previous_page": self._get_previous_page(),
         }
 
+    async def _get_items(self) -> list:
+        if self.window is not None:
+            # rows of the window come first in the order of the query, when it
+            # holds offset + per_page rows they are the page of the whole query
+            items = list(
+                await self.session.scalars(
+                    self.query.where(self.window).limit(self.per_page).offset(self.offset)
+                )
+            )
+            if len(items) == self.per_page:
+                return items
+        return list(
+            await self.session.scalars(self.query.limit(self.per_page).offset(self.offset))
+        )
+
     def _get_number_of_pages(self, count: int) -> int:
         rest = count % self.per_page
         quotient = count // self.per_page
         return quotient if not rest else quotient + 1
 
     async def _get_total_count(self) -> int:
-        count = await self.session.scalar(
-            select(func.count()).select_from(self.query.subquery())
-        )
+        count = self.count
+        if count is None:
+            count = await self.session.scalar(
+                select(func.count()).select_from(self.query.subquery())
+            )
         self.number_of_pages = self._get_number_of_pages(count)
         return count
 
 
 async def paginate(
-    session: AsyncSession, query: Select, page: int, per_page: int
+    session: AsyncSession,
+    query: Select,
+    page: int,
+    per_page: int,
+    count: int | None = None,
+    window: ColumnElement[bool] | None = None,
 ) -> dict:
-    paginator = Paginator(session, query, page, per_page)
+    """Paginate a query.
+
+    Args:
+        count: total number of rows when it is known, instead of counting them
+        window: condition selecting the rows sorted first by the query, tried
+            before the whole query so that a page found in it reads less
+    """
+    paginator = Paginator(session, query, page, per_page, count=count, window=window)
     return await paginator.get_response()
@@ -0,0 +1,280 @@
+import asyncio
+import contextlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Callable, Protocol
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NEWS_CHANNEL = "news_events"
+# pg_notify rejects larger payloads
+MAX_PAYLOAD_BYTES = 8000
+
+
+@dataclass(frozen=True)
+class NewsEvent:
+    """A change of a news, published to every worker through the broker."""
+
+    type: str
+    news_id: str
+    category_id: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, message: str) -> "NewsEvent":
+        return cls(**json.loads(message))
+
+    @classmethod
+    def created(cls, news: dict[str, Any], author: str) -> "NewsEvent":
+        """Event of a created news, from its ``UserNewsRead`` json.
+
+        Only the fields the listeners need are sent, the subscribers fetch the
+        content, which would not fit in a notification payload.
+        """
+        category_id = news["category"]["id"]
+        data = {
+            "id": news["id"],
+            "category_id": category_id,
+            "title": news["title"],
+            "author": author,
+            "published_at": news["published_at"],
+        }
+        return cls("created", news["id"], category_id, data)
+
+
+class Broker(Protocol):
+    """Transport of events between the workers."""
+
+    async def start(self, on_message: Callable[[str], None]) -> None: ...
+
+    async def publish(self, message: str) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class InMemoryBroker:
+    """Deliver events to the current worker only."""
+
+    def __init__(self):
+        self.on_message: Callable[[str], None] | None = None
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        self.on_message = on_message
+
+    async def publish(self, message: str) -> None:
+        if self.on_message is not None:
+            self.on_message(message)
+
+    async def stop(self) -> None:
+        self.on_message = None
+
+
+class PostgresBroker:
+    """Fan out events to every worker with Postgres ``LISTEN``/``NOTIFY``.
+
+    A dedicated connection listens on the channel and is re-opened when it is
+    lost. The events are published on another connection, shared by the
+    requests one at a time. Notification payloads are limited to 8000 bytes
+    by Postgres.
+    """
+
+    def __init__(self, dsn: str, channel: str = NEWS_CHANNEL, reconnect_delay: float = 5):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def _listen_once(self, on_message: Callable[[str], None]) -> None:
+        lost = asyncio.Event()
+        connection = await self._connect()
+        try:
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(self.channel, lambda *args: on_message(args[-1]))
+            await lost.wait()
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+    async def _listen(self, on_message: Callable[[str], None]) -> None:
+        while True:
+            try:
+                await self._listen_once(on_message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("News event listener failed, reconnecting")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        self._task = asyncio.create_task(self._listen(on_message))
+
+    async def publish(self, message: str) -> None:
+        size = len(message.encode())
+        if size >= MAX_PAYLOAD_BYTES:
+            raise ValueError(f"Event of {size} bytes, at most {MAX_PAYLOAD_BYTES} fit")
+        # an asyncpg connection runs a single query at a time
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await self._connect()
+            await self._publisher.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._publisher is not None:
+            await self._publisher.close()
+
+
+class Subscription:
+    """Bounded queue of the events a single client is interested in."""
+
+    def __init__(
+        self,
+        hub: "NewsHub",
+        category_id: str | None,
+        event_types: set[str] | None,
+        maxsize: int,
+        max_dropped: int,
+    ):
+        self.hub = hub
+        self.category_id = category_id
+        self.event_types = event_types
+        self.queue: asyncio.Queue[NewsEvent] = asyncio.Queue(maxsize)
+        self.max_dropped = max_dropped
+        self.dropped = 0
+        self.closed = False
+
+    def matches(self, event: NewsEvent) -> bool:
+        if self.event_types is not None and event.type not in self.event_types:
+            return False
+        return self.category_id is None or self.category_id == event.category_id
+
+    def put(self, event: NewsEvent) -> None:
+        """Queue an event without blocking the publisher.
+
+        When the consumer is too slow the oldest event is dropped, and after
+        ``max_dropped`` drops the subscription is closed so the client reconnects.
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped >= self.max_dropped:
+                self.close()
+                return
+        self.queue.put_nowait(event)
+
+    async def get(self) -> NewsEvent:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.closed = True
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class NewsHub:
+    """Publish news events and dispatch them to the local subscribers."""
+
+    def __init__(self, broker: Broker, queue_size: int = 100, max_dropped: int = 100):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.max_dropped = max_dropped
+        self.subscriptions: set[Subscription] = set()
+        self.listeners: list[Callable[[NewsEvent], None]] = []
+
+    async def start(self) -> None:
+        await self.broker.start(self._dispatch)
+
+    async def stop(self) -> None:
+        await self.broker.stop()
+
+    async def publish(self, event: NewsEvent) -> None:
+        """Publish an event, failures are logged and never raised to the writer."""
+        try:
+            await self.broker.publish(event.to_json())
+        except Exception:
+            logger.exception("Failed to publish news event")
+
+    def subscribe(
+        self, category_id: str | None = None, event_types: set[str] | None = None
+    ) -> Subscription:
+        subscription = Subscription(
+            self, category_id, event_types, self.queue_size, self.max_dropped
+        )
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def add_listener(self, listener: Callable[[NewsEvent], None]) -> None:
+        """Call ``listener`` with every event, used by the caches to invalidate."""
+        self.listeners.append(listener)
+
+    def _dispatch(self, message: str) -> None:
+        try:
+            event = NewsEvent.from_json(message)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed news event: %s", message)
+            return
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("News event listener failed")
+        for subscription in list(self.subscriptions):
+            if subscription.matches(event):
+                subscription.put(event)
+
+
+async def stream_events(
+    subscription: Subscription,
+    is_disconnected: Callable[[], Any],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """Render the events of a subscription as a Server-Sent Events stream."""
+    with subscription:
+        yield f"retry: {int(heartbeat_seconds * 1000)}\n\n"
+        while not subscription.closed:
+            if await is_disconnected():
+                break
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat_seconds)
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            data = json.dumps(event.data, default=str)
+            yield f"id: {event.news_id}\nevent: news.{event.type}\ndata: {data}\n\n"
+
+
+def _create_broker() -> Broker:
+    if settings.NEWS_BROKER == "postgres":
+        return PostgresBroker(str(settings.db_url).replace("+asyncpg", ""))
+    return InMemoryBroker()
+
+
+news_hub = NewsHub(
+    _create_broker(),
+    queue_size=settings.NEWS_STREAM_QUEUE_SIZE,
+    max_dropped=settings.NEWS_STREAM_MAX_DROPPED,
+)
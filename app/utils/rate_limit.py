@@ -0,0 +1,262 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Protocol
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import case, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.rate_limit import RateLimitBucket
+from app.db.upsert import insert_for
+from app.utils import exceptions
+from app.utils.common import ErrorCode
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``capacity`` requests per ``period`` seconds, with bursts up to ``capacity``."""
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens added back per second."""
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse a limit like ``"5/minute"``.
+
+        Args:
+            value (str): number of requests and one of second, minute, hour, day
+
+        Raises:
+            ValueError: the limit is malformed
+
+        Returns:
+            RateLimit: the parsed limit
+        """
+        capacity, _, period = value.partition("/")
+        try:
+            limit = cls(int(capacity), PERIODS[period.strip().lower()])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid rate limit: {value!r}") from e
+        if limit.capacity <= 0:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return limit
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+    def consume(self, limit: RateLimit, now: float, cost: int = 1) -> float:
+        """Take ``cost`` tokens and return 0, or the seconds to wait when empty."""
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(limit.capacity, self.tokens + elapsed * limit.rate)
+        self.updated_at = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / limit.rate
+
+    def full_at(self, limit: RateLimit) -> float:
+        return self.updated_at + (limit.capacity - self.tokens) / limit.rate
+
+
+class RateLimitBackend(Protocol):
+    """Storage of the token buckets."""
+
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> float: ...
+
+
+class MemoryRateLimitBackend:
+    """Token buckets of the current worker, in a sharded dict with bounded size.
+
+    Each shard is kept in least recently used order. A bucket that refilled
+    completely behaves like a new one, so such buckets are dropped from the
+    front of the shard as it is touched. When a shard is still over
+    ``max_keys / shards`` entries, the least recently used buckets are evicted.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.shards: list[OrderedDict[str, tuple[TokenBucket, float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self.clock = clock
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        now = self.clock()
+        shard = self.shards[hash(key) % len(self.shards)]
+        entry = shard.pop(key, None)
+        bucket = entry[0] if entry is not None else TokenBucket(limit.capacity, now)
+
+        retry_after = bucket.consume(limit, now, cost)
+        shard[key] = (bucket, bucket.full_at(limit))
+
+        while shard:
+            oldest_key, (_, full_at) = next(iter(shard.items()))
+            if full_at > now and len(shard) <= self.max_keys_per_shard:
+                break
+            del shard[oldest_key]
+        return retry_after
+
+
+class DatabaseRateLimitBackend:
+    """Token buckets shared by every worker, in the ``rate_limit_buckets`` table.
+
+    A bucket is refilled and consumed by a single ``INSERT ... ON CONFLICT DO
+    UPDATE`` so concurrent workers never lose an update.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.clock = clock
+
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        now = self.clock()
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * limit.rate
+        refilled = case((refilled > limit.capacity, limit.capacity), else_=refilled)
+        allowed = refilled >= cost
+
+        async with self.session_maker() as session:
+            statement = insert_for(session, RateLimitBucket).values(
+                key=key, tokens=limit.capacity - cost, updated_at=now, allowed=True
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={
+                    "tokens": case((allowed, refilled - cost), else_=refilled),
+                    "updated_at": now,
+                    "allowed": allowed,
+                },
+            ).returning(RateLimitBucket.tokens, RateLimitBucket.allowed)
+            tokens, is_allowed = (await session.execute(statement)).one()
+            await session.commit()
+
+        return 0 if is_allowed else (cost - tokens) / limit.rate
+
+    async def prune(self, older_than: float) -> None:
+        """Delete the buckets not used for ``older_than`` seconds."""
+        async with self.session_maker() as session:
+            await session.execute(
+                delete(RateLimitBucket).where(
+                    RateLimitBucket.updated_at < self.clock() - older_than
+                )
+            )
+            await session.commit()
+
+
+KeyFunc = Callable[[Request], Awaitable[str | None]]
+
+
+async def client_ip(request: Request) -> str | None:
+    """Address of the client, from ``X-Forwarded-For`` when the proxy is trusted."""
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+async def account_name(request: Request) -> str | None:
+    """Username or email the request is about, read from the form or json body."""
+    content_type = request.headers.get("Content-Type", "")
+    if content_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+        value = (await request.form()).get("username")
+    elif content_type.startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        value = body.get("email") or body.get("username")
+    else:
+        return None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+class RateLimiter:
+    """Dependency rejecting requests over a rate limit with ``429 Too Many Requests``.
+
+    There is one bucket per route and per value of ``key``, for example the
+    client ip. Used as a router dependency, it runs before the dependencies
+    and the body of the endpoint.
+    """
+
+    def __init__(
+        self,
+        limit: str | RateLimit,
+        key: KeyFunc = client_ip,
+        name: str = "ip",
+        methods: Iterable[str] | None = None,
+        backend: RateLimitBackend | None = None,
+    ):
+        self.limit = RateLimit.parse(limit) if isinstance(limit, str) else limit
+        self.key = key
+        self.name = name
+        self.methods = frozenset(methods) if methods is not None else None
+        self.backend = backend
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if self.methods is not None and request.method not in self.methods:
+            return
+
+        value = await self.key(request)
+        if value is None:
+            return
+
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        bucket_key = f"{self.name}:{request.method}:{path}:{digest}"
+
+        backend = self.backend or rate_limit_backend
+        retry_after = await backend.consume(bucket_key, self.limit)
+        if retry_after > 0:
+            raise HTTPException(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                exceptions.RateLimitExceededError(
+                    "Too many requests, try again later",
+                    error_code=ErrorCode.RATE_LIMIT_EXCEEDED,
+                ).dump(),
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimitBackend(async_session_maker)
+    return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limit_backend = _create_backend()
@@ -0,0 +1,270 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.news import News
+from app.db.models.news_related import NewsRelated
+
+logger = logging.getLogger(__name__)
+
+# rows updated slightly out of order are read again on the next sync
+SYNC_OVERLAP_SECONDS = 5
+# the title counts as many times as the content
+TITLE_WEIGHT = 2
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+STOPWORDS = frozenset(
+    # indonesian
+    "yang dan di ke dari ini itu dengan untuk pada adalah dalam tidak akan juga oleh "  # noqa: SIM905
+    "atau sudah telah bisa ada karena saat para kata lebih kami kita mereka tersebut "
+    "namun hingga sebagai secara masih harus dapat bahwa serta agar setelah ketika "
+    # english
+    "the and for that with this from are was were has have had not but its they their "
+    "will would can could been into than then them also about after over more most".split()
+)
+
+Vector = dict[str, float]
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def term_counts(title: str, content: str) -> Counter[str]:
+    counts = Counter(tokenize(content))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+class TfidfIndex:
+    """Sparse TF-IDF vectors of the news, with an inverted index to find neighbours.
+
+    A vector keeps the ``max_terms`` heaviest terms of the news, weighted
+    ``(1 + log tf) * idf`` and L2 normalized, so the cosine similarity of two
+    news is the dot product of their vectors. Only the news sharing a term
+    are scored, and terms found in more than ``max_df`` of the news are
+    ignored when looking for neighbours.
+
+    The weights use the document frequencies known when the news was added,
+    ``build`` recomputes every vector with the current ones.
+    """
+
+    def __init__(self, max_terms: int, max_df: float):
+        self.max_terms = max_terms
+        self.max_df = max_df
+        self.terms: dict[UUID, frozenset[str]] = {}
+        self.df: Counter[str] = Counter()
+        self.vectors: dict[UUID, Vector] = {}
+        self.postings: defaultdict[str, set[UUID]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __contains__(self, news_id: UUID) -> bool:
+        return news_id in self.vectors
+
+    def idf(self, term: str) -> float:
+        # smoothed, as if an extra document contained every term once
+        return math.log((1 + len(self.terms)) / (1 + self.df[term])) + 1
+
+    def _vector(self, counts: Counter[str]) -> Vector:
+        weights = {term: (1 + math.log(tf)) * self.idf(term) for term, tf in counts.items()}
+        if len(weights) > self.max_terms:
+            weights = dict(heapq.nlargest(self.max_terms, weights.items(), key=lambda x: x[1]))
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def _index(self, news_id: UUID, vector: Vector) -> None:
+        self.vectors[news_id] = vector
+        for term in vector:
+            self.postings[term].add(news_id)
+
+    def _unindex(self, news_id: UUID) -> None:
+        for term in self.vectors.pop(news_id, {}):
+            postings = self.postings[term]
+            postings.discard(news_id)
+            if not postings:
+                del self.postings[term]
+
+    def add(self, news_id: UUID, counts: Counter[str]) -> None:
+        self.remove(news_id)
+        self.terms[news_id] = frozenset(counts)
+        self.df.update(self.terms[news_id])
+        self._index(news_id, self._vector(counts))
+
+    def remove(self, news_id: UUID) -> None:
+        terms = self.terms.pop(news_id, None)
+        if terms is not None:
+            self.df.subtract(terms)
+            self.df += Counter()
+        self._unindex(news_id)
+
+    def build(self, documents: Iterable[tuple[UUID, Counter[str]]]) -> None:
+        documents = list(documents)
+        self.terms = {news_id: frozenset(counts) for news_id, counts in documents}
+        self.df = Counter(term for terms in self.terms.values() for term in terms)
+        self.vectors = {}
+        self.postings = defaultdict(set)
+        for news_id, counts in documents:
+            self._index(news_id, self._vector(counts))
+
+    def neighbours(self, news_id: UUID, k: int) -> list[tuple[UUID, float]]:
+        """The ``k`` most similar news, with their cosine similarity."""
+        vector = self.vectors.get(news_id)
+        if not vector:
+            return []
+        # a term shared by two news is never too common, small indexes need them
+        max_postings = max(2, self.max_df * len(self.vectors))
+        scores: defaultdict[UUID, float] = defaultdict(float)
+        for term, weight in vector.items():
+            postings = self.postings[term]
+            if len(postings) > max_postings:
+                continue
+            for other_id in postings:
+                if other_id != news_id:
+                    scores[other_id] += weight * self.vectors[other_id][term]
+        return heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+
+
+def _timestamp(value: datetime.datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class RelatedNewsService:
+    """Keep the ``news_related`` table, the top-K related news of each news, up to date.
+
+    Runs in the job worker: the TF-IDF index lives in the memory of the
+    worker process, it is loaded from the ``news`` table on first use, kept in
+    sync incrementally with the news changed since the last sync, and rebuilt
+    from scratch every ``reload_interval`` seconds. When news change, the
+    lists of the changed news are computed again, with the lists holding them
+    and the lists of their new neighbours, the other lists are left untouched.
+
+    This is an approximation: the similarity is symmetric but the top-K is
+    not, a changed news entering the list of a news outside of its own top-K
+    is only seen when that list is computed again, or by ``rebuild``.
+
+    The jobs of the worker share the index, ``update`` and ``rebuild`` run one
+    at a time.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        top_k: int,
+        index: TfidfIndex,
+        reload_interval: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.top_k = top_k
+        self.index = index
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self.synced_at: float | None = None
+        self.reloaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Load the news changed since the last sync, or all news when due."""
+        now = self.clock()
+        full = self.synced_at is None or now - self.reloaded_at >= self.reload_interval
+        query = select(News.id, News.title, News.content)
+        if not full:
+            since = self.synced_at - SYNC_OVERLAP_SECONDS
+            query = query.where(
+                News.update_at >= datetime.datetime.fromtimestamp(since, datetime.timezone.utc)
+            )
+
+        rows = (await session.execute(query)).tuples()
+        documents = (
+            (news_id, term_counts(title, content)) for news_id, title, content in rows
+        )
+        if full:
+            self.index.build(documents)
+            self.reloaded_at = now
+        else:
+            for news_id, counts in documents:
+                self.index.add(news_id, counts)
+        self.synced_at = now
+
+    async def _write(self, session: AsyncSession, news_ids: set[UUID]) -> None:
+        if not news_ids:
+            return
+        await session.execute(delete(NewsRelated).where(NewsRelated.news_id.in_(news_ids)))
+        rows = [
+            {"news_id": news_id, "rank": rank, "related_id": related_id, "score": score}
+            for news_id in news_ids
+            for rank, (related_id, score) in enumerate(
+                self.index.neighbours(news_id, self.top_k)
+            )
+        ]
+        if rows:
+            await session.execute(NewsRelated.__table__.insert(), rows)
+
+    async def update(self, news_ids: Iterable[UUID]) -> None:
+        """Recompute the related news after the given news were created, edited or deleted."""
+        news_ids = set(news_ids)
+        async with self._lock, self.session_maker() as session:
+            existing = set(await session.scalars(select(News.id).where(News.id.in_(news_ids))))
+            await self.sync(session)
+            for news_id in news_ids - existing:
+                self.index.remove(news_id)
+
+            # the lists holding the changed news, and the news they are now related to
+            affected = set(
+                await session.scalars(
+                    select(NewsRelated.news_id).where(NewsRelated.related_id.in_(news_ids))
+                )
+            )
+            for news_id in existing:
+                affected.update(
+                    related_id for related_id, _ in self.index.neighbours(news_id, self.top_k)
+                )
+            affected = (affected | existing) - (news_ids - existing)
+
+            await session.execute(
+                delete(NewsRelated).where(
+                    or_(
+                        NewsRelated.news_id.in_(news_ids - existing),
+                        NewsRelated.related_id.in_(news_ids - existing),
+                    )
+                )
+            )
+            await self._write(session, affected & set(self.index.vectors))
+            await session.commit()
+
+    async def rebuild(self) -> int:
+        """Recompute the related news of every news, returns the number of news."""
+        async with self._lock, self.session_maker() as session:
+            self.synced_at = None
+            await self.sync(session)
+            await session.execute(delete(NewsRelated))
+            await self._write(session, set(self.index.vectors))
+            await session.commit()
+            return len(self.index)
+
+
+related_news = RelatedNewsService(
+    async_session_maker,
+    top_k=settings.RELATED_NEWS_SIZE,
+    index=TfidfIndex(
+        max_terms=settings.RELATED_NEWS_MAX_TERMS, max_df=settings.RELATED_NEWS_MAX_DF
+    ),
+    reload_interval=settings.RELATED_NEWS_RELOAD_SECONDS,
+)
@@ -0,0 +1,211 @@
+import datetime
+import hashlib
+import logging
+import math
+import time
+from typing import Any, Callable
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.revoked_token import RevokedToken
+from app.db.upsert import insert_for
+
+logger = logging.getLogger(__name__)
+
+# rows committed slightly out of order are read again on the next refresh
+REFRESH_OVERLAP_SECONDS = 5
+
+
+class BloomFilter:
+    """Set membership with false positives at ``error_rate`` and no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+def _timestamp(value: datetime.datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def _datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+def user_key(user_id: UUID | str) -> str:
+    return f"user:{user_id}"
+
+
+class RevocationList:
+    """Revoked tokens, checked in memory on every authenticated request.
+
+    The ``revoked_tokens`` table is the source of truth. Each worker keeps the
+    unexpired rows in a dict, fronted by a Bloom filter so the common case, a
+    token that is not revoked, is answered without a dict lookup on the
+    revoked ids. ``refresh`` runs periodically on every worker and reads the
+    new rows incrementally, the filter is rebuilt from scratch every
+    ``reload_interval`` seconds to forget the expired entries.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        capacity: int,
+        error_rate: float,
+        reload_interval: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_maker = session_maker
+        self.error_rate = error_rate
+        self.reload_interval = reload_interval
+        self.clock = clock
+        # key -> (revoked_at, expires_at) as unix time
+        self.revoked: dict[str, tuple[float, float]] = {}
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.last_seen: datetime.datetime | None = None
+        self.reloaded_at = 0.0
+
+    def _add(self, key: str, revoked_at: float, expires_at: float) -> None:
+        self.revoked[key] = (revoked_at, expires_at)
+        self.bloom.add(key)
+        if len(self.revoked) > self.bloom.capacity:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        now = self.clock()
+        self.revoked = {key: entry for key, entry in self.revoked.items() if entry[1] > now}
+        capacity = max(self.bloom.capacity, 2 * len(self.revoked))
+        self.bloom = BloomFilter(capacity, self.error_rate)
+        for key in self.revoked:
+            self.bloom.add(key)
+
+    def is_revoked(self, payload: dict[str, Any]) -> bool:
+        """Check the claims of a decoded token against the revoked ids and users."""
+        jti = payload.get("jti")
+        if jti is not None and jti in self.bloom and jti in self.revoked:
+            return True
+
+        key = user_key(payload.get("sub"))
+        if key in self.bloom:
+            entry = self.revoked.get(key)
+            if entry is not None and payload.get("iat", 0) <= entry[0]:
+                return True
+        return False
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        """Revoke a token until it expires.
+
+        Args:
+            jti (str): id of the token
+            expires_at (float): ``exp`` claim of the token
+
+        Returns:
+            bool: False when the token was already revoked
+        """
+        now = self.clock()
+        async with self.session_maker() as session:
+            statement = (
+                insert_for(session, RevokedToken)
+                .values(jti=jti, expires_at=_datetime(expires_at), revoked_at=_datetime(now))
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+                .returning(RevokedToken.jti)
+            )
+            inserted = (await session.execute(statement)).scalar_one_or_none()
+            await session.commit()
+        if inserted is not None or jti not in self.revoked:
+            self._add(jti, now, expires_at)
+        return inserted is not None
+
+    async def revoke_user(self, user_id: UUID | str, lifetime: float) -> None:
+        """Revoke every token issued to a user until now.
+
+        Args:
+            user_id (UUID | str): id of the user
+            lifetime (float): lifetime of the longest lived token, in seconds
+        """
+        now = self.clock()
+        key = user_key(user_id)
+        values = {"expires_at": _datetime(now + lifetime), "revoked_at": _datetime(now)}
+        async with self.session_maker() as session:
+            statement = insert_for(session, RevokedToken).values(jti=key, **values)
+            await session.execute(
+                statement.on_conflict_do_update(index_elements=[RevokedToken.jti], set_=values)
+            )
+            await session.commit()
+        self._add(key, now, now + lifetime)
+
+    async def refresh(self) -> None:
+        """Read the rows revoked since the last refresh, or all rows when due."""
+        now = self.clock()
+        query = select(RevokedToken).where(RevokedToken.expires_at > _datetime(now))
+        full = self.last_seen is None or now - self.reloaded_at >= self.reload_interval
+        if not full:
+            since = self.last_seen - datetime.timedelta(seconds=REFRESH_OVERLAP_SECONDS)
+            query = query.where(RevokedToken.revoked_at >= since)
+
+        async with self.session_maker() as session:
+            rows = (await session.scalars(query)).all()
+
+        if full:
+            self.revoked = {}
+            self.reloaded_at = now
+        for row in rows:
+            revoked_at = _timestamp(row.revoked_at)
+            self.revoked[row.jti] = (revoked_at, _timestamp(row.expires_at))
+            if self.last_seen is None or revoked_at > _timestamp(self.last_seen):
+                self.last_seen = _datetime(revoked_at)
+        if self.last_seen is None:
+            self.last_seen = _datetime(now)
+
+        if full:
+            self._rebuild()
+        else:
+            for row in rows:
+                self.bloom.add(row.jti)
+
+    async def prune(self) -> None:
+        """Delete the rows of expired tokens."""
+        async with self.session_maker() as session:
+            await session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= _datetime(self.clock()))
+            )
+            await session.commit()
+
+    async def start(self) -> None:
+        """Load the revoked tokens before serving the first request."""
+        try:
+            await self.refresh()
+        except Exception:
+            logger.exception("Failed to load the revocation list")
+
+
+revocation_list = RevocationList(
+    async_session_maker,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    reload_interval=settings.REVOCATION_RELOAD_SECONDS,
+)
@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Protocol
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.db.base import engine
+from app.utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+task_runs = metrics.counter(
+    "scheduler_task_runs_total", "Runs of the periodic tasks, by status (ok, error, skipped)"
+)
+task_duration = metrics.gauge(
+    "scheduler_task_last_duration_seconds", "Duration of the last run of the periodic tasks"
+)
+task_last_run = metrics.gauge(
+    "scheduler_task_last_run_timestamp_seconds",
+    "Unix time of the last run of each periodic task",
+)
+scheduler_leader = metrics.gauge(
+    "scheduler_leader", "1 when this worker is the leader running the leader tasks"
+)
+
+
+class LeaderLock(Protocol):
+    async def acquire(self) -> bool:
+        """Become or stay the leader, False when another process is the leader."""
+        ...
+
+    async def release(self) -> None: ...
+
+
+class AdvisoryLock:
+    """Leadership held with a Postgres session advisory lock.
+
+    The lock stays held by a dedicated connection between the runs, so the
+    leader keeps its role until its process, or the connection, dies and
+    Postgres releases the lock for the next worker asking for it. A single
+    lock covers every leader task of the scheduler, so a worker holds at
+    most one connection for it.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str = "leader"):
+        self.engine = engine
+        digest = hashlib.blake2b(f"scheduler:{name}".encode(), digest_size=8).digest()
+        self.key = int.from_bytes(digest, "big", signed=True)
+        self._connection: AsyncConnection | None = None
+
+    async def acquire(self) -> bool:
+        if self._connection is not None:
+            try:
+                await self._connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                logger.warning("Lost the connection holding the advisory lock %s", self.key)
+                await self._close()
+
+        connection = await self.engine.connect()
+        try:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await connection.scalar(select(func.pg_try_advisory_lock(self.key)))
+        except BaseException:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            with contextlib.suppress(Exception):
+                await connection.close()
+
+    async def release(self) -> None:
+        if self._connection is not None:
+            with contextlib.suppress(Exception):
+                await self._connection.execute(select(func.pg_advisory_unlock(self.key)))
+            await self._close()
+
+
+class FileLock:
+    """Leadership held with an exclusive ``flock``, for the workers of a single host."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    async def acquire(self) -> bool:
+        if fcntl is None:
+            return True
+        if self._file is not None:
+            return True
+        file = self.path.open("a")
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    async def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class PeriodicTask:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float
+    leader: bool
+
+
+class Scheduler:
+    """Run periodic tasks in the background of every worker.
+
+    Each run is delayed by ``interval`` seconds, shifted by up to ``jitter``
+    of the interval so the workers do not hit the database in step. A task
+    registered with ``leader=True`` runs on a single worker of the cluster,
+    the one holding the leader lock of the scheduler, the other workers skip
+    their runs.
+    Tasks keeping per-process state, like in-memory caches, use
+    ``leader=False`` and run on every worker.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        jitter: float,
+        lock_dir: str | None = None,
+    ):
+        self.engine = engine
+        self.jitter = jitter
+        self.lock_dir = Path(lock_dir or tempfile.gettempdir())
+        self.tasks: dict[str, PeriodicTask] = {}
+        self._loops: list[asyncio.Task] = []
+        self.lock: LeaderLock
+        if engine.dialect.name == "postgresql":
+            self.lock = AdvisoryLock(engine)
+        else:
+            self.lock = FileLock(self.lock_dir / "ora-news-scheduler.lock")
+
+    def periodic(self, interval: float, name: str | None = None, leader: bool = True):
+        """Register a coroutine function to run every ``interval`` seconds."""
+
+        def decorator(func: Callable[[], Awaitable[Any]]):
+            task_name = name or func.__name__
+            self.tasks[task_name] = PeriodicTask(task_name, func, interval, leader)
+            return func
+
+        return decorator
+
+    def delay(self, task: PeriodicTask) -> float:
+        return task.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run(self, task: PeriodicTask) -> bool:
+        """Run a task once, unless another worker is its leader."""
+        if task.leader:
+            try:
+                is_leader = await self.lock.acquire()
+            except Exception:
+                logger.exception("Failed to acquire the leader lock for %s", task.name)
+                is_leader = False
+            scheduler_leader.set(int(is_leader))
+            if not is_leader:
+                task_runs.inc(task=task.name, status="skipped")
+                return False
+
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            await task.func()
+        except Exception:
+            status = "error"
+            logger.exception("Periodic task %s failed", task.name)
+        finally:
+            task_duration.set(time.perf_counter() - start, task=task.name)
+            task_last_run.set(time.time(), task=task.name)
+            task_runs.inc(task=task.name, status=status)
+        return True
+
+    async def _loop(self, task: PeriodicTask) -> None:
+        while True:
+            await asyncio.sleep(self.delay(task))
+            await self.run(task)
+
+    def start(self) -> None:
+        if self._loops:
+            return
+        self._loops = [asyncio.create_task(self._loop(task)) for task in self.tasks.values()]
+
+    async def stop(self) -> None:
+        for loop in self._loops:
+            loop.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await loop
+        self._loops = []
+        await self.lock.release()
+
+
+scheduler = Scheduler(
+    engine,
+    jitter=settings.SCHEDULER_JITTER,
+    lock_dir=settings.SCHEDULER_LOCK_DIR,
+)
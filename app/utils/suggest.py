@@ -0,0 +1,348 @@
+import asyncio
+import bisect
+import datetime
+import heapq
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, replace
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Hashable, Iterable, Iterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.db.models.news import News
+from app.db.models.user import User
+from app.utils.pubsub import NewsEvent, news_hub
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+# a title is found from its first words, a query rarely starts further in
+MAX_WORDS = 6
+# longer keys cost memory without narrowing the matches
+MAX_KEY_LENGTH = 48
+
+# sorts after every key starting with a given prefix
+LAST_CHAR = "\U0010ffff"
+# queries up to this length are answered from the buckets, newest first
+BUCKET_LENGTH = 3
+
+NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip the accents and collapse the punctuation to single spaces."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _as_utc(value: datetime.datetime | None) -> datetime.datetime:
+    if value is None:
+        return EPOCH
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    id: UUID
+    title: str
+    author: str
+    published_at: datetime.datetime
+
+    @property
+    def stamp(self) -> float:
+        return self.published_at.timestamp()
+
+
+def title_keys(title: str) -> set[str]:
+    """The normalized title starting at each of its first ``MAX_WORDS`` words."""
+    words = normalize(title).split()
+    return {" ".join(words[i:])[:MAX_KEY_LENGTH] for i in range(min(len(words), MAX_WORDS))}
+
+
+class RecencyBuckets:
+    """The keys under each of their first ``BUCKET_LENGTH`` prefixes, the latest first.
+
+    A bucket holds ``(-stamp, value, key)`` tuples ordered by their first
+    item, so walking it yields the values of a prefix by recency without
+    sorting.
+    """
+
+    def __init__(self, buckets: dict[str, list[tuple[float, Any, str]]] | None = None):
+        self.buckets = buckets if buckets is not None else {}
+
+    @staticmethod
+    def _prefixes(key: str) -> Iterator[str]:
+        return (key[:length] for length in range(1, min(len(key), BUCKET_LENGTH) + 1))
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[str, float, Hashable]]) -> "RecencyBuckets":
+        buckets: dict[str, list[tuple[float, Any, str]]] = {}
+        for key, stamp, value in entries:
+            for prefix in cls._prefixes(key):
+                buckets.setdefault(prefix, []).append((-stamp, value, key))
+        for bucket in buckets.values():
+            bucket.sort(key=itemgetter(0))
+        return cls(buckets)
+
+    def add(self, key: str, stamp: float, value: Hashable) -> None:
+        for prefix in self._prefixes(key):
+            bucket = self.buckets.setdefault(prefix, [])
+            bisect.insort(bucket, (-stamp, value, key), key=itemgetter(0))
+
+    def remove(self, key: str, stamp: float, value: Hashable) -> None:
+        for prefix in self._prefixes(key):
+            bucket = self.buckets[prefix]
+            index = bisect.bisect_left(bucket, -stamp, key=itemgetter(0))
+            while bucket[index][1:] != (value, key):
+                index += 1
+            del bucket[index]
+            if not bucket:
+                del self.buckets[prefix]
+
+    def latest(self, prefix: str) -> Iterator[Any]:
+        """The values of the keys starting with ``prefix``, the latest first."""
+        bucket = self.buckets.get(prefix[:BUCKET_LENGTH], ())
+        if len(prefix) <= BUCKET_LENGTH:
+            return (value for _, value, _ in bucket)
+        return (value for _, value, key in bucket if key.startswith(prefix))
+
+
+class SuggestIndex:
+    """Prefix index over the titles and author usernames of the latest news.
+
+    The keys are kept in a sorted list, with the id and publication time of
+    their news in parallel lists, and in the ``RecencyBuckets`` of their
+    first characters. A query of up to ``BUCKET_LENGTH`` characters walks its
+    bucket, newest first, until ``limit`` news are found. A longer query is
+    two binary searches for the range of keys starting with it, sorted by
+    recency when the range has at most ``max_scan`` keys; a wider range is
+    walked through the bucket instead. Only the ``max_news`` latest news are
+    indexed, the oldest one is dropped when a news is added past the limit.
+
+    Every worker holds its own index: it is loaded at startup, kept current by
+    the news events of the hub and reloaded every ``SUGGEST_RELOAD_SECONDS``
+    to catch the changes no event was published for.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_news: int,
+        max_scan: int,
+    ):
+        self.session_maker = session_maker
+        self.max_news = max_news
+        self.max_scan = max_scan
+        self.news: dict[UUID, Suggestion] = {}
+        self.keys: list[str] = []
+        self.ids: list[UUID] = []
+        self.stamps: list[float] = []
+        self.recent = RecencyBuckets()
+        # (publication time, id) of the indexed news, oldest first
+        self.by_date: list[tuple[float, UUID]] = []
+        # username -> (number of indexed news, latest published_at)
+        self.authors: dict[str, tuple[int, float]] = {}
+        self.author_keys: list[str] = []
+        self.recent_authors = RecencyBuckets()
+        # events received while a reload reads the database, applied again after it
+        self._pending: list[NewsEvent] | None = None
+
+    def __len__(self) -> int:
+        return len(self.news)
+
+    def add(self, suggestion: Suggestion) -> None:
+        self.remove(suggestion.id)
+        stamp = suggestion.stamp
+        if len(self.news) >= self.max_news:
+            if not self.by_date or self.by_date[0][0] > stamp:
+                return
+            self.remove(self.by_date[0][1])
+
+        self.news[suggestion.id] = suggestion
+        bisect.insort(self.by_date, (stamp, suggestion.id))
+        for key in title_keys(suggestion.title):
+            index = bisect.bisect_right(self.keys, key)
+            self.keys.insert(index, key)
+            self.ids.insert(index, suggestion.id)
+            self.stamps.insert(index, stamp)
+            self.recent.add(key, stamp, suggestion.id)
+
+        author = suggestion.author
+        count, latest = self.authors.get(author, (0, stamp))
+        if not count:
+            bisect.insort(self.author_keys, author)
+        elif latest < stamp:
+            self.recent_authors.remove(author, latest, author)
+        if not count or latest < stamp:
+            self.recent_authors.add(author, stamp, author)
+        self.authors[author] = (count + 1, max(latest, stamp))
+
+    def remove(self, news_id: UUID) -> None:
+        suggestion = self.news.pop(news_id, None)
+        if suggestion is None:
+            return
+        index = bisect.bisect_left(self.by_date, (suggestion.stamp, news_id))
+        del self.by_date[index]
+        for key in title_keys(suggestion.title):
+            index = bisect.bisect_left(self.keys, key)
+            while self.ids[index] != news_id:
+                index += 1
+            del self.keys[index], self.ids[index], self.stamps[index]
+            self.recent.remove(key, suggestion.stamp, news_id)
+
+        author = suggestion.author
+        count, latest = self.authors.pop(author)
+        if count > 1:
+            self.authors[author] = (count - 1, latest)
+        else:
+            del self.author_keys[bisect.bisect_left(self.author_keys, author)]
+            self.recent_authors.remove(author, latest, author)
+
+    def _prepare(self, suggestions: Iterable[Suggestion]) -> dict[str, Any]:
+        suggestions = heapq.nlargest(self.max_news, suggestions, key=lambda x: x.published_at)
+        entries = sorted(
+            (
+                (key, item.id, item.stamp)
+                for item in suggestions
+                for key in title_keys(item.title)
+            ),
+            key=itemgetter(0),
+        )
+        authors: dict[str, tuple[int, float]] = {}
+        for item in suggestions:
+            count, latest = authors.get(item.author, (0, item.stamp))
+            authors[item.author] = (count + 1, max(latest, item.stamp))
+        return {
+            "news": {item.id: item for item in suggestions},
+            "keys": [entry[0] for entry in entries],
+            "ids": [entry[1] for entry in entries],
+            "stamps": [entry[2] for entry in entries],
+            "recent": RecencyBuckets.build(
+                (key, stamp, news_id) for key, news_id, stamp in entries
+            ),
+            "by_date": sorted((item.stamp, item.id) for item in suggestions),
+            "authors": authors,
+            "author_keys": sorted(authors),
+            "recent_authors": RecencyBuckets.build(
+                (author, latest, author) for author, (_, latest) in authors.items()
+            ),
+        }
+
+    def build(self, suggestions: Iterable[Suggestion]) -> None:
+        """Replace the whole index, keeping the ``max_news`` latest news."""
+        vars(self).update(self._prepare(suggestions))
+
+    def _range(self, keys: list[str], prefix: str) -> tuple[int, int] | None:
+        """The range of ``keys`` starting with ``prefix``, None past ``max_scan`` keys."""
+        if len(prefix) <= BUCKET_LENGTH:
+            return None
+        start = bisect.bisect_left(keys, prefix)
+        hi = min(len(keys), start + self.max_scan + 1)
+        end = bisect.bisect_left(keys, prefix + LAST_CHAR, start, hi)
+        return None if end - start > self.max_scan else (start, end)
+
+    def suggest(self, query: str, limit: int) -> list[Suggestion]:
+        """The latest news with a title word starting with ``query``."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        found: dict[UUID, Suggestion] = {}
+        span = self._range(self.keys, prefix)
+        if span is None:
+            ids: Iterable[UUID] = self.recent.latest(prefix)
+        else:
+            start, end = span
+            stamps = self.stamps[start:end]
+            order = sorted(range(len(stamps)), key=stamps.__getitem__, reverse=True)
+            ids = (self.ids[start + index] for index in order)
+        # a news matching through several of its keys is listed once
+        for news_id in ids:
+            if len(found) == limit:
+                break
+            found.setdefault(news_id, self.news[news_id])
+        return list(found.values())
+
+    def suggest_authors(self, query: str, limit: int) -> list[str]:
+        """The usernames starting with ``query``, the most recently published first."""
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+        span = self._range(self.author_keys, prefix)
+        if span is None:
+            return list(islice(self.recent_authors.latest(prefix), limit))
+        start, end = span
+        return heapq.nlargest(
+            limit, self.author_keys[start:end], key=lambda author: self.authors[author][1]
+        )
+
+    def _apply(self, event: NewsEvent) -> None:
+        news_id = UUID(event.news_id)
+        if event.type == "deleted":
+            self.remove(news_id)
+        elif event.type == "created":
+            published_at = datetime.datetime.fromisoformat(event.data["published_at"])
+            self.add(
+                Suggestion(
+                    news_id, event.data["title"], event.data["author"], _as_utc(published_at)
+                )
+            )
+        elif event.type == "updated" and "title" in event.data:
+            suggestion = self.news.get(news_id)
+            if suggestion is not None and suggestion.title != event.data["title"]:
+                self.add(replace(suggestion, title=event.data["title"]))
+
+    def on_event(self, event: NewsEvent) -> None:
+        if self._pending is not None:
+            self._pending.append(event)
+        self._apply(event)
+
+    async def reload(self) -> None:
+        """Build the index again from the latest news, in a thread."""
+        query = (
+            select(News.id, News.title, User.username, News.published_at)
+            .join(User, User.id == News.user_id)
+            .order_by(News.published_at.desc().nulls_last())
+            .limit(self.max_news)
+        )
+        self._pending = []
+        try:
+            async with self.session_maker() as session:
+                rows = (await session.execute(query)).tuples().all()
+            state = await asyncio.to_thread(
+                self._prepare,
+                (
+                    Suggestion(news_id, title, author, _as_utc(published_at))
+                    for news_id, title, author, published_at in rows
+                ),
+            )
+            vars(self).update(state)
+            for event in self._pending:
+                self._apply(event)
+        finally:
+            self._pending = None
+
+    async def start(self) -> None:
+        """Load the index before serving the first request."""
+        try:
+            await self.reload()
+        except Exception:
+            logger.exception("Failed to load the suggest index")
+
+
+suggest_index = SuggestIndex(
+    async_session_maker,
+    max_news=settings.SUGGEST_MAX_NEWS,
+    max_scan=settings.SUGGEST_MAX_SCAN,
+)
+news_hub.add_listener(suggest_index.on_event)
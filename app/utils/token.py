@@ -1,3 +1,6 @@
+import hashlib
+import time
+import uuid
 from typing import Any, ClassVar
 
 import jwt
@@ -6,8 +9,13 @@ from pydantic import SecretStr
 from app.core.config import get_settings
 from app.db.models.user import User
 from app.utils import exceptions
+from app.utils.cache import LRUCache
 from app.utils.common import ErrorCode
 from app.utils.jwt import create_jwt_token, decode_jwt_token
+from app.utils.revocation import revocation_list
+
+# payload of the access tokens verified recently, by sha256 of the token
+access_token_cache: LRUCache[str, dict] = LRUCache(get_settings().ACCESS_TOKEN_CACHE_SIZE)
 
 
 class TokenManager:
@@ -42,6 +50,11 @@ class TokenManager:
         playload = {"sub": sub, "aud": aud, **other_payload}
         return create_jwt_token(playload, secret, lifetime)
 
+    @staticmethod
+    def _session_claims() -> dict:
+        # iat with milliseconds, compared with the time a user's tokens were revoked
+        return {"jti": uuid.uuid4().hex, "iat": round(time.time(), 3)}
+
     def create_access_token(self, user: User) -> str:
         """Create an access token for the user."""
         return self._write_token(
@@ -49,15 +62,17 @@ class TokenManager:
             aud=self.JWT_AUDIENCE,
             secret=self.JWT_SECRET_KEY,
             lifetime=self.JWT_LIFETIME_SECONDS,
+            other_payload=self._session_claims(),
         )
 
-    def create_refresh_token(self, access_token: str) -> str:
+    def create_refresh_token(self, user: User) -> str:
         """Create a refresh token for the user."""
         return self._write_token(
-            sub=access_token,
+            sub=str(user.id),
             aud=self.REFRESH_AUDIENCE,
             secret=self.REFRESH_SECRET_KEY,
             lifetime=self.REFRESH_LIFETIME_SECONDS,
+            other_payload=self._session_claims(),
         )
 
     def create_forget_password_token(self, user: User) -> str:
@@ -105,3 +120,42 @@ class TokenManager:
             raise exceptions.InvalidVerifyTokenError(
                 "Invalid verify token", error_code=ErrorCode.INVALID_TOKEN
             ) from e
+
+    def decode_access_token(self, token: str) -> dict:
+        """Decode an access token, using the payloads of the tokens verified recently.
+
+        A cached payload is kept until the token expires, and at most
+        ``ACCESS_TOKEN_CACHE_TTL_SECONDS``.
+        """
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        payload = access_token_cache.get(digest)
+        if payload is not None:
+            return payload
+
+        payload = self.decode_token(token, self.JWT_SECRET_KEY, [self.JWT_AUDIENCE])
+        expires_at = time.time() + get_settings().ACCESS_TOKEN_CACHE_TTL_SECONDS
+        if "exp" in payload:
+            expires_at = min(expires_at, payload["exp"])
+        access_token_cache.set(digest, payload, expires_at=expires_at)
+        return payload
+
+    async def consume_refresh_token(self, token: str) -> dict:
+        """Decode a refresh token and revoke it, a refresh token is valid only once.
+
+        Raises:
+            exceptions.InvalidVerifyTokenError: the token is invalid, expired or used
+
+        Returns:
+            dict: payload of the refresh token
+        """
+        payload = self.decode_token(token, self.REFRESH_SECRET_KEY, [self.REFRESH_AUDIENCE])
+        jti = payload.get("jti")
+        if (
+            jti is None
+            or revocation_list.is_revoked(payload)
+            or not await revocation_list.revoke(jti, payload["exp"])
+        ):
+            raise exceptions.InvalidVerifyTokenError(
+                "Refresh token already used", error_code=ErrorCode.INVALID_TOKEN
+            )
+        return payload
@@ -1,12 +1,10 @@
 import re
 
-from email_validator import EmailNotValidError
-from email_validator import validate_email as validate_email_
 from fastapi import HTTPException, UploadFile, status
 
-from app.core.config import get_settings
 from app.utils import exceptions
 from app.utils.common import ErrorCode
+from app.utils.email_validation import email_validation
 
 USERNAME_REGEX = re.compile(r"^[a-z][a-z0-9_-]{2,19}$")
 
@@ -26,14 +24,8 @@ def validate_username(username: str, user):
     return username
 
 
-def validate_email(email: str, user):
-    try:
-        validate_email_(email, test_environment=get_settings().DEBUG_MODE)
-    except EmailNotValidError as e:
-        raise exceptions.ValidationError(
-            "Invalid email address", error_code=ErrorCode.INVALID_EMAIL
-        ) from e
-    return email
+async def validate_email(email: str, user):
+    return await email_validation.validate(email)
 
 
 def validate_password(password: str, user):
@@ -0,0 +1,182 @@
+import datetime
+import logging
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import async_session_maker, replica_router
+from app.db.models.news_view import NewsView, NewsViewBucket
+from app.db.upsert import insert_for
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHUNK_SIZE = 500
+
+
+def current_bucket() -> datetime.datetime:
+    """Start of the current hour in UTC, without timezone like ``NewsViewBucket.bucket``."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+class ViewCounter:
+    """Aggregate news views in memory and write them to the database in batches.
+
+    A view only increments an in-memory counter, the totals are flushed with a
+    few multi-row upserts instead of one ``UPDATE`` per view.
+    """
+
+    def __init__(self):
+        self.pending: Counter[tuple[UUID, datetime.datetime]] = Counter()
+
+    def hit(self, news_id: UUID) -> None:
+        self.pending[(news_id, current_bucket())] += 1
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write the pending views and commit.
+
+        Args:
+            session (AsyncSession): session to write with
+
+        Returns:
+            int: number of views written
+        """
+        pending, self.pending = self.pending, Counter()
+        if not pending:
+            return 0
+
+        totals: Counter[UUID] = Counter()
+        for (news_id, _), hits in pending.items():
+            totals[news_id] += hits
+
+        try:
+            bucket_rows = [
+                {"news_id": news_id, "bucket": bucket, "hits": hits}
+                for (news_id, bucket), hits in pending.items()
+            ]
+            total_rows = [
+                {"news_id": news_id, "view_count": hits} for news_id, hits in totals.items()
+            ]
+            for start in range(0, len(bucket_rows), FLUSH_CHUNK_SIZE):
+                statement = insert_for(session, NewsViewBucket).values(
+                    bucket_rows[start : start + FLUSH_CHUNK_SIZE]
+                )
+                await session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[NewsViewBucket.news_id, NewsViewBucket.bucket],
+                        set_={"hits": NewsViewBucket.hits + statement.excluded.hits},
+                    )
+                )
+            for start in range(0, len(total_rows), FLUSH_CHUNK_SIZE):
+                statement = insert_for(session, NewsView).values(
+                    total_rows[start : start + FLUSH_CHUNK_SIZE]
+                )
+                await session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[NewsView.news_id],
+                        set_={
+                            "view_count": NewsView.view_count + statement.excluded.view_count
+                        },
+                    )
+                )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            # keep the views for the next flush
+            self.pending.update(pending)
+            raise
+        return sum(totals.values())
+
+
+class TrendingRanking:
+    """Precomputed trending and most read news.
+
+    The trending score of a news is the sum of its hourly views, each one
+    decayed by ``0.5 ** (age_hours / half_life_hours)``.
+    """
+
+    def __init__(self, window_hours: int, half_life_hours: float, size: int):
+        self.window_hours = window_hours
+        self.half_life_hours = half_life_hours
+        self.size = size
+        self.trending: list[UUID] = []
+        self.most_read: list[UUID] = []
+        self.refreshed_at: datetime.datetime | None = None
+
+    def _score(self):
+        now = current_bucket()
+        weights = {
+            now - datetime.timedelta(hours=age): 0.5 ** (age / self.half_life_hours)
+            for age in range(self.window_hours)
+        }
+        decay = case(weights, value=NewsViewBucket.bucket, else_=0)
+        return func.sum(NewsViewBucket.hits * decay)
+
+    async def refresh(self, session: AsyncSession) -> None:
+        since = current_bucket() - datetime.timedelta(hours=self.window_hours - 1)
+        score = self._score().label("score")
+        trending = await session.execute(
+            select(NewsViewBucket.news_id, score)
+            .where(NewsViewBucket.bucket >= since)
+            .group_by(NewsViewBucket.news_id)
+            .order_by(score.desc())
+            .limit(self.size)
+        )
+        most_read = await session.scalars(
+            select(NewsView.news_id).order_by(NewsView.view_count.desc()).limit(self.size)
+        )
+        self.trending = [news_id for news_id, _ in trending]
+        self.most_read = list(most_read)
+        self.refreshed_at = datetime.datetime.now(datetime.timezone.utc)
+
+    async def prune(self, session: AsyncSession) -> None:
+        """Delete hourly buckets that left the ranking window."""
+        since = current_bucket() - datetime.timedelta(hours=self.window_hours - 1)
+        await session.execute(delete(NewsViewBucket).where(NewsViewBucket.bucket < since))
+        await session.commit()
+
+
+class ViewTracker:
+    """Views counted in memory by each worker, and the ranking they feed.
+
+    ``flush`` and ``refresh`` run periodically on every worker, ``prune`` on
+    a single one, see ``app/tasks.py``.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ranking: TrendingRanking,
+    ):
+        self.session_maker = session_maker
+        self.counter = ViewCounter()
+        self.ranking = ranking
+
+    def hit(self, news_id: UUID) -> None:
+        self.counter.hit(news_id)
+
+    async def flush(self) -> None:
+        async with self.session_maker() as session:
+            await self.counter.flush(session)
+
+    async def refresh(self) -> None:
+        read_session_maker = await replica_router.get_session_maker()
+        async with read_session_maker() as session:
+            await self.ranking.refresh(session)
+
+    async def prune(self) -> None:
+        async with self.session_maker() as session:
+            await self.ranking.prune(session)
+
+
+view_tracker = ViewTracker(
+    async_session_maker,
+    ranking=TrendingRanking(
+        window_hours=settings.TRENDING_WINDOW_HOURS,
+        half_life_hours=settings.TRENDING_HALF_LIFE_HOURS,
+        size=settings.TRENDING_SIZE,
+    ),
+)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Step = Callable[[Any], Awaitable[None]]
+
+step_duration = metrics.gauge(
+    "warmup_step_duration_seconds", "Duration of each step of the startup warm-up"
+)
+warmup_ready = metrics.gauge(
+    "warmup_ready", "1 once the startup warm-up of the worker is done"
+)
+
+
+class WarmUp:
+    """Steps run at startup, so the first requests of a worker are not the slow ones.
+
+    Each step gets the application and runs once, in the order of
+    registration. A failing step is logged and skipped, the worker still
+    starts cold rather than not at all. ``ready`` is set once every step ran.
+    """
+
+    def __init__(self):
+        self.steps: dict[str, Step] = {}
+        self.durations: dict[str, float] = {}
+        self.failed: list[str] = []
+        self.ready = False
+        self._task: asyncio.Task | None = None
+        warmup_ready.set(0)
+
+    def step(self, name: str) -> Callable[[Step], Step]:
+        """Register a warm-up step."""
+
+        def decorator(func: Step) -> Step:
+            self.steps[name] = func
+            return func
+
+        return decorator
+
+    async def run(self, app: Any) -> None:
+        started = time.perf_counter()
+        for name, func in self.steps.items():
+            step_started = time.perf_counter()
+            try:
+                await func(app)
+            except Exception:
+                logger.exception("Warm-up step %s failed", name)
+                self.failed.append(name)
+            self.durations[name] = time.perf_counter() - step_started
+            step_duration.set(self.durations[name], step=name)
+        self.ready = True
+        warmup_ready.set(1)
+        logger.info("Warm-up done in %.3f seconds", time.perf_counter() - started)
+
+    async def start(self, app: Any, timeout: float) -> None:
+        """Run the steps, waiting at most ``timeout`` seconds before serving.
+
+        Past the timeout the steps go on in the background, the worker serves
+        the requests and reports itself as not ready yet.
+        """
+        self._task = asyncio.create_task(self.run(app))
+        done, _ = await asyncio.wait({self._task}, timeout=timeout)
+        if not done:
+            logger.warning("Warm-up still running after %s seconds, serving anyway", timeout)
+
+    def skip(self) -> None:
+        """Mark the worker ready without warming it up."""
+        self.ready = True
+        warmup_ready.set(1)
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "seconds": round(sum(self.durations.values()), 4),
+            "steps": {name: round(value, 4) for name, value in self.durations.items()},
+            "failed": self.failed,
+        }
+
+
+warmup = WarmUp()
@@ -0,0 +1,152 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.base import engine, replica_router
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# the readiness looks at the lag of the last seconds only
+RECENT_SECONDS = 10
+# stacks of the latest blocking calls kept for the logs and the tests
+MAX_BLOCKS = 20
+
+loop_lag = metrics.histogram(
+    "event_loop_lag_seconds", "Delay of the event loop in running a due callback", LAG_BUCKETS
+)
+loop_blocks = metrics.counter(
+    "event_loop_blocked_total", "Times a callback blocked the event loop past the threshold"
+)
+db_connections_in_use = metrics.gauge(
+    "db_connections_in_use", "Database connections checked out by the worker"
+)
+
+
+@dataclass
+class Block:
+    """A callback caught blocking the event loop, with the stack it was blocked in."""
+
+    started_at: float
+    stack: str
+    seconds: float = 0.0
+
+
+class LoopWatchdog:
+    """Measure the lag of the event loop and catch the callbacks blocking it.
+
+    A task of the loop sleeps ``interval`` seconds at a time, and records how
+    late it woke up as the lag. A monitor thread checks that task beats: when
+    it did not for ``threshold`` seconds, a callback is blocking the loop and
+    the thread logs the stack of the loop thread, pointing at the blocking
+    code, once per block.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        threshold: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.clock = clock
+        self.beat = clock()
+        self.recent: collections.deque[float] = collections.deque(
+            maxlen=max(1, int(RECENT_SECONDS / interval))
+        )
+        self.blocks: collections.deque[Block] = collections.deque(maxlen=MAX_BLOCKS)
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def lag(self) -> float:
+        """The largest lag of the last ``RECENT_SECONDS`` seconds."""
+        return max(self.recent, default=0.0)
+
+    async def _tick(self) -> None:
+        while True:
+            self.beat = self.clock()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, self.clock() - self.beat - self.interval)
+            self.recent.append(lag)
+            loop_lag.observe(lag)
+            if self.blocks and self.blocks[-1].started_at == self.beat:
+                self.blocks[-1].seconds = lag + self.interval
+                logger.warning("Event loop unblocked after %.3f seconds", lag + self.interval)
+
+    def _monitor(self) -> None:
+        while not self._stopped.wait(self.interval / 2):
+            beat = self.beat
+            late = self.clock() - beat - self.interval
+            if late < self.threshold or (self.blocks and self.blocks[-1].started_at == beat):
+                continue
+            # the only way to read the stack of another thread
+            frame = sys._current_frames().get(self._loop_thread)  # noqa: SLF001
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.blocks.append(Block(beat, stack))
+            loop_blocks.inc()
+            logger.warning(
+                "Event loop blocked for more than %.3f seconds, in:\n%s", self.threshold, stack
+            )
+
+    def start(self) -> None:
+        """Start measuring, from the thread running the event loop."""
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._thread = threading.Thread(
+            target=self._monitor, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+
+class ConnectionUsage:
+    """Number of database connections checked out, over every tracked engine."""
+
+    def __init__(self):
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    def _change(self, delta: int) -> None:
+        with self._lock:
+            self.in_use += delta
+            db_connections_in_use.set(self.in_use)
+
+    def track(self, async_engine: AsyncEngine) -> None:
+        event.listen(async_engine.sync_engine, "checkout", lambda *_: self._change(1))
+        event.listen(async_engine.sync_engine, "checkin", lambda *_: self._change(-1))
+
+
+loop_watchdog = LoopWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL_SECONDS,
+    threshold=settings.LOOP_WATCHDOG_BLOCK_SECONDS,
+)
+
+db_connections = ConnectionUsage()
+for tracked in (engine, *(node.engine for node in replica_router.nodes)):
+    db_connections.track(tracked)
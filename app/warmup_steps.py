@@ -0,0 +1,67 @@
+"""Startup warm-up steps.
+
+They run from the lifespan of the web application before the worker serves,
+see ``app.utils.warmup``. Each step pays a cost the first requests would
+pay otherwise.
+"""
+
+from uuid import UUID
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.base import async_session_maker, engine, replica_router
+from app.templates.renderer import email_renderer
+from app.utils.dedupe import duplicate_detector
+from app.utils.news_cache import news_cache
+from app.utils.warmup import warmup
+
+# read only endpoints answered by the most requests, all served by the application itself
+HOT_PATHS = (
+    "/news?per_page=1",
+    "/news/count",
+    "/category",
+    "/category/counts",
+)
+
+
+@warmup.step("database")
+async def connect_database(app):
+    """Open the first connection, the dialect reads the server settings on it."""
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    await replica_router.check_all()
+
+
+@warmup.step("templates")
+async def load_templates(app):
+    email_renderer.load()
+
+
+@warmup.step("requests")
+async def request_hot_paths(app):
+    """Compile the hot queries and build the serializers of their responses.
+
+    The requests go through the routing, the dependencies and the response
+    models like the ones of the clients, without leaving the process.
+    """
+    transport = httpx.ASGITransport(app)
+    base_url = f"http://warmup/api/{settings.API_V1_STR}"
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+        responses = [await client.get(path) for path in HOT_PATHS]
+    for response in responses:
+        response.raise_for_status()
+
+    # the detail is read through the cache, which keeps it
+    items = responses[0].json()["items"]
+    if items:
+        await news_cache.get(UUID(items[0]["id"]))
+
+
+@warmup.step("duplicate_index")
+async def load_duplicate_index(app):
+    if settings.NEWS_DEDUPE_MODE == "off":
+        return
+    async with async_session_maker() as session:
+        await duplicate_detector.sync(session)
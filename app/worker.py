@@ -0,0 +1,30 @@
+# HOW TO RUN, IN ROOT FOLDER RUN TERMINAL
+# python3 -m app.worker
+# or
+# python3 -m app.worker --concurrency 8
+
+import logging
+
+from app import tasks  # noqa: F401, register the job handlers
+from app.core.config import settings
+from app.db.models import load_all_models
+from app.utils.jobs import Worker, job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def main(concurrency: int = settings.JOB_WORKER_CONCURRENCY):
+    """Run the queued jobs until SIGINT or SIGTERM."""
+    load_all_models()
+    worker = Worker(job_queue, concurrency, settings.JOB_POLL_INTERVAL_SECONDS)
+    worker.install_signal_handlers()
+    logger.info("Worker started, concurrency %s", concurrency)
+    await worker.run()
+    logger.info("Worker stopped")
+
+
+if __name__ == "__main__":
+    import fire
+
+    logging.basicConfig(level=logging.INFO)
+    fire.Fire(main)
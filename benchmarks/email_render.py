@@ -0,0 +1,50 @@
+"""Time the rendering of one email, before and after the precompiled renderer.
+
+Run from the repository root:
+
+    python -m benchmarks.email_render [--number 2000]
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+from fastapi.templating import Jinja2Templates
+from starlette.requests import Request
+
+from app.templates.renderer import EmailRenderer
+
+USER = SimpleNamespace(name="Budi")
+URL = "https://example.com/api/v1/auth/verify?token=" + "x" * 200
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    number = parser.parse_args().number
+
+    templates = Jinja2Templates(directory="app/templates")
+    request = Request({"type": "http", "method": "POST", "path": "/", "headers": []})
+    renderer = EmailRenderer()
+    renderer.load()
+
+    def template_response():
+        templates.TemplateResponse(
+            name="email/verification_email.html",
+            context={"request": request, "user": USER, "verification_url": URL},
+        ).body.decode("utf-8")
+
+    def email_renderer():
+        renderer.render("email/verification_email.html", user=USER, verification_url=URL)
+
+    for name, func in (
+        ("TemplateResponse", template_response),
+        ("EmailRenderer", email_renderer),
+    ):
+        func()
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<18} {best * 1e6:8.1f} us/email")
+
+
+if __name__ == "__main__":
+    main()
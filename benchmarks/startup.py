@@ -0,0 +1,106 @@
+"""Time the cold start of the application: import, lifespan startup and first request.
+
+Run from the repository root:
+
+    python -m benchmarks.startup [--runs 5] [--json]
+
+Every run happens in a fresh interpreter so nothing is imported yet. The
+settings come from the environment or ``.env``, an unreachable database only
+logs errors at startup and does not stop the measure.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# integrations which must not be imported before they are used
+LAZY_MODULES = ("cloudinary", "fastapi_mail")
+
+DEFAULT_ENV = {
+    "PROJECT_NAME": "benchmark",
+    "JWT_SECRET_KEY": "benchmark-jwt-secret-key-0123456789",
+    "RESET_PASSWORD_SECRET_KEY": "benchmark-reset-secret-key-0123456789",
+    "VERIFICATION_SECRET_KEY": "benchmark-verification-secret-key-0123",
+    "DB_DRIVER": "postgresql+asyncpg",
+    "DB_SERVER": "127.0.0.1",
+    "DB_PORT": "9",
+    "DB_DATABASE": "benchmark",
+}
+
+
+def measure() -> dict:
+    start = time.perf_counter()
+    import main
+
+    imported = time.perf_counter()
+    lazy_loaded = [name for name in LAZY_MODULES if name in sys.modules]
+
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+
+    client = TestClient(main.app)
+    before_startup = time.perf_counter()
+    with client:
+        started = time.perf_counter()
+        response = client.get(f"/api/{settings.API_V1_STR}/docs")
+        first_request = time.perf_counter()
+
+    return {
+        "import": imported - start,
+        "startup": started - before_startup,
+        "first_request": first_request - started,
+        "status_code": response.status_code,
+        "lazy_loaded": lazy_loaded,
+    }
+
+
+def run(runs: int) -> dict:
+    env = {**DEFAULT_ENV, **os.environ}
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    summary = {
+        key: statistics.median(result[key] for result in results)
+        for key in ("import", "startup", "first_request")
+    }
+    summary["total"] = summary["import"] + summary["startup"] + summary["first_request"]
+    summary["status_code"] = results[-1]["status_code"]
+    summary["lazy_loaded"] = sorted({name for r in results for name in r["lazy_loaded"]})
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure()))
+        return
+
+    summary = run(args.runs)
+    if args.json:
+        print(json.dumps(summary))
+        return
+    for key in ("import", "startup", "first_request", "total"):
+        print(f"{key:<14} {summary[key] * 1000:8.1f} ms")
+    print(f"lazy modules imported at startup: {', '.join(summary['lazy_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
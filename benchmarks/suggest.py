@@ -0,0 +1,78 @@
+"""Time the title autocomplete against the ``ILIKE`` search it replaces.
+
+Run from the repository root:
+
+    python -m benchmarks.suggest [--news 50000] [--number 2000]
+
+The index is filled with generated titles, no database is needed. The
+``ILIKE`` side is approximated by a substring scan of the same titles in
+Python, a lower bound of the work the database does for every keystroke.
+"""
+
+import argparse
+import datetime
+import functools
+import os
+import random
+import timeit
+import uuid
+
+from benchmarks.startup import DEFAULT_ENV
+
+for name, value in DEFAULT_ENV.items():
+    os.environ.setdefault(name, value)
+
+from app.utils.suggest import SuggestIndex, Suggestion  # noqa: E402
+
+WORDS = [
+    "banjir", "jakarta", "timnas", "menang", "harga", "beras", "naik", "pemilu",
+    "presiden", "gempa", "bumi", "sekolah", "kereta", "cepat", "bandung", "pasar",
+    "saham", "rupiah", "menguat", "hujan", "deras",
+]  # fmt: skip
+QUERIES = ("b", "ba", "banj", "harga be", "kereta cepat", "zzz")
+
+
+def generate(count: int) -> list[Suggestion]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        Suggestion(
+            id=uuid.uuid4(),
+            title=" ".join(random.choices(WORDS, k=random.randint(4, 10))).title(),
+            author=f"author{random.randrange(count // 20 + 1)}",
+            published_at=now - datetime.timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def substring_scan(titles: list[str], query: str) -> list[str]:
+    return [title for title in titles if query in title]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--news", type=int, default=50_000)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    suggestions = generate(args.news)
+    index = SuggestIndex(None, max_news=args.news, max_scan=500)
+    build = timeit.timeit(lambda: index.build(suggestions), number=1)
+    print(f"build: {build * 1e3:.0f} ms for {len(index)} news, {len(index.keys)} keys")
+
+    titles = [item.title.lower() for item in suggestions]
+    print(f"{'query':<14} {'suggest':>12} {'substring scan':>16}")
+    for query in QUERIES:
+        suggest = min(
+            timeit.repeat(
+                functools.partial(index.suggest, query, 10), number=args.number, repeat=3
+            )
+        )
+        scan = min(timeit.repeat(functools.partial(substring_scan, titles, query), number=10))
+        print(
+            f"{query!r:<14} {suggest / args.number * 1e6:9.1f} us {scan / 10 * 1e6:13.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Measure the throughput of ``python -m app.server`` for several worker counts.
+
+Run from the repository root:
+
+    python -m benchmarks.throughput [--workers 1,2,4] [--duration 10] [--clients 2]
+
+For every worker count the server is started on its own port, loaded by
+``--clients`` client processes keeping ``--concurrency`` keep-alive requests
+in flight each, then stopped with SIGTERM. The client processes share the
+machine with the server, give them spare cores or run them from another
+host for numbers that reflect the server only.
+
+No result is recorded here yet. The only host run so far had a single
+core shared by the server and the clients, which measures neither the
+scaling across workers nor the cost per core. Record a run from a
+multi-core host, with the clients on other cores or another host. Until
+then the ``SERVER_WORKERS=0`` default, one worker per core, is the usual
+starting point for pre-forked servers, not a measured optimum.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.startup import DEFAULT_ENV
+
+
+def wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise TimeoutError(f"{url} did not answer in {timeout} seconds")
+
+
+async def _load(url: str, concurrency: int, duration: float) -> tuple[int, int]:
+    done = errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+
+        async def worker():
+            nonlocal done, errors
+            while time.monotonic() < deadline:
+                try:
+                    response = await client.get(url)
+                    done += 1
+                    errors += response.status_code >= 500
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done, errors
+
+
+def load(args: tuple[str, int, float]) -> tuple[int, int]:
+    return asyncio.run(_load(*args))
+
+
+def measure(workers: int, port: int, args: argparse.Namespace) -> tuple[float, int]:
+    env = {
+        **DEFAULT_ENV,
+        **os.environ,
+        "DEBUG_MODE": "false",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+        "SERVER_ACCESS_LOG": "false",
+    }
+    url = f"http://127.0.0.1:{port}{args.path}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(url)
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            results = pool.map(load, [(url, args.concurrency, args.duration)] * args.clients)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    done = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    return done / args.duration, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--path", default="/api/v1/docs")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    counts = sorted({int(count) for count in args.workers.split(",")})
+    print(f"cpu count: {os.cpu_count()}, path: {args.path}")
+    print(f"{'workers':>8} {'req/s':>10} {'per worker':>11} {'errors':>7}")
+    for index, workers in enumerate(counts):
+        rps, errors = measure(workers, args.port + index, args)
+        print(f"{workers:>8} {rps:>10.0f} {rps / workers:>11.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
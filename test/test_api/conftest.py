@@ -0,0 +1,61 @@
+import uuid
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from app.api.dependencies.authentication import get_current_active_user
+from app.api.dependencies.sessions import get_async_read_session, get_async_session
+from app.db.models.category import Category
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.main import app
+from app.utils.jobs import job_queue
+from test.conftest import test_async_session_maker
+
+
+async def _test_session():
+    async with test_async_session_maker() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="function")
+async def user(setup_db) -> User:
+    name = f"user{uuid.uuid4().hex[:8]}"
+    user = User(username=name, email=f"{name}@mail.test", hashed_password="x", name=name)
+    async with test_async_session_maker() as session:
+        session.add(user)
+        await session.commit()
+    return user
+
+
+@pytest_asyncio.fixture(scope="function")
+async def category(setup_db) -> Category:
+    category = Category(id=uuid.uuid4(), name=f"category {uuid.uuid4().hex[:8]}")
+    async with test_async_session_maker() as session:
+        session.add(category)
+        await session.commit()
+    return category
+
+
+@pytest_asyncio.fixture(scope="function")
+async def client(user, monkeypatch) -> AsyncGenerator[AsyncClient, None]:
+    """Client of the app on the test database, authenticated as ``user``."""
+    monkeypatch.setattr(job_queue, "session_maker", test_async_session_maker)
+    # the jobs are kept in the table, not run
+    monkeypatch.setattr(job_queue, "inline", False)
+    app.dependency_overrides[get_async_session] = _test_session
+    app.dependency_overrides[get_async_read_session] = _test_session
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport,
+        base_url="http://test/api/v1",
+        headers={"Authorization": "Bearer test"},
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+    async with test_async_session_maker() as session:
+        await session.execute(delete(Job))
+        await session.commit()
@@ -0,0 +1,51 @@
+from sqlalchemy import select
+
+from app import tasks
+from app.db.models.job import Job
+from app.utils.jobs import job_queue
+from app.utils.mail import EmailService
+from test.conftest import test_async_session_maker
+
+
+async def test_verification_email_is_queued_without_the_token(client, user, monkeypatch):
+    monkeypatch.setattr(tasks, "async_session_maker", test_async_session_maker)
+    sent = []
+
+    async def send_email(self, subject, email_to, body):
+        sent.append((subject, email_to, body))
+
+    monkeypatch.setattr(EmailService, "send_email", send_email)
+
+    response = await client.post("/auth/request-token", json={"email": user.email})
+    assert response.status_code == 202
+
+    async with test_async_session_maker() as session:
+        (job,) = (await session.scalars(select(Job))).all()
+    assert job.payload == {
+        "kind": "verification",
+        "user_id": str(user.id),
+        "base_url": "http://test/",
+    }
+
+    await job_queue.run_inline(job.name, job.payload)
+    ((subject, email_to, body),) = sent
+    assert (subject, email_to) == ("Email Verification", user.email)
+    assert "http://test/api/v1/auth/verify?token=" in body
+
+
+async def test_emails_run_inline_without_a_worker(client, user, monkeypatch):
+    monkeypatch.setattr(job_queue, "inline", True)
+    monkeypatch.setattr(tasks, "async_session_maker", test_async_session_maker)
+    sent = []
+
+    async def send_email(self, subject, email_to, body):
+        sent.append(email_to)
+
+    monkeypatch.setattr(EmailService, "send_email", send_email)
+
+    response = await client.post("/auth/request-token", json={"email": user.email})
+
+    assert response.status_code == 202
+    # the background tasks ran before the response was sent
+    assert sent == [user.email]
+    assert await job_queue.pending() == 0
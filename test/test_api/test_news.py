@@ -0,0 +1,49 @@
+import datetime
+import uuid
+
+from app.core.config import settings
+from app.db.models.news import News
+from test.conftest import test_async_session_maker
+
+
+async def _add_news(user, category, count: int) -> list[uuid.UUID]:
+    news_list = [
+        News(
+            title=f"title {index}",
+            content="content",
+            category_id=category.id,
+            user_id=user.id,
+            published_at=datetime.datetime.now(),
+        )
+        for index in range(count)
+    ]
+    async with test_async_session_maker() as session:
+        session.add_all(news_list)
+        await session.commit()
+    return [news.id for news in news_list]
+
+
+async def test_news_batch_keeps_order_and_reports_missing(client, user, category):
+    first, second = await _add_news(user, category, 2)
+    unknown = uuid.uuid4()
+
+    response = await client.get(
+        "/news/batch",
+        params={"ids": [f"{second},not-an-id", f"{unknown}", f"{first}", f"{second}"]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [str(second), str(first)]
+    assert body["items"][0]["category"]["id"] == str(category.id)
+    assert body["items"][0]["user"]["username"] == user.username
+    assert body["missing"] == ["not-an-id", str(unknown)]
+
+
+async def test_news_batch_limits_the_ids(client, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_BATCH_MAX_ITEMS", 2)
+
+    response = await client.get("/news/batch", params={"ids": "a,b,c"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "TOO_MANY_NEWS_IDS"
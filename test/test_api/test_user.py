@@ -0,0 +1,31 @@
+from app.utils.news_cache import news_cache
+from test.conftest import test_async_session_maker
+
+
+async def _session_maker():
+    return test_async_session_maker
+
+
+async def test_profile_change_drops_the_cached_news(client, category, monkeypatch):
+    monkeypatch.setattr(news_cache, "get_session_maker", _session_maker)
+    response = await client.post(
+        "/me/news",
+        json={
+            "title": "Profil",
+            "content": "isi berita profil",
+            "category_id": str(category.id),
+        },
+    )
+    news_id = response.json()["id"]
+    assert client.cookies["last_write"] == response.headers["X-Last-Write"]
+    # without the last_write cookie the read is not sent to the primary
+    client.cookies.clear()
+    response = await client.get(f"/news{news_id}")
+    assert response.json()["user"]["name"] == response.json()["user"]["username"]
+
+    response = await client.put("/me", json={"name": "Nama Baru"})
+    assert response.status_code == 200
+
+    client.cookies.clear()
+    response = await client.get(f"/news{news_id}")
+    assert response.json()["user"]["name"] == "Nama Baru"
@@ -0,0 +1,227 @@
+import datetime
+import uuid
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.news_counter import NewsCounter
+from app.db.models.news_signature import NewsSignature
+from app.db.models.user import User
+from app.utils.dedupe import duplicate_detector
+from app.utils.news_counter import NewsCounterService
+from test.conftest import test_async_session_maker
+
+
+def _item(category_id, title: str) -> dict:
+    return {
+        "title": title,
+        "content": f"content of {title} {uuid.uuid4()}",
+        "category_id": str(category_id),
+    }
+
+
+async def _create(client, items: list[dict]) -> list[str]:
+    response = await client.post("/me/news:batch", json={"items": items})
+    assert response.status_code == 200
+    return [item["news"]["id"] for item in response.json()["items"]]
+
+
+async def _news(news_ids) -> dict[uuid.UUID, News]:
+    async with test_async_session_maker() as session:
+        result = await session.scalars(select(News).where(News.id.in_(news_ids)))
+        return {news.id: news for news in result}
+
+
+async def _count(scope: str, ref_id: uuid.UUID) -> int:
+    async with test_async_session_maker() as session:
+        return await NewsCounterService(session).get(scope, ref_id)
+
+
+async def test_create_batch_reports_failures_per_item(client, user, category):
+    unknown = uuid.uuid4()
+
+    response = await client.post(
+        "/me/news:batch",
+        json={
+            "items": [
+                _item(category.id, "first"),
+                _item(unknown, "lost"),
+                _item(category.id, "second"),
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [item["index"] for item in body["items"]] == [0, 1, 2]
+    assert [item["status"] for item in body["items"]] == ["created", "failed", "created"]
+    assert body["items"][1]["error"]["error_code"] == "CATEGORY_NOT_FOUND"
+    assert [body["items"][index]["news"]["title"] for index in (0, 2)] == ["first", "second"]
+
+    created = await _news(uuid.UUID(body["items"][index]["news"]["id"]) for index in (0, 2))
+    assert sorted(news.title for news in created.values()) == ["first", "second"]
+    assert await _count(NewsCounter.CATEGORY, category.id) == 2
+    assert await _count(NewsCounter.AUTHOR, user.id) == 2
+
+
+async def test_create_batch_limits_the_items(client, category):
+    items = [
+        _item(category.id, f"news {index}")
+        for index in range(settings.NEWS_BATCH_MAX_ITEMS + 1)
+    ]
+
+    response = await client.post("/me/news:batch", json={"items": items})
+
+    assert response.status_code == 422
+    assert await _count(NewsCounter.CATEGORY, category.id) == 0
+
+
+async def test_update_batch_groups_rows_by_columns(client, category):
+    other_category = Category(id=uuid.uuid4(), name=f"other {uuid.uuid4().hex[:8]}")
+    async with test_async_session_maker() as session:
+        session.add(other_category)
+        await session.commit()
+    first, second, third = await _create(
+        client, [_item(category.id, title) for title in ("first", "second", "third")]
+    )
+
+    response = await client.patch(
+        "/me/news:batch",
+        json={
+            "items": [
+                {"id": third, "title": "third renamed", "content": "new content"},
+                {"id": first, "category_id": str(other_category.id)},
+                {"id": second, "title": "second renamed"},
+            ]
+        },
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["succeeded"] == 3
+    assert [item["news"]["id"] for item in body["items"]] == [third, first, second]
+    news = await _news(uuid.UUID(news_id) for news_id in (first, second, third))
+    first, second, third = (news[uuid.UUID(news_id)] for news_id in (first, second, third))
+    assert (first.title, first.category_id) == ("first", other_category.id)
+    assert (second.title, second.category_id) == ("second renamed", category.id)
+    assert (third.title, third.content) == ("third renamed", "new content")
+    assert second.content.startswith("content of second")
+    assert await _count(NewsCounter.CATEGORY, category.id) == 2
+    assert await _count(NewsCounter.CATEGORY, other_category.id) == 1
+
+
+async def test_update_batch_reports_failures_per_item(client, category):
+    owner = User(
+        username=f"owner{uuid.uuid4().hex[:8]}",
+        email=f"owner{uuid.uuid4().hex[:8]}@mail.test",
+        hashed_password="x",
+        name="owner",
+    )
+    async with test_async_session_maker() as session:
+        session.add(owner)
+        await session.flush()
+        not_owned = News(
+            title="not owned",
+            content="content",
+            category_id=category.id,
+            user_id=owner.id,
+            published_at=datetime.datetime.now(),
+        )
+        session.add(not_owned)
+        await session.commit()
+    (mine,) = await _create(client, [_item(category.id, "mine")])
+
+    response = await client.patch(
+        "/me/news:batch",
+        json={
+            "items": [
+                {"id": str(not_owned.id), "title": "stolen"},
+                {"id": mine, "title": "mine renamed"},
+                {"id": mine, "category_id": str(uuid.uuid4())},
+                {"id": str(uuid.uuid4()), "title": "unknown"},
+            ]
+        },
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 3)
+    assert [item["index"] for item in body["items"]] == [0, 1, 2, 3]
+    assert [item["status"] for item in body["items"]] == [
+        "failed",
+        "updated",
+        "failed",
+        "failed",
+    ]
+    assert [item["error"]["error_code"] for item in body["items"] if item["error"]] == [
+        "NEWS_NOT_FOUND",
+        "DUPLICATE_BATCH_ITEM",
+        "NEWS_NOT_FOUND",
+    ]
+    news = await _news([not_owned.id, uuid.UUID(mine)])
+    assert news[not_owned.id].title == "not owned"
+    assert news[uuid.UUID(mine)].title == "mine renamed"
+
+
+async def test_create_batch_rejects_duplicates_within_the_batch(client, category, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_DEDUPE_MODE", "reject")
+    syncs = []
+    sync = duplicate_detector.sync
+
+    async def counted_sync(session):
+        syncs.append(session)
+        await sync(session)
+
+    monkeypatch.setattr(duplicate_detector, "sync", counted_sync)
+    content = " ".join(f"kata{index}" for index in range(50))
+    items = [_item(category.id, title) for title in ("original", "copy", "other")]
+    items[0]["content"] = items[1]["content"] = content
+
+    response = await client.post("/me/news:batch", json={"items": items})
+
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == ["created", "failed", "created"]
+    assert body["items"][1]["error"]["error_code"] == "DUPLICATE_NEWS"
+    assert len(syncs) == 1
+    assert uuid.UUID(body["items"][0]["news"]["id"]) in duplicate_detector.index.signatures
+
+
+async def test_content_edits_are_checked_for_duplicates(client, category, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_DEDUPE_MODE", "reject")
+    tag = uuid.uuid4().hex[:8]
+    original = " ".join(f"sunting{tag}{index}" for index in range(50))
+    items = [_item(category.id, title) for title in ("original", "other")]
+    items[0]["content"] = original
+    first, second = await _create(client, items)
+
+    # an edited news is not a duplicate of its own previous content
+    edited = f"{original} tambahan"
+    response = await client.patch(f"/me/news/{first}", json={"content": edited})
+    assert response.status_code == 202
+    signature = duplicate_detector.index.hasher.signature(edited)
+    assert duplicate_detector.index.signatures[uuid.UUID(first)] == signature
+    async with test_async_session_maker() as session:
+        row = await session.get(NewsSignature, uuid.UUID(first))
+    assert row.signature == signature
+
+    response = await client.patch(f"/me/news/{second}", json={"content": original})
+    assert response.status_code == 409
+    assert response.json()["detail"]["error_code"] == "DUPLICATE_NEWS"
+
+    response = await client.patch(
+        "/me/news:batch",
+        json={
+            "items": [
+                {"id": second, "content": edited},
+                {"id": first, "content": f"{edited} lagi"},
+            ]
+        },
+    )
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == ["failed", "updated"]
+    assert body["items"][0]["error"]["error_code"] == "DUPLICATE_NEWS"
+    news = await _news([uuid.UUID(second)])
+    assert news[uuid.UUID(second)].content == items[1]["content"]
@@ -0,0 +1,114 @@
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from app.core.config import settings
+from app.server import Supervisor, fastest, get_config, worker_count
+
+
+def test_fastest():
+    assert fastest("uvloop", default="asyncio") in ("uvloop", "asyncio")
+    assert fastest("not_installed_module", default="h11") == "h11"
+
+
+def test_config_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_BACKLOG", 512)
+    monkeypatch.setattr(settings, "SERVER_LIMIT_CONCURRENCY", 100)
+    monkeypatch.setattr(settings, "SERVER_KEEP_ALIVE_SECONDS", 15)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+
+    config = get_config()
+
+    assert config.backlog == 512
+    assert config.limit_concurrency == 100
+    assert config.timeout_keep_alive == 15
+    assert config.timeout_graceful_shutdown == settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+    assert worker_count() == 3
+
+
+async def _app(scope, receive, send):
+    if scope["path"] == "/slow":
+        await asyncio.sleep(1)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+def _serve(port: int, workers: int) -> None:
+    config = uvicorn.Config(
+        _app, host="127.0.0.1", port=port, lifespan="off", timeout_graceful_shutdown=5
+    )
+    Supervisor(config, workers).run()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _workers(pid: int) -> set[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as children:  # noqa: PTH123
+        return {int(child) for child in children.read().split()}
+
+
+def _wait(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if result := condition():
+                return result
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError
+
+
+@pytest.fixture
+def server():
+    port = _free_port()
+    process = multiprocessing.get_context("fork").Process(target=_serve, args=(port, 2))
+    process.start()
+    url = f"http://127.0.0.1:{port}"
+    _wait(lambda: httpx.get(url).status_code == 200)
+    yield process, url
+    if process.is_alive():
+        process.terminate()
+    process.join(10)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="needs /proc")  # noqa: PTH110
+def test_dead_worker_is_replaced(server):
+    process, url = server
+    workers = _wait(lambda: len(_workers(process.pid)) == 2 and _workers(process.pid))
+
+    dead = next(iter(workers))
+    os.kill(dead, signal.SIGKILL)
+
+    replaced = _wait(
+        lambda: len(_workers(process.pid) - workers) == 1 and _workers(process.pid)
+    )
+    assert dead not in replaced
+    assert len(replaced) == 2
+    assert httpx.get(url).status_code == 200
+
+
+def test_sigterm_drains_open_requests(server):
+    process, url = server
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        slow = executor.submit(httpx.get, f"{url}/slow", timeout=10)
+        time.sleep(0.3)
+        os.kill(process.pid, signal.SIGTERM)
+
+        assert slow.result().status_code == 200
+    process.join(10)
+    assert process.exitcode == 0
+    with pytest.raises(httpx.ConnectError):
+        httpx.get(url)
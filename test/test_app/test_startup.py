@@ -0,0 +1,11 @@
+from benchmarks.startup import run
+
+
+def test_cold_start(record_property):
+    summary = run(runs=1)
+
+    for key in ("import", "startup", "first_request", "total"):
+        record_property(f"{key}_seconds", round(summary[key], 4))
+    assert summary["status_code"] == 200
+    # optional integrations are imported on first use only
+    assert summary["lazy_loaded"] == []
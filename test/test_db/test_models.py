@@ -0,0 +1,19 @@
+import pkgutil
+from pathlib import Path
+
+import app.db.models
+from app.db.base import Base
+from app.db.models import MODEL_MODULES, load_all_models
+
+
+def test_every_model_module_is_registered():
+    package_dir = Path(app.db.models.__file__).parent
+    modules = {module.name for module in pkgutil.iter_modules([str(package_dir)])}
+
+    assert modules - {"mixin"} == set(MODEL_MODULES)
+
+
+def test_load_all_models():
+    load_all_models()
+
+    assert {"users", "news", "categories", "revoked_tokens"} <= set(Base.metadata.tables)
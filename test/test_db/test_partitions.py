@@ -0,0 +1,59 @@
+import datetime
+import uuid
+
+from sqlalchemy import delete, select
+from starlette.requests import Request
+
+from app.db.models.news import News
+from app.db.partitions import add_months, month_start, months_ago, partition_name
+from app.middleware.request import request_object
+from app.utils.pagination import paginate
+from test.conftest import test_async_session_maker
+
+
+def test_month_helpers():
+    month = month_start(datetime.date(2025, 11, 17))
+    assert month == datetime.date(2025, 11, 1)
+    assert add_months(month, 2) == datetime.date(2026, 1, 1)
+    assert add_months(month, -11) == datetime.date(2024, 12, 1)
+    assert partition_name(month) == "news_2025_11"
+    assert months_ago(1, today=datetime.date(2026, 1, 31)) == datetime.date(2025, 12, 1)
+
+
+async def test_window_pagination_matches_the_whole_query():
+    category_id = uuid.uuid4()
+    start = datetime.datetime(2025, 1, 1)
+    news = [
+        News(
+            id=uuid.uuid4(),
+            title=f"news {day}",
+            content="content",
+            user_id=uuid.uuid4(),
+            category_id=category_id,
+            published_at=start + datetime.timedelta(days=day),
+        )
+        for day in range(10)
+    ]
+    query = (
+        select(News).where(News.category_id == category_id).order_by(News.published_at.desc())
+    )
+    # the last five news, the window fills only the first page
+    window = News.published_at >= start + datetime.timedelta(days=5)
+    scope = {"type": "http", "scheme": "http", "server": ("test", 80), "path": "/news"}
+    request_object.set(Request({**scope, "query_string": b"", "headers": []}))
+
+    async with test_async_session_maker() as session:
+        session.add_all(news)
+        await session.commit()
+
+        latest = [item.id for item in reversed(news)]
+        for page in (1, 2, 3, 4):
+            whole = await paginate(session, query, page, 3)
+            windowed = await paginate(session, query, page, 3, count=10, window=window)
+            assert [item.id for item in windowed["items"]] == latest[(page - 1) * 3 : page * 3]
+            assert windowed["items"] == whole["items"]
+            assert windowed["count"] == whole["count"] == 10
+            assert windowed["total_page"] == 4
+
+        await session.execute(delete(News).where(News.category_id == category_id))
+        await session.commit()
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.db.replica import ReadYourWrites, ReplicaRouter
+
+
+def _engine(url: str):
+    return create_async_engine(url, poolclass=NullPool)
+
+
+@pytest.fixture
+def primary():
+    return async_sessionmaker(_engine("sqlite+aiosqlite:///:memory:"))
+
+
+async def test_round_robin_between_replicas(primary):
+    router = ReplicaRouter(
+        primary,
+        [_engine("sqlite+aiosqlite:///:memory:"), _engine("sqlite+aiosqlite:///:memory:")],
+    )
+    first = await router.get_session_maker()
+    second = await router.get_session_maker()
+    third = await router.get_session_maker()
+
+    assert first is not second
+    assert first is third
+    assert primary not in (first, second)
+    await router.dispose()
+
+
+async def test_unhealthy_replica_is_skipped(primary):
+    broken = _engine("sqlite+aiosqlite:////nonexistent/dir/replica.db")
+    healthy = _engine("sqlite+aiosqlite:///:memory:")
+    router = ReplicaRouter(primary, [broken, healthy])
+    # the requests do not run the health checks
+    assert await router.get_session_maker() is router.nodes[0].session_maker
+
+    assert await router.check_all() == 1
+    for _ in range(3):
+        assert await router.get_session_maker() is router.nodes[1].session_maker
+    assert router.nodes[0].healthy is False
+    await router.dispose()
+
+
+async def test_fallback_to_primary(primary):
+    router = ReplicaRouter(primary, [_engine("sqlite+aiosqlite:////nonexistent/dir/r.db")])
+    await router.check_all()
+    assert await router.get_session_maker() is primary
+
+    empty_router = ReplicaRouter(primary)
+    assert await empty_router.get_session_maker() is primary
+    await router.dispose()
+
+
+def _request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (key.lower().encode(), value.encode()) for key, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_read_your_writes_window():
+    tracker = ReadYourWrites(window_seconds=60)
+    assert tracker.is_sticky(_request({})) is False
+    assert tracker.is_sticky(None) is False
+
+    response = Response()
+    tracker.mark(response)
+    written_at = response.headers["X-Last-Write"]
+    assert f"last_write={written_at}" in response.headers["set-cookie"]
+
+    assert tracker.is_sticky(_request({"Cookie": f"last_write={written_at}"})) is True
+    assert tracker.is_sticky(_request({"X-Last-Write": written_at})) is True
+    assert tracker.is_sticky(_request({"X-Last-Write": "garbage"})) is False
+    assert tracker.is_sticky(_request({"X-Last-Write": str(time.time() - 61)})) is False
@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+
+from app.api.dependencies.user_manager import UserManager
+from app.schemas.user import UserCreate, UserUpdate
+from app.utils import exceptions
+from app.utils.common import ErrorCode
+from app.utils.email_validation import email_validation
+
+
+@pytest.fixture(autouse=True)
+def accept_test_domains(monkeypatch):
+    # accept the reserved *.test domains, without dns lookups
+    monkeypatch.setattr(email_validation, "test_environment", True)
+
+
+def _user_create(**kwargs) -> UserCreate:
+    suffix = uuid.uuid4().hex[:8]
+    data = {
+        "email": f"{suffix}@mail.test",
+        "username": f"user{suffix}",
+        "name": "User",
+        "password": "secretpass1",
+    }
+    return UserCreate(**{**data, **kwargs})
+
+
+async def test_create_user(db_session):
+    user = await UserManager(db_session).create(_user_create(name="Created"))
+
+    assert user.id is not None
+    assert user.name == "Created"
+    assert user.create_at is not None
+    assert user.is_active
+
+
+@pytest.mark.parametrize(
+    ("field", "error_code"),
+    [
+        ("email", ErrorCode.USER_EMAIL_ALREADY_USED),
+        ("username", ErrorCode.USERNAME_ALREADY_USED),
+    ],
+)
+async def test_create_user_already_exists(db_session, field, error_code):
+    user_manager = UserManager(db_session)
+    existing = await user_manager.create(_user_create())
+
+    with pytest.raises(exceptions.UserAlreadyExistsError) as exc_info:
+        await user_manager.create(_user_create(**{field: getattr(existing, field)}))
+    assert exc_info.value.error_code == error_code
+
+
+async def test_update_user_already_exists(db_session):
+    user_manager = UserManager(db_session)
+    existing = await user_manager.create(_user_create())
+    user = await user_manager.create(_user_create())
+
+    with pytest.raises(exceptions.UserAlreadyExistsError) as exc_info:
+        await user_manager.update(UserUpdate(username=existing.username), user)
+    assert exc_info.value.error_code == ErrorCode.USERNAME_ALREADY_USED
+
+    # keeping its own email is not a conflict
+    updated = await user_manager.update(UserUpdate(email=user.email, name="New"), user)
+    assert updated.name == "New"
@@ -0,0 +1,36 @@
+from app.utils.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_lru_cache_expiry():
+    clock = FakeClock()
+    cache: LRUCache[str, int] = LRUCache(maxsize=10, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 5)
+    cache.set("b", 2)
+
+    clock.now += 5
+
+    assert cache.items() == [("b", 2)]
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
@@ -0,0 +1,175 @@
+import datetime
+import random
+import uuid
+
+from sqlalchemy import delete, select
+
+from app.db.models.news import News
+from app.db.models.news_signature import NewsSignature
+from app.utils.dedupe import DuplicateDetector, LshIndex, MinHasher, shingles
+from app.utils.pubsub import NewsEvent
+from test.conftest import test_async_session_maker
+
+WORDS = [f"kata{i}" for i in range(2000)]
+
+
+def _text(rng: random.Random, length: int = 300) -> list[str]:
+    return [rng.choice(WORDS) for _ in range(length)]
+
+
+def _edit(words: list[str], changes: int, rng: random.Random) -> str:
+    words = list(words)
+    for index in rng.sample(range(len(words)), changes):
+        words[index] = f"ubah{index}"
+    return " ".join(words)
+
+
+def _jaccard(first: str, second: str) -> float:
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b)
+
+
+def test_signature_estimates_jaccard_similarity():
+    rng = random.Random(1)
+    hasher = MinHasher(128)
+    words = _text(rng)
+    original = " ".join(words)
+
+    assert hasher.signature(original) == hasher.signature(original.upper())
+    assert len(hasher.signature(original)) == 4 * 128
+    for changes in (3, 30, 150):
+        edited = _edit(words, changes, rng)
+        estimate = hasher.similarity(hasher.signature(original), hasher.signature(edited))
+        assert abs(estimate - _jaccard(original, edited)) < 0.15
+
+
+def test_lsh_index_finds_near_duplicates_only():
+    rng = random.Random(2)
+    hasher = MinHasher(128)
+    index = LshIndex(hasher, bands=16)
+    words = _text(rng)
+    original_id = uuid.uuid4()
+    index.add(original_id, hasher.signature(" ".join(words)))
+    for _ in range(50):
+        index.add(uuid.uuid4(), hasher.signature(" ".join(_text(rng))))
+
+    match = index.query(hasher.signature(_edit(words, 5, rng)), threshold=0.8)
+    assert match is not None and match[0] == original_id
+    assert index.query(hasher.signature(" ".join(_text(rng))), threshold=0.8) is None
+
+    index.remove(original_id)
+    assert index.query(hasher.signature(" ".join(words)), threshold=0.8) is None
+    assert len(index) == 50
+
+
+async def test_detector_flags_duplicates_across_workers():
+    rng = random.Random(3)
+    words = _text(rng)
+
+    def detector() -> DuplicateDetector:
+        return DuplicateDetector(
+            test_async_session_maker,
+            index=LshIndex(MinHasher(128), bands=16),
+            threshold=0.8,
+            window_days=30,
+        )
+
+    first, second = detector(), detector()
+    news_id = uuid.uuid4()
+    async with test_async_session_maker() as session:
+        check = await first.check(session, " ".join(words))
+        assert check.duplicate_of is None
+        first.record(session, news_id, check)
+        await session.commit()
+
+        # the other worker reads the signature from the table
+        check = await second.check(session, _edit(words, 3, rng))
+        assert check.duplicate_of == news_id
+        assert check.similarity >= 0.8
+        # an edit is not a duplicate of the news itself
+        assert second.match(_edit(words, 3, rng), exclude=news_id).duplicate_of is None
+
+        # the other worker reads the signature of an edited news again
+        other = _text(rng)
+        await first.replace(session, {news_id: first.match(" ".join(other))})
+        await session.commit()
+        assert (await second.check(session, _edit(other, 3, rng))).duplicate_of == news_id
+        assert (await second.check(session, _edit(words, 3, rng))).duplicate_of is None
+
+        second.on_event(NewsEvent("deleted", str(news_id), str(uuid.uuid4())))
+        assert news_id not in second.index.signatures
+        await first.forget(session, news_id)
+        await session.commit()
+        assert await session.get(NewsSignature, news_id) is None
+
+
+async def test_signatures_are_indexed_once_committed():
+    rng = random.Random(5)
+    words = _text(rng)
+    detector = DuplicateDetector(
+        test_async_session_maker,
+        index=LshIndex(MinHasher(128), bands=16),
+        threshold=0.8,
+        window_days=30,
+    )
+    news_id = uuid.uuid4()
+    async with test_async_session_maker() as session:
+        check = await detector.check(session, " ".join(words))
+        detector.record(session, news_id, check)
+        await session.rollback()
+
+    # a rolled back news is not the original of the next ones
+    assert news_id not in detector.index.signatures
+    assert detector.match(_edit(words, 3, rng)).duplicate_of is None
+
+    # the items of a batch are compared with the ones accepted before
+    batch = detector.batch()
+    batch.add(news_id, check.signature)
+    assert detector.match(_edit(words, 3, rng), batch).duplicate_of == news_id
+    assert news_id not in detector.index.signatures
+
+    detector.add(news_id, check)
+    assert detector.match(_edit(words, 3, rng)).duplicate_of == news_id
+
+
+async def test_backfill_signs_existing_news():
+    rng = random.Random(4)
+    words = _text(rng)
+    news = [
+        News(
+            id=uuid.uuid4(),
+            title="wire",
+            content=content,
+            user_id=uuid.uuid4(),
+            category_id=uuid.uuid4(),
+            published_at=datetime.datetime.now(),
+            create_at=datetime.datetime(2025, 1, 1, minute=minute, tzinfo=datetime.UTC),
+        )
+        for minute, content in enumerate((" ".join(words), _edit(words, 2, rng)))
+    ]
+    async with test_async_session_maker() as session:
+        session.add_all(news)
+        await session.commit()
+
+    detector = DuplicateDetector(
+        test_async_session_maker,
+        index=LshIndex(MinHasher(128), bands=16),
+        threshold=0.8,
+        window_days=30,
+    )
+    signed, duplicates = await detector.backfill(batch_size=1)
+    assert signed >= 2
+    assert duplicates >= 1
+
+    async with test_async_session_maker() as session:
+        ids = [item.id for item in news]
+        rows = await session.scalars(
+            select(NewsSignature).where(NewsSignature.news_id.in_(ids))
+        )
+        assert {row.news_id: row.duplicate_of for row in rows} == {
+            ids[0]: None,
+            ids[1]: ids[0],
+        }
+        await session.execute(delete(NewsSignature).where(NewsSignature.news_id.in_(ids)))
+        await session.execute(delete(News).where(News.id.in_(ids)))
+        await session.commit()
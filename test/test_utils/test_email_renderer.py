@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+from app.templates.renderer import EmailRenderer
+
+
+def test_render_email():
+    renderer = EmailRenderer()
+    renderer.load()
+    user = SimpleNamespace(name="Budi <b>")
+
+    body = renderer.render(
+        "email/reset_password.html", user=user, reset_password_url="https://x.test/?a=1&b=2"
+    )
+
+    assert "Hi Budi &lt;b&gt;," in body
+    assert 'href="https://x.test/?a=1&amp;b=2"' in body
+    # the shared stylesheet is inlined, not escaped
+    assert "font-family: Arial, sans-serif;" in body
+    assert "email/verification_email.html" in renderer.templates
+
+
+async def test_render_async_without_load():
+    renderer = EmailRenderer()
+    user = SimpleNamespace(name="Budi")
+
+    body = await renderer.render_async(
+        "email/verification_email.html", user=user, verification_url="https://x.test"
+    )
+
+    assert body == renderer.render(
+        "email/verification_email.html", user=user, verification_url="https://x.test"
+    )
+    assert "max-width: 600px;" in body
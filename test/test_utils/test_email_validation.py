@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from app.utils import exceptions
+from app.utils.email_validation import EmailValidationService
+
+
+class FakeResolver:
+    def __init__(self, records: dict[tuple[str, str], list]):
+        self.records = records
+        self.calls: list[tuple[str, str]] = []
+
+    async def resolve(self, domain: str, rdtype: str, lifetime: float):
+        self.calls.append((domain, rdtype))
+        await asyncio.sleep(0)
+        if domain == "timeout.org":
+            raise dns.exception.Timeout
+        if domain == "missing.org":
+            raise dns.resolver.NXDOMAIN
+        if (domain, rdtype) not in self.records:
+            raise dns.resolver.NoAnswer
+        return self.records[(domain, rdtype)]
+
+
+def _service(resolver: FakeResolver, check_deliverability: bool = True):
+    return EmailValidationService(
+        check_deliverability=check_deliverability,
+        timeout=1,
+        positive_ttl=60,
+        negative_ttl=60,
+        cache_size=100,
+        resolver=resolver,
+    )
+
+
+RECORDS = {
+    ("mail.org", "MX"): [SimpleNamespace(exchange="mx.mail.org.")],
+    ("nullmx.org", "MX"): [SimpleNamespace(exchange=".")],
+    ("web.org", "A"): [SimpleNamespace(address="93.184.216.34")],
+    ("local.org", "A"): [SimpleNamespace(address="127.0.0.1")],
+}
+
+
+async def test_deliverable_domains():
+    service = _service(FakeResolver(RECORDS))
+
+    assert await service.validate("user@mail.org") == "user@mail.org"
+    assert await service.validate("user@web.org") == "user@web.org"
+    # dns errors do not block the validation
+    assert await service.validate("user@timeout.org") == "user@timeout.org"
+
+    for email in ("user@nullmx.org", "user@local.org", "user@missing.org"):
+        with pytest.raises(exceptions.ValidationError):
+            await service.validate(email)
+
+
+async def test_domain_result_is_cached_and_shared():
+    resolver = FakeResolver(RECORDS)
+    service = _service(resolver)
+
+    await asyncio.gather(*(service.validate(f"user{i}@mail.org") for i in range(5)))
+    with pytest.raises(exceptions.ValidationError):
+        await service.validate("user@missing.org")
+    with pytest.raises(exceptions.ValidationError):
+        await service.validate("other@MISSING.org")
+
+    assert resolver.calls == [("mail.org", "MX"), ("missing.org", "MX")]
+
+
+async def test_failed_lookup_is_not_cached():
+    resolver = FakeResolver(RECORDS)
+    service = _service(resolver)
+
+    await service.validate("user@timeout.org")
+    await service.validate("user@timeout.org")
+
+    assert len(resolver.calls) == 2
+
+
+async def test_syntax_only():
+    resolver = FakeResolver(RECORDS)
+    service = _service(resolver, check_deliverability=False)
+
+    assert await service.validate("user@missing.org") == "user@missing.org"
+    with pytest.raises(exceptions.ValidationError):
+        await service.validate("not an email")
+    assert resolver.calls == []
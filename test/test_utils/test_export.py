@@ -0,0 +1,69 @@
+import csv
+import datetime
+import io
+import json
+import uuid
+
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.user import User
+from app.utils.export import ExportFormat, news_export_query, stream_news_export
+from test.conftest import test_async_session_maker
+
+
+async def _seed(session, size: int) -> Category:
+    category = Category(id=uuid.uuid4(), name=f"export-{uuid.uuid4().hex[:8]}")
+    user = User(
+        id=uuid.uuid4(),
+        username=f"exporter{uuid.uuid4().hex[:8]}",
+        email=f"{uuid.uuid4().hex[:8]}@mail.test",
+        hashed_password="hashed",
+        name="Exporter",
+    )
+    session.add_all([category, user])
+    session.add_all(
+        News(
+            title=f"News, {i}",
+            content="line\nbreak",
+            category_id=category.id,
+            user_id=user.id,
+            published_at=datetime.datetime(2025, 1, 1) + datetime.timedelta(days=i),
+        )
+        for i in range(size)
+    )
+    await session.commit()
+    return category
+
+
+async def _export(query, export_format: ExportFormat) -> str:
+    chunks = stream_news_export(query, export_format, test_async_session_maker())
+    return "".join([chunk async for chunk in chunks])
+
+
+async def test_export_ndjson(db_session):
+    category = await _seed(db_session, 3)
+    query = news_export_query().where(News.category_id == category.id).order_by(News.title)
+
+    lines = (await _export(query, ExportFormat.NDJSON)).splitlines()
+
+    assert len(lines) == 3
+    first = json.loads(lines[0])
+    assert first["title"] == "News, 0"
+    assert first["category"] == category.name
+    assert first["published_at"] == "2025-01-01T00:00:00"
+
+
+async def test_export_csv_has_single_header(db_session):
+    category = await _seed(db_session, 2)
+    query = news_export_query().where(News.category_id == category.id).order_by(News.title)
+
+    rows = list(csv.DictReader(io.StringIO(await _export(query, ExportFormat.CSV))))
+
+    assert [row["title"] for row in rows] == ["News, 0", "News, 1"]
+    assert rows[0]["content"] == "line\nbreak"
+
+
+async def test_export_csv_empty_result_has_header(db_session):
+    query = news_export_query().where(News.category_id == uuid.uuid4())
+
+    assert (await _export(query, ExportFormat.CSV)).startswith("id,title,content")
@@ -0,0 +1,110 @@
+import datetime
+import uuid
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.db.models.category import Category
+from app.db.models.news import News
+from app.db.models.user import User
+from app.utils import exceptions
+from app.utils.feed import FeedCache, FeedFormat
+from app.utils.pubsub import NewsEvent
+
+BASE_URL = "https://news.example.com"
+
+
+async def _seed(session, size: int) -> tuple[Category, list[News]]:
+    category = Category(id=uuid.uuid4(), name=f"feed-{uuid.uuid4().hex[:8]}")
+    user = User(
+        id=uuid.uuid4(),
+        username=f"feeder{uuid.uuid4().hex[:8]}",
+        email=f"{uuid.uuid4().hex[:8]}@mail.test",
+        hashed_password="hashed",
+        name="Feeder",
+    )
+    news = [
+        News(
+            title=f"News <{i}>",
+            content="A & B",
+            category_id=category.id,
+            user_id=user.id,
+            published_at=datetime.datetime(2025, 1, 1) + datetime.timedelta(days=i),
+        )
+        for i in range(size)
+    ]
+    session.add_all([category, user, *news])
+    await session.commit()
+    return category, news
+
+
+async def test_rss_feed_of_category(db_session):
+    category, _ = await _seed(db_session, 3)
+    cache = FeedCache(size=2, ttl=60, base_url=BASE_URL)
+
+    feed = await cache.get(db_session, FeedFormat.RSS, category.id)
+
+    items = ET.fromstring(feed.body).findall("channel/item")
+    assert [item.findtext("title") for item in items] == ["News <2>", "News <1>"]
+    assert items[0].findtext("description") == "A & B"
+    assert items[0].findtext("category") == category.name
+    assert items[0].findtext("link").startswith("https://news.example.com/api/v1/news")
+
+
+async def test_atom_feed_is_valid_xml(db_session):
+    category, _ = await _seed(db_session, 1)
+    cache = FeedCache(size=10, ttl=60, base_url=BASE_URL)
+
+    feed = await cache.get(db_session, FeedFormat.ATOM, category.id)
+
+    entries = ET.fromstring(feed.body).findall("{http://www.w3.org/2005/Atom}entry")
+    assert len(entries) == 1
+
+
+async def test_feed_is_cached_until_invalidated(db_session):
+    category, news = await _seed(db_session, 2)
+    cache = FeedCache(size=10, ttl=60, base_url=BASE_URL)
+    feed = await cache.get(db_session, FeedFormat.RSS, category.id)
+
+    news[0].title = "Changed"
+    await db_session.commit()
+    assert await cache.get(db_session, FeedFormat.RSS, category.id) is feed
+
+    cache.on_event(NewsEvent("updated", str(news[0].id), str(category.id)))
+    updated = await cache.get(db_session, FeedFormat.RSS, category.id)
+
+    assert updated is not feed
+    assert updated.etag != feed.etag
+    assert "Changed" in updated.body
+
+
+async def test_feed_expired_is_checked_against_database(db_session):
+    category, news = await _seed(db_session, 2)
+    cache = FeedCache(size=10, ttl=0, base_url=BASE_URL)
+    feed = await cache.get(db_session, FeedFormat.RSS, category.id)
+
+    assert await cache.get(db_session, FeedFormat.RSS, category.id) is feed
+
+    await db_session.delete(news[0])
+    await db_session.commit()
+    assert await cache.get(db_session, FeedFormat.RSS, category.id) is not feed
+
+
+async def test_feed_of_unknown_category(db_session):
+    cache = FeedCache(size=10, ttl=60, base_url=BASE_URL)
+
+    with pytest.raises(exceptions.CategoryNotFoundError):
+        await cache.get(db_session, FeedFormat.RSS, uuid.uuid4())
+    assert len(cache.feeds) == 0
+
+
+async def test_feeds_are_bounded(db_session):
+    categories = [(await _seed(db_session, 1))[0] for _ in range(3)]
+    cache = FeedCache(size=10, ttl=60, base_url=BASE_URL, max_feeds=2)
+
+    for category in categories:
+        await cache.get(db_session, FeedFormat.RSS, category.id)
+
+    assert [key for key, _ in cache.feeds.items()] == [
+        (FeedFormat.RSS, category.id) for category in categories[1:]
+    ]
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select
+from starlette.background import BackgroundTasks
+
+from app.db.models.job import Job
+from app.utils.jobs import JobQueue, Worker
+from test.conftest import test_async_session_maker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+async def queue(setup_db):
+    queue = JobQueue(
+        test_async_session_maker,
+        max_attempts=3,
+        retry_base=10,
+        retry_max=60,
+        timeout=5,
+        lock_timeout=300,
+        clock=Clock(),
+    )
+    yield queue
+    async with test_async_session_maker() as session:
+        await session.execute(delete(Job))
+        await session.commit()
+
+
+async def _jobs() -> list[Job]:
+    async with test_async_session_maker() as session:
+        return list((await session.scalars(select(Job).order_by(Job.id))).all())
+
+
+async def test_claim_and_complete(queue):
+    done = []
+
+    @queue.task()
+    async def collect(value: int):
+        done.append(value)
+
+    await queue.enqueue(collect, value=1)
+    await queue.enqueue(collect, delay=30, value=2)
+
+    jobs = await queue.claim(10)
+    assert [job.payload for job in jobs] == [{"value": 1}]
+    # a claimed job is not handed twice
+    assert await queue.claim(10) == []
+
+    await queue.run(jobs[0])
+    assert done == [1]
+    assert [job.payload for job in await _jobs()] == [{"value": 2}]
+
+
+async def test_retry_with_backoff_then_dead(queue):
+    @queue.task()
+    async def broken():
+        raise RuntimeError("smtp down")
+
+    await queue.enqueue(broken)
+    for attempt in range(1, 4):
+        (job,) = await queue.claim(10)
+        assert job.attempts == attempt
+        await queue.run(job)
+        (job,) = await _jobs()
+        if attempt < 3:
+            assert job.status == Job.QUEUED
+            assert await queue.claim(10) == []
+            queue.clock.now += 60
+
+    assert job.status == Job.DEAD
+    assert job.last_error == "RuntimeError: smtp down"
+    assert await queue.claim(10) == []
+
+    assert await queue.requeue_dead() == 1
+    (job,) = await queue.claim(10)
+    assert job.attempts == 1
+
+
+async def test_unknown_job_is_dead(queue):
+    with pytest.raises(LookupError):
+        await queue.enqueue("missing")
+
+    @queue.task("renamed")
+    async def handler():
+        pass
+
+    await queue.enqueue("renamed")
+    del queue.handlers["renamed"]
+    (job,) = await queue.claim(10)
+    await queue.run(job)
+
+    (job,) = await _jobs()
+    assert job.status == Job.DEAD
+
+
+async def test_expired_lock_is_claimed_again(queue):
+    @queue.task()
+    async def noop():
+        pass
+
+    await queue.enqueue(noop)
+    (stale,) = await queue.claim(10)
+    queue.clock.now += 301
+
+    (job,) = await queue.claim(10)
+    assert job.attempts == 2
+    # the worker which lost the lock does not touch the job anymore
+    await queue.complete(stale)
+    assert len(await _jobs()) == 1
+    await queue.complete(job)
+    assert await _jobs() == []
+
+
+async def test_worker(queue):
+    done = asyncio.Event()
+
+    @queue.task()
+    async def notify():
+        done.set()
+
+    worker = Worker(queue, concurrency=2, poll_interval=0.01)
+    worker.start()
+    await queue.enqueue(notify)
+    await asyncio.wait_for(done.wait(), 5)
+    await worker.shutdown()
+
+    assert await _jobs() == []
+
+
+async def test_inline_jobs_run_in_process(queue):
+    queue.inline = True
+    done = []
+
+    @queue.task()
+    async def collect(value: int):
+        done.append(value)
+
+    @queue.task()
+    async def broken():
+        raise RuntimeError("smtp down")
+
+    await queue.enqueue(collect, value=1)
+    await queue.enqueue(broken)
+    background = BackgroundTasks()
+    await queue.enqueue(collect, background=background, value=2)
+    await queue.drain()
+    assert done == [1]
+
+    await background()
+    assert done == [1, 2]
+    assert await _jobs() == []
+    assert await queue.pending() == 0
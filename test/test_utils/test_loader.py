@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.utils.loader import DataLoader
+
+
+def _loader(calls: list):
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key != 0}
+
+    return DataLoader(batch_fn)
+
+
+async def test_loads_in_same_tick_are_coalesced():
+    calls = []
+    loader = _loader(calls)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert results == [10, 20, 10]
+    assert calls == [[1, 2]]
+
+
+async def test_load_many_preserves_order_and_reports_missing():
+    calls = []
+    loader = _loader(calls)
+
+    assert await loader.load_many([3, 0, 1]) == [30, None, 10]
+    assert await loader.load_many([1, 4]) == [10, 40]
+    assert calls == [[3, 0, 1], [4]]
+
+
+async def test_batch_error_is_propagated():
+    async def batch_fn(keys):
+        raise RuntimeError("database down")
+
+    loader = DataLoader(batch_fn)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
@@ -0,0 +1,43 @@
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+def test_render():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs")
+    registry.gauge("duration_seconds", "Duration").set(0.5, task='say "hi"')
+    runs.inc(task="a")
+    runs.inc(2, task="a")
+
+    assert registry.counter("runs_total", "Runs") is runs
+    assert runs.get(task="a") == 3
+    assert registry.render() == (
+        "# HELP runs_total Runs\n"
+        "# TYPE runs_total counter\n"
+        'runs_total{task="a"} 3\n'
+        "# HELP duration_seconds Duration\n"
+        "# TYPE duration_seconds gauge\n"
+        'duration_seconds{task="say \\"hi\\""} 0.5\n'
+    )
+    with pytest.raises(TypeError):
+        registry.gauge("runs_total", "Runs")
+
+
+def test_histogram():
+    registry = MetricsRegistry()
+    lag = registry.histogram("lag_seconds", "Lag", buckets=(0.1, 0.01, 1))
+    for value in (0.005, 0.01, 0.5, 3):
+        lag.observe(value)
+
+    assert lag.get() == 4
+    assert registry.render() == (
+        "# HELP lag_seconds Lag\n"
+        "# TYPE lag_seconds histogram\n"
+        'lag_seconds_bucket{le="0.01"} 2\n'
+        'lag_seconds_bucket{le="0.1"} 2\n'
+        'lag_seconds_bucket{le="1"} 3\n'
+        'lag_seconds_bucket{le="+Inf"} 4\n'
+        "lag_seconds_sum 3.515\n"
+        "lag_seconds_count 4\n"
+    )
@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+
+from app.utils.news_cache import DatabaseCacheBackend, NewsCache
+from app.utils.pubsub import NewsEvent
+from test.conftest import test_async_session_maker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+        self.version = 1
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, session, news_id) -> bytes:
+        self.calls += 1
+        await self.release.wait()
+        return f"{news_id}:{self.version}".encode()
+
+
+async def _session_maker():
+    return test_async_session_maker
+
+
+def _cache(loader: Loader, clock: Clock, backend=None) -> NewsCache:
+    return NewsCache(
+        _session_maker, backend, size=10, ttl=30, stale_ttl=60, load=loader, clock=clock
+    )
+
+
+async def test_concurrent_misses_share_one_load():
+    loader, clock = Loader(), Clock()
+    cache = _cache(loader, clock)
+    news_id = uuid.uuid4()
+    loader.release.clear()
+
+    waiting = [asyncio.create_task(cache.get(news_id)) for _ in range(10)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert set(await asyncio.gather(*waiting)) == {f"{news_id}:1".encode()}
+    assert loader.calls == 1
+    assert await cache.get(news_id) == f"{news_id}:1".encode()
+    assert loader.calls == 1
+
+
+async def test_stale_entry_is_served_while_refreshed():
+    loader, clock = Loader(), Clock()
+    cache = _cache(loader, clock)
+    news_id = uuid.uuid4()
+    await cache.get(news_id)
+
+    loader.version = 2
+    clock.now += 40
+    assert await cache.get(news_id) == f"{news_id}:1".encode()
+    await asyncio.sleep(0.01)
+    assert await cache.get(news_id) == f"{news_id}:2".encode()
+    assert loader.calls == 2
+
+    # past the stale period the entry is loaded again before answering
+    loader.version = 3
+    clock.now += 100
+    assert await cache.get(news_id) == f"{news_id}:3".encode()
+
+
+async def test_invalidation_drops_the_entry_and_the_running_load():
+    loader, clock = Loader(), Clock()
+    cache = _cache(loader, clock)
+    news_id = uuid.uuid4()
+    await cache.get(news_id)
+
+    cache.on_event(NewsEvent("updated", str(news_id), str(uuid.uuid4())))
+    loader.version = 2
+    loader.release.clear()
+    pending = asyncio.create_task(cache.get(news_id))
+    await asyncio.sleep(0)
+    await cache.invalidate(news_id)
+    loader.release.set()
+
+    # the load started before the invalidation answers its caller only
+    assert await pending == f"{news_id}:2".encode()
+    assert cache.entries.get(news_id) is None
+
+
+async def test_database_backend_is_shared_between_workers():
+    clock = Clock()
+    backend = DatabaseCacheBackend(test_async_session_maker, clock=clock)
+    first_loader, second_loader = Loader(), Loader()
+    first = _cache(first_loader, clock, backend)
+    second = _cache(second_loader, clock, backend)
+    news_id = uuid.uuid4()
+
+    await first.get(news_id)
+    assert await second.get(news_id) == f"{news_id}:1".encode()
+    assert second_loader.calls == 0
+
+    await first.invalidate(news_id)
+    second.forget(news_id)
+    second_loader.version = 2
+    assert await second.get(news_id) == f"{news_id}:2".encode()
+
+    other_id = uuid.uuid4()
+    await second.get(other_id)
+    await second.invalidate(news_id, other_id)
+    assert await backend.get(f"news:{news_id}") is None
+    assert await backend.get(f"news:{other_id}") is None
+
+    clock.now += 1000
+    await backend.prune()
+    assert await backend.get(f"news:{news_id}") is None
@@ -0,0 +1,53 @@
+import datetime
+import uuid
+
+from app.db.models.news import News
+from app.db.models.news_counter import NewsCounter
+from app.utils.news_counter import NewsCounterService
+
+
+def _news(category_id: uuid.UUID, user_id: uuid.UUID) -> News:
+    return News(
+        title="title",
+        content="content",
+        category_id=category_id,
+        user_id=user_id,
+        published_at=datetime.datetime.now(),
+    )
+
+
+async def test_counter_deltas_are_upserted(db_session):
+    category_id, other_category_id, user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    await NewsCounterService(db_session).created(category_id, user_id).flush()
+    await NewsCounterService(db_session).created(category_id, user_id).flush()
+    await NewsCounterService(db_session).moved(category_id, other_category_id).flush()
+
+    service = NewsCounterService(db_session)
+    assert await service.get(NewsCounter.CATEGORY, category_id) == 1
+    assert await service.get(NewsCounter.CATEGORY, other_category_id) == 1
+    assert await service.get(NewsCounter.AUTHOR, user_id) == 2
+
+    await service.deleted(other_category_id, user_id).flush()
+    assert await service.get(NewsCounter.CATEGORY, other_category_id) == 0
+    assert await service.get(NewsCounter.AUTHOR, user_id) == 1
+
+
+async def test_rebuild_counters(db_session):
+    category_id, user_id, other_user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db_session.add_all(
+        [
+            _news(category_id, user_id),
+            _news(category_id, user_id),
+            _news(category_id, other_user_id),
+        ]
+    )
+    await db_session.flush()
+
+    service = NewsCounterService(db_session)
+    await service.rebuild()
+
+    assert await service.get(NewsCounter.CATEGORY, category_id) == 3
+    assert await service.get(NewsCounter.AUTHOR, user_id) == 2
+    assert await service.get(NewsCounter.AUTHOR, other_user_id) == 1
+    assert await service.get(NewsCounter.AUTHOR, uuid.uuid4()) == 0
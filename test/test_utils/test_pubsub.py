@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+
+from app.utils.pubsub import (
+    MAX_PAYLOAD_BYTES,
+    InMemoryBroker,
+    NewsEvent,
+    NewsHub,
+    PostgresBroker,
+    stream_events,
+)
+
+
+def _event(news_id: str, category_id: str = "tech", type_: str = "created") -> NewsEvent:
+    return NewsEvent(type_, news_id, category_id, {"id": news_id})
+
+
+async def _hub(**kwargs) -> NewsHub:
+    hub = NewsHub(InMemoryBroker(), **kwargs)
+    await hub.start()
+    return hub
+
+
+async def test_events_are_filtered_by_category_and_type():
+    hub = await _hub()
+    everything = hub.subscribe()
+    sport = hub.subscribe("sport")
+    created = hub.subscribe(event_types={"created"})
+
+    await hub.publish(_event("1", "tech"))
+    await hub.publish(_event("2", "sport"))
+    await hub.publish(_event("3", "sport", "deleted"))
+
+    assert everything.queue.qsize() == 3
+    assert [(await sport.get()).news_id for _ in range(2)] == ["2", "3"]
+    assert created.queue.qsize() == 2
+
+
+async def test_slow_consumer_drops_oldest_then_is_closed():
+    hub = await _hub(queue_size=2, max_dropped=3)
+    subscription = hub.subscribe()
+
+    for news_id in "123":
+        await hub.publish(_event(news_id))
+    assert subscription.dropped == 1
+    assert [(await subscription.get()).news_id for _ in range(2)] == ["2", "3"]
+
+    for news_id in "45678":
+        await hub.publish(_event(news_id))
+    assert subscription.closed is True
+    assert subscription not in hub.subscriptions
+
+
+async def test_stream_renders_server_sent_events():
+    hub = await _hub()
+    subscription = hub.subscribe()
+
+    async def is_disconnected():
+        return False
+
+    stream = stream_events(subscription, is_disconnected, heartbeat_seconds=0.01)
+    assert await anext(stream) == "retry: 10\n\n"
+    assert await anext(stream) == ": heartbeat\n\n"
+
+    await hub.publish(_event("42"))
+    assert await anext(stream) == 'id: 42\nevent: news.created\ndata: {"id": "42"}\n\n'
+
+    await stream.aclose()
+    assert subscription not in hub.subscriptions
+
+
+class FakeConnection:
+    """asyncpg connection failing like the real one on concurrent queries."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+        self.busy = False
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def execute(self, query: str, channel: str, message: str) -> None:
+        if self.busy:
+            raise RuntimeError("another operation is in progress")
+        self.busy = True
+        await asyncio.sleep(0.001)
+        self.messages.append(message)
+        self.busy = False
+
+    async def close(self) -> None: ...
+
+
+class FakePostgresBroker(PostgresBroker):
+    def __init__(self):
+        super().__init__("postgresql://test")
+        self.connections: list[FakeConnection] = []
+
+    async def _connect(self) -> FakeConnection:
+        await asyncio.sleep(0.001)
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+def test_created_event_fits_a_notification():
+    news = {
+        "id": "42",
+        "title": "Judul",
+        "content": "isi berita " * 5000,
+        "image_url": None,
+        "category": {"id": "tech", "name": "Tech"},
+        "published_at": "2026-10-19T12:00:00",
+    }
+    event = NewsEvent.created(news, author="budi")
+
+    assert (event.type, event.news_id, event.category_id) == ("created", "42", "tech")
+    assert event.data == {
+        "id": "42",
+        "category_id": "tech",
+        "title": "Judul",
+        "author": "budi",
+        "published_at": "2026-10-19T12:00:00",
+    }
+    assert len(event.to_json().encode()) < MAX_PAYLOAD_BYTES
+
+
+async def test_postgres_broker_publishes_one_query_at_a_time():
+    broker = FakePostgresBroker()
+    messages = [_event(str(i)).to_json() for i in range(10)]
+
+    await asyncio.gather(*(broker.publish(message) for message in messages))
+
+    assert len(broker.connections) == 1
+    assert sorted(broker.connections[0].messages) == sorted(messages)
+    assert json.loads(broker.connections[0].messages[0])["type"] == "created"
+
+
+async def test_postgres_broker_rejects_oversized_payloads():
+    broker = FakePostgresBroker()
+    event = NewsEvent("updated", "1", "tech", {"title": "x" * MAX_PAYLOAD_BYTES})
+
+    with pytest.raises(ValueError):
+        await broker.publish(event.to_json())
+    assert broker.connections == []
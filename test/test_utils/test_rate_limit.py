@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+
+from app.utils.rate_limit import DatabaseRateLimitBackend, MemoryRateLimitBackend, RateLimit
+from test.conftest import test_async_session_maker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate_limit():
+    assert RateLimit.parse("5/minute") == RateLimit(5, 60)
+    assert RateLimit.parse("10 / Second").rate == 10
+
+    for value in ("5", "x/minute", "5/week", "0/second"):
+        with pytest.raises(ValueError):
+            RateLimit.parse(value)
+
+
+async def test_memory_backend_refills():
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(clock=clock)
+    limit = RateLimit(2, 60)
+
+    assert await backend.consume("ip:1", limit) == 0
+    assert await backend.consume("ip:1", limit) == 0
+    assert await backend.consume("ip:1", limit) == pytest.approx(30)
+    assert await backend.consume("ip:2", limit) == 0
+
+    clock.now += 30
+    assert await backend.consume("ip:1", limit) == 0
+
+
+async def test_memory_backend_is_bounded():
+    clock = FakeClock()
+    backend = MemoryRateLimitBackend(shards=2, max_keys=10, clock=clock)
+    limit = RateLimit(5, 1)
+
+    for i in range(100):
+        await backend.consume(f"ip:{i}", limit)
+    assert len(backend) <= 10
+
+    # full buckets are dropped when their shard is used again
+    clock.now += 10
+    await backend.consume("ip:new", limit)
+    assert len(backend) < 10
+
+
+async def test_database_backend():
+    clock = FakeClock()
+    backend = DatabaseRateLimitBackend(test_async_session_maker, clock=clock)
+    limit = RateLimit(2, 60)
+    key = f"ip:{uuid.uuid4()}"
+
+    assert await backend.consume(key, limit) == 0
+    assert await backend.consume(key, limit) == 0
+    assert await backend.consume(key, limit) == pytest.approx(30)
+    # a rejected request does not take a token
+    clock.now += 30
+    assert await backend.consume(key, limit) == 0
+    assert await backend.consume(key, limit) == pytest.approx(30)
+
+    clock.now += 3600
+    await backend.prune(older_than=60)
+    assert await backend.consume(key, limit) == 0
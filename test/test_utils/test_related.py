@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+import uuid
+from collections import Counter
+
+from sqlalchemy import delete, select
+
+from app.db.models.news import News
+from app.db.models.news_related import NewsRelated
+from app.utils.related import RelatedNewsService, TfidfIndex, term_counts, tokenize
+from test.conftest import test_async_session_maker
+
+
+def _news(title: str, content: str) -> News:
+    return News(
+        id=uuid.uuid4(),
+        title=title,
+        content=content,
+        category_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        published_at=datetime.datetime.now(),
+    )
+
+
+async def _related(news_id: uuid.UUID) -> list[uuid.UUID]:
+    async with test_async_session_maker() as session:
+        result = await session.scalars(
+            select(NewsRelated.related_id)
+            .where(NewsRelated.news_id == news_id)
+            .order_by(NewsRelated.rank)
+        )
+        return list(result)
+
+
+def test_tokenize_drops_stopwords_and_short_tokens():
+    assert tokenize("Harga BBM naik di 2024, dan itu ok") == ["harga", "bbm", "naik"]
+    assert term_counts("Banjir Jakarta", "banjir lagi")["banjir"] == 3
+
+
+def test_tfidf_neighbours_rank_by_similarity():
+    index = TfidfIndex(max_terms=16, max_df=1)
+    flood, flood_again, football = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index.build(
+        [
+            (flood, Counter(banjir=3, jakarta=2, hujan=1)),
+            (flood_again, Counter(banjir=2, jakarta=1, bekasi=1)),
+            (football, Counter(timnas=3, hujan=1)),
+        ]
+    )
+
+    neighbours = index.neighbours(flood, k=2)
+    assert [news_id for news_id, _ in neighbours] == [flood_again, football]
+    assert neighbours[0][1] > neighbours[1][1] > 0
+
+    index.remove(flood_again)
+    assert [news_id for news_id, _ in index.neighbours(flood, k=2)] == [football]
+    assert index.df["banjir"] == 1
+
+
+def test_tfidf_ignores_common_terms():
+    index = TfidfIndex(max_terms=16, max_df=0.5)
+    news_ids = [uuid.uuid4() for _ in range(4)]
+    index.build([(news_id, Counter(berita=1)) for news_id in news_ids])
+    assert index.neighbours(news_ids[0], k=5) == []
+
+
+async def test_related_news_update_and_delete():
+    flood = _news("Banjir rendam Jakarta", "banjir rendam rumah warga jakarta utara")
+    flood_again = _news("Banjir susulan Jakarta", "banjir susulan rendam jakarta timur")
+    football = _news("Timnas menang", "timnas menang telak di stadion")
+    async with test_async_session_maker() as session:
+        session.add_all([flood, flood_again, football])
+        await session.commit()
+
+    service = RelatedNewsService(
+        test_async_session_maker,
+        top_k=2,
+        index=TfidfIndex(max_terms=16, max_df=0.5),
+        reload_interval=3600,
+    )
+    assert await service.rebuild() >= 3
+    assert await _related(flood.id) == [flood_again.id]
+    assert await _related(flood_again.id) == [flood.id]
+    assert await _related(football.id) == []
+
+    async with test_async_session_maker() as session:
+        await session.execute(delete(News).where(News.id == flood_again.id))
+        await session.commit()
+    await service.update([flood_again.id])
+
+    assert await _related(flood.id) == []
+    assert await _related(flood_again.id) == []
+
+    async with test_async_session_maker() as session:
+        await session.execute(delete(News).where(News.id.in_([flood.id, football.id])))
+        await session.commit()
+    await service.update([flood.id, football.id])
+
+
+async def test_related_news_jobs_run_one_at_a_time():
+    quake = _news("Gempa guncang Cianjur", "gempa guncang rumah warga cianjur")
+    quake_again = _news("Gempa susulan Cianjur", "gempa susulan guncang cianjur selatan")
+    async with test_async_session_maker() as session:
+        session.add_all([quake, quake_again])
+        await session.commit()
+
+    service = RelatedNewsService(
+        test_async_session_maker,
+        top_k=2,
+        index=TfidfIndex(max_terms=16, max_df=0.5),
+        reload_interval=3600,
+    )
+    running, overlaps = 0, []
+    sync = service.sync
+
+    async def tracked_sync(session):
+        nonlocal running
+        running += 1
+        overlaps.append(running)
+        await asyncio.sleep(0.01)
+        await sync(session)
+        running -= 1
+
+    service.sync = tracked_sync
+    await asyncio.gather(
+        service.update([quake.id]),
+        service.update([quake.id, quake_again.id]),
+        service.rebuild(),
+    )
+
+    assert overlaps == [1, 1, 1]
+    assert await _related(quake.id) == [quake_again.id]
+    assert await _related(quake_again.id) == [quake.id]
+
+    async with test_async_session_maker() as session:
+        await session.execute(delete(News).where(News.id.in_([quake.id, quake_again.id])))
+        await session.commit()
+    await service.update([quake.id, quake_again.id])
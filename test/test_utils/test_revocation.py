@@ -0,0 +1,69 @@
+import time
+import uuid
+
+from app.utils.revocation import BloomFilter, RevocationList
+from test.conftest import test_async_session_maker
+
+
+def _revocation_list() -> RevocationList:
+    return RevocationList(
+        test_async_session_maker,
+        capacity=100,
+        error_rate=0.01,
+        reload_interval=3600,
+    )
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [uuid.uuid4().hex for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10_000))
+    assert false_positives < 300
+
+
+async def test_revoke_token():
+    revocation = _revocation_list()
+    jti = uuid.uuid4().hex
+    payload = {"jti": jti, "sub": str(uuid.uuid4()), "iat": time.time()}
+
+    assert not revocation.is_revoked(payload)
+    assert await revocation.revoke(jti, time.time() + 60)
+    assert revocation.is_revoked(payload)
+    assert not await revocation.revoke(jti, time.time() + 60)
+
+
+async def test_revoke_user_only_older_tokens():
+    revocation = _revocation_list()
+    user_id = str(uuid.uuid4())
+    old = {"jti": uuid.uuid4().hex, "sub": user_id, "iat": time.time() - 10}
+
+    await revocation.revoke_user(user_id, lifetime=60)
+
+    new = {"jti": uuid.uuid4().hex, "sub": user_id, "iat": time.time() + 1}
+    assert revocation.is_revoked(old)
+    assert not revocation.is_revoked(new)
+
+
+async def test_refresh_loads_revocations_of_other_workers():
+    worker, other = _revocation_list(), _revocation_list()
+    await worker.refresh()
+
+    jti = uuid.uuid4().hex
+    user_id = str(uuid.uuid4())
+    await other.revoke(jti, time.time() + 60)
+    await other.revoke_user(user_id, lifetime=60)
+    await other.revoke(uuid.uuid4().hex, time.time() - 1)
+
+    await worker.refresh()
+
+    assert worker.is_revoked({"jti": jti, "sub": str(uuid.uuid4()), "iat": time.time()})
+    assert worker.is_revoked({"jti": "x", "sub": user_id, "iat": time.time() - 10})
+
+    await worker.prune()
+    worker.reloaded_at = 0
+    await worker.refresh()
+    assert all(expires_at > time.time() for _, expires_at in worker.revoked.values())
@@ -0,0 +1,103 @@
+import datetime
+
+from sqlalchemy import delete, select
+
+from app.db.models.user import User
+from app.tasks import cleanup_password_changes
+from app.utils.scheduler import FileLock, Scheduler, task_duration, task_runs
+from test.conftest import test_async_session_maker, test_engine
+
+
+async def test_file_lock(tmp_path):
+    first, second = FileLock(tmp_path / "task.lock"), FileLock(tmp_path / "task.lock")
+
+    assert await first.acquire()
+    assert await first.acquire()
+    assert not await second.acquire()
+
+    await first.release()
+    assert await second.acquire()
+    await second.release()
+
+
+async def test_leader_task_runs_on_one_scheduler(tmp_path):
+    runs = []
+    schedulers = [Scheduler(test_engine, jitter=0.1, lock_dir=str(tmp_path)) for _ in range(2)]
+    for index, scheduler in enumerate(schedulers):
+
+        @scheduler.periodic(60, name="cleanup")
+        async def cleanup(index=index):
+            runs.append(("cleanup", index))
+
+        @scheduler.periodic(60, name="prune")
+        async def prune(index=index):
+            runs.append(("prune", index))
+
+        @scheduler.periodic(60, name="refresh", leader=False)
+        async def refresh(index=index):
+            runs.append(("refresh", index))
+
+    for scheduler in schedulers:
+        for task in scheduler.tasks.values():
+            await scheduler.run(task)
+
+    assert sorted(runs) == [("cleanup", 0), ("prune", 0), ("refresh", 0), ("refresh", 1)]
+    # one lock covers every leader task
+    assert [path.name for path in tmp_path.iterdir()] == ["ora-news-scheduler.lock"]
+    assert task_runs.get(task="cleanup", status="skipped") >= 1
+    assert task_duration.get(task="refresh") is not None
+
+    # the leadership moves on when the leader stops
+    await schedulers[0].stop()
+    assert await schedulers[1].run(schedulers[1].tasks["cleanup"])
+    await schedulers[1].stop()
+
+
+async def test_failed_task_is_counted(tmp_path):
+    scheduler = Scheduler(test_engine, jitter=0, lock_dir=str(tmp_path))
+
+    @scheduler.periodic(10, leader=False)
+    async def broken():
+        raise RuntimeError
+
+    before = task_runs.get(task="broken", status="error") or 0
+    assert await scheduler.run(scheduler.tasks["broken"])
+    assert task_runs.get(task="broken", status="error") == before + 1
+    assert scheduler.delay(scheduler.tasks["broken"]) == 10
+
+
+async def test_cleanup_password_changes(monkeypatch, setup_db):
+    monkeypatch.setattr("app.tasks.async_session_maker", test_async_session_maker)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with test_async_session_maker() as session:
+        for name, expires_at in (
+            ("expired", now - datetime.timedelta(hours=1)),
+            ("pending", now + datetime.timedelta(hours=1)),
+        ):
+            session.add(
+                User(
+                    email=f"{name}@mail.test",
+                    username=f"cleanup_{name}",
+                    name=name,
+                    hashed_password="hash",
+                    pending_password_hash="new hash",
+                    password_change_token=f"token {name}",
+                    password_change_token_expires_at=expires_at,
+                )
+            )
+        await session.commit()
+
+    await cleanup_password_changes()
+
+    async with test_async_session_maker() as session:
+        users = {
+            user.name: user
+            for user in await session.scalars(
+                select(User).where(User.username.like("cleanup_%"))
+            )
+        }
+        await session.execute(delete(User).where(User.username.like("cleanup_%")))
+        await session.commit()
+    assert users["expired"].password_change_token is None
+    assert users["expired"].pending_password_hash is None
+    assert users["pending"].password_change_token == "token pending"
@@ -0,0 +1,131 @@
+import datetime
+import uuid
+
+from app.db.models.news import News
+from app.db.models.user import User
+from app.utils.pubsub import NewsEvent
+from app.utils.suggest import SuggestIndex, Suggestion, normalize
+from test.conftest import test_async_session_maker
+
+NOW = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _suggestion(title: str, author: str = "budi", minutes: int = 0) -> Suggestion:
+    return Suggestion(uuid.uuid4(), title, author, NOW + datetime.timedelta(minutes=minutes))
+
+
+def test_normalize():
+    assert normalize("  Café-Kopi: Harga NAIK!  ") == "cafe kopi harga naik"
+
+
+def test_suggest_matches_word_prefixes_latest_first():
+    index = SuggestIndex(None, max_news=100, max_scan=100)
+    old = _suggestion("Banjir rendam Jakarta", minutes=1)
+    new = _suggestion("Jakarta dilanda banjir", minutes=2)
+    other = _suggestion("Timnas menang", minutes=3)
+    index.build([old, new, other])
+
+    assert index.suggest("banj", 10) == [new, old]
+    assert index.suggest("JAKARTA", 10) == [new, old]
+    assert index.suggest("banjir rendam j", 10) == [old]
+    assert index.suggest("banjir", 1) == [new]
+    assert index.suggest("zzz", 10) == []
+    assert index.suggest("  ", 10) == []
+
+
+def test_suggest_past_max_scan_keeps_the_latest():
+    index = SuggestIndex(None, max_news=100, max_scan=5)
+    # the newest news sort last by title
+    items = [
+        _suggestion(f"Kabar {i:02d}", author=f"penulis{i:02d}", minutes=i) for i in range(12)
+    ]
+    index.build(items[:-1])
+    index.add(items[-1])
+    latest = [items[11], items[10], items[9]]
+
+    assert index.suggest("k", 3) == latest
+    assert index.suggest("kabar", 3) == latest
+    assert index.suggest("kabar 0", 3) == [items[9], items[8], items[7]]
+    assert index.suggest("kabar 1", 3) == [items[11], items[10]]
+    assert index.suggest_authors("pen", 2) == ["penulis11", "penulis10"]
+    assert index.suggest_authors("penulis", 2) == ["penulis11", "penulis10"]
+
+    index.remove(items[11].id)
+    assert index.suggest("ka", 2) == [items[10], items[9]]
+    assert index.suggest_authors("p", 1) == ["penulis10"]
+
+
+def test_add_remove_and_evict_oldest():
+    index = SuggestIndex(None, max_news=2, max_scan=100)
+    first = _suggestion("Harga beras naik", author="ani", minutes=1)
+    second = _suggestion("Harga cabai naik", author="budi", minutes=2)
+    third = _suggestion("Harga gula naik", author="budi", minutes=3)
+    index.add(first)
+    index.add(second)
+    assert index.suggest_authors("a", 10) == ["ani"]
+
+    index.add(third)
+    assert len(index) == 2
+    assert index.suggest("harga", 10) == [third, second]
+    assert index.suggest_authors("a", 10) == []
+
+    index.remove(third.id)
+    assert index.suggest("harga", 10) == [second]
+    assert index.suggest("gula", 10) == []
+    assert index.suggest_authors("bu", 10) == ["budi"]
+    assert len(index.keys) == len(index.ids) == len(index.stamps)
+    assert sum(map(len, index.recent.buckets.values())) == 3 * len(index.keys)
+
+
+def test_events_update_the_index():
+    index = SuggestIndex(None, max_news=100, max_scan=100)
+    news_id, category_id = str(uuid.uuid4()), str(uuid.uuid4())
+    data = {
+        "id": news_id,
+        "title": "Gempa bumi",
+        "author": "citra",
+        "published_at": "2025-01-01T10:00:00",
+    }
+    index.on_event(NewsEvent("created", news_id, category_id, data))
+    assert [item.title for item in index.suggest("gempa", 10)] == ["Gempa bumi"]
+
+    index.on_event(
+        NewsEvent("updated", news_id, category_id, {"id": news_id, "title": "Gunung meletus"})
+    )
+    assert index.suggest("gempa", 10) == []
+    assert index.suggest("gunung", 10)[0].author == "citra"
+
+    index.on_event(NewsEvent("deleted", news_id, category_id, {"id": news_id}))
+    assert len(index) == 0
+    assert index.suggest_authors("citra", 10) == []
+
+
+async def test_reload_from_database():
+    user = User(
+        id=uuid.uuid4(),
+        username=f"suggest{uuid.uuid4().hex[:8]}",
+        email=f"{uuid.uuid4().hex[:8]}@mail.test",
+        name="Suggest",
+        hashed_password="x",
+    )
+    news = News(
+        id=uuid.uuid4(),
+        title="Kereta cepat beroperasi",
+        content="content",
+        user_id=user.id,
+        category_id=uuid.uuid4(),
+        published_at=datetime.datetime(2025, 1, 1),
+    )
+    async with test_async_session_maker() as session:
+        session.add_all([user, news])
+        await session.commit()
+
+    index = SuggestIndex(test_async_session_maker, max_news=100, max_scan=100)
+    await index.reload()
+    assert [item.id for item in index.suggest("kereta cep", 10)] == [news.id]
+    assert index.suggest_authors(user.username, 10) == [user.username]
+
+    async with test_async_session_maker() as session:
+        await session.delete(await session.get(News, news.id))
+        await session.delete(await session.get(User, user.id))
+        await session.commit()
@@ -0,0 +1,59 @@
+import uuid
+
+import pytest
+
+from app.db.models.user import User
+from app.utils import exceptions
+from app.utils.revocation import RevocationList
+from app.utils.token import TokenManager, access_token_cache
+from test.conftest import test_async_session_maker
+
+
+def test_access_token_payload_is_cached(monkeypatch):
+    token_manager = TokenManager()
+    user = User(id=uuid.uuid4())
+    token = token_manager.create_access_token(user)
+
+    payload = token_manager.decode_access_token(token)
+    assert payload["sub"] == str(user.id)
+    assert payload["jti"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token decoded again")
+
+    monkeypatch.setattr(token_manager, "decode_token", fail)
+    assert token_manager.decode_access_token(token) == payload
+    assert len(access_token_cache) >= 1
+
+
+@pytest.fixture
+def revocation(monkeypatch) -> RevocationList:
+    revocation = RevocationList(
+        test_async_session_maker,
+        capacity=100,
+        error_rate=0.01,
+        reload_interval=3600,
+    )
+    monkeypatch.setattr("app.utils.token.revocation_list", revocation)
+    return revocation
+
+
+async def test_refresh_token_is_valid_once(revocation):
+    token_manager = TokenManager()
+    user = User(id=uuid.uuid4())
+    refresh_token = token_manager.create_refresh_token(user)
+
+    payload = await token_manager.consume_refresh_token(refresh_token)
+    assert payload["sub"] == str(user.id)
+    assert revocation.is_revoked(payload)
+
+    with pytest.raises(exceptions.InvalidVerifyTokenError):
+        await token_manager.consume_refresh_token(refresh_token)
+
+
+async def test_access_token_is_not_a_refresh_token(revocation):
+    token_manager = TokenManager()
+    access_token = token_manager.create_access_token(User(id=uuid.uuid4()))
+
+    with pytest.raises(exceptions.InvalidVerifyTokenError):
+        await token_manager.consume_refresh_token(access_token)
@@ -0,0 +1,50 @@
+import datetime
+import uuid
+
+from sqlalchemy import select
+
+from app.db.models.news_view import NewsView, NewsViewBucket
+from app.utils.views import TrendingRanking, ViewCounter, current_bucket
+
+
+async def test_view_counter_flush_aggregates_hits(db_session):
+    counter = ViewCounter()
+    first, second = uuid.uuid4(), uuid.uuid4()
+    for _ in range(3):
+        counter.hit(first)
+    counter.hit(second)
+
+    assert await counter.flush(db_session) == 4
+    assert not counter.pending
+
+    counter.hit(first)
+    assert await counter.flush(db_session) == 1
+
+    result = await db_session.execute(select(NewsView.news_id, NewsView.view_count))
+    totals = dict(result.tuples().all())
+    assert totals[first] == 4
+    assert totals[second] == 1
+
+
+async def test_flush_without_hits_is_noop(db_session):
+    assert await ViewCounter().flush(db_session) == 0
+
+
+async def test_trending_ranking_decays_old_views(db_session):
+    now = current_bucket()
+    old, recent = uuid.uuid4(), uuid.uuid4()
+    db_session.add_all(
+        [
+            NewsViewBucket(news_id=old, bucket=now - datetime.timedelta(hours=12), hits=10),
+            NewsViewBucket(news_id=recent, bucket=now, hits=5),
+            NewsView(news_id=old, view_count=10),
+            NewsView(news_id=recent, view_count=5),
+        ]
+    )
+    await db_session.flush()
+
+    ranking = TrendingRanking(window_hours=48, half_life_hours=6, size=10)
+    await ranking.refresh(db_session)
+
+    assert ranking.trending.index(recent) < ranking.trending.index(old)
+    assert ranking.most_read.index(old) < ranking.most_read.index(recent)
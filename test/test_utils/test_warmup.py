@@ -0,0 +1,43 @@
+import asyncio
+
+from app.utils.warmup import WarmUp
+
+
+async def test_steps_run_in_order_and_failures_are_skipped():
+    warmup = WarmUp()
+    calls = []
+
+    @warmup.step("first")
+    async def first(app):
+        calls.append(("first", app))
+
+    @warmup.step("broken")
+    async def broken(app):
+        raise RuntimeError("database down")
+
+    @warmup.step("last")
+    async def last(app):
+        calls.append(("last", app))
+
+    await warmup.start("app", timeout=1)
+    assert calls == [("first", "app"), ("last", "app")]
+    assert warmup.ready
+    report = warmup.report()
+    assert report["failed"] == ["broken"]
+    assert list(report["steps"]) == ["first", "broken", "last"]
+
+
+async def test_slow_steps_go_on_in_the_background():
+    warmup = WarmUp()
+    release = asyncio.Event()
+
+    @warmup.step("slow")
+    async def slow(app):
+        await release.wait()
+
+    await warmup.start(None, timeout=0.01)
+    assert not warmup.ready
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert warmup.ready
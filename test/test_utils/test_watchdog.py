@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from app.utils.watchdog import LoopWatchdog, loop_blocks
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+async def test_watchdog_captures_the_blocking_stack():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+    blocked = loop_blocks.get() or 0
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert watchdog.lag < 0.1
+
+        blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        await watchdog.stop()
+
+    assert len(watchdog.blocks) == 1
+    block = watchdog.blocks[0]
+    assert "blocking_call" in block.stack
+    assert "time.sleep(0.3)" in block.stack
+    assert block.seconds >= 0.3
+    assert watchdog.lag >= 0.25
+    assert loop_blocks.get() == blocked + 1